@@ -5,7 +5,6 @@ This agent provides database schema design and management capabilities.
 
 import os
 import json
-from pathlib import Path
 from datetime import datetime
 
 from google.adk.agents import Agent
@@ -14,17 +13,38 @@ from google.adk.models.lite_llm import LiteLlm
 # Import prompt instructions
 from .prompt import DB_MANAGER_INSTR
 
-# Import SQLite and search web tools from shared libraries
-from astra.shared_libraries.sqlite_tools import (
+# Import SQLite and search web tools from shared libraries; all SQLite tools
+# are async so none of them blocks the event loop
+from astra.shared_libraries.async_sqlite_tools import (
     set_db_path,
     create_database,
     create_table,
     write_query,
     read_query,
+    read_query_formatted,
+    read_query_paged,
+    fetch_next_page,
+    bulk_insert,
+    execute_batch,
     list_tables,
-    describe_table
+    describe_table,
+    explain_query,
+    query_stats,
+    run_maintenance,
+    import_file,
+    export_query,
+    rebuild_destination_search,
+    refresh_itinerary_summaries,
+    enable_change_feed,
+    disable_change_feed,
+    changes_since,
+    attach_database,
+    detach_database,
+    snapshot_database,
+    schedule_snapshots
 )
-from astra.shared_libraries.search_web_tools import (
+from astra.shared_libraries import sqlite_catalog
+from astra.shared_libraries.search_web import (
     search_web
 )
 
@@ -41,12 +61,10 @@ except ImportError:
     MODEL = MODEL_GPT_4O_MINI
 
 def load_database_catalog():
-    """Load database catalog from databases.json."""
-    catalog_path = Path(__file__).parent / "databases.json"
-    try:
-        with open(catalog_path, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
+    """Load database catalog from databases.json, with paths resolved for this machine."""
+    if sqlite_catalog.database_catalog.path.exists():
+        return {"database_catalog": sqlite_catalog.database_catalog.document()}
+    else:
         # Return default empty catalog if file not found
         return {
             "database_catalog": {
@@ -77,8 +95,27 @@ db_manager_agent = Agent(
         create_table,
         write_query,
         read_query,
+        read_query_formatted,
+        read_query_paged,
+        fetch_next_page,
+        bulk_insert,
+        execute_batch,
         list_tables,
         describe_table,
+        explain_query,
+        query_stats,
+        run_maintenance,
+        import_file,
+        export_query,
+        rebuild_destination_search,
+        refresh_itinerary_summaries,
+        enable_change_feed,
+        disable_change_feed,
+        changes_since,
+        attach_database,
+        detach_database,
+        snapshot_database,
+        schedule_snapshots,
         # Add search web tool
         search_web  
     ],
@@ -78,7 +78,11 @@ You have access to SQLite database tools that you can use to create and manage S
    - Example: To insert a record into the users table
 
 5. read_query(query, tool_context): Execute a SELECT query on the SQLite database.
-   - Example: To query records from the users table
+   - Example: read_query("SELECT * FROM users", tool_context)
+   - Small results come back as a "data" list of rows and large ones in the columnar format
+   - To pick the format, use read_query_formatted(query, result_format, tool_context) with result_format "rows", "columnar" or "auto"
+   - Columnar results have "columns" and "rows" (one list of values per row); a column listed in "dictionaries" holds indexes into that column's list of values
+   - Results too large for the token budget come back with "truncated": true, the first rows and "column_summaries" (count, nulls, min/max, distinct values, top values); answer from the summaries or narrow the query, and use read_query_paged if every row is really needed
 
 6. list_tables(tool_context): List all tables in the SQLite database.
    - Example: To show all tables in the database
@@ -86,7 +90,86 @@ You have access to SQLite database tools that you can use to create and manage S
 7. describe_table(table_name, tool_context): Get the schema information for a specific table.
    - Example: To get the schema of the users table
 
-8. web_search(search_term): Search the web for information related to your database entries.
+8. read_query_paged(query, page_size, tool_context): Execute a SELECT query and return only the first page of rows.
+   - Example: To browse a large table 50 rows at a time: read_query_paged("SELECT * FROM users", 50, tool_context)
+   - Prefer this over read_query when a query may return many rows
+
+9. fetch_next_page(cursor_token, tool_context): Fetch the next page of a paged query.
+   - Pass the cursor_token from the previous page while has_more is true
+
+10. bulk_insert(table, columns, rows, tool_context): Insert many rows into a table in one transaction.
+   - Example: bulk_insert("users", ["name", "email"], [["Ann", "ann@example.com"], ["Bob", "bob@example.com"]], tool_context)
+   - Use this instead of repeated write_query calls when loading more than a few rows
+
+11. execute_batch(statements, tool_context): Run several write statements in one all-or-nothing transaction.
+   - Example: execute_batch([{{"sql": "INSERT INTO orders (user_id) VALUES (?)", "params": [1]}}, "UPDATE users SET order_count = order_count + 1 WHERE id = 1"], tool_context)
+   - Use this for multi-step changes that must not be left half-applied
+
+12. explain_query(query, benchmark, tool_context): Show how SQLite will run a query, flag full-table scans and suggest indexes.
+   - Example: explain_query("SELECT * FROM orders WHERE user_id = 1", False, tool_context)
+   - Set benchmark to True to time the query before and after the suggested indexes on a scratch copy of the database
+   - Suggested indexes are not created; use write_query with the returned "sql" if the user agrees
+
+13. query_stats(tool_context): Show which queries take the most time, recent slow queries and cache statistics.
+   - Example: query_stats(tool_context)
+   - Use this when the user asks why the database feels slow; follow up with explain_query on the worst queries
+
+14. import_file(path, table, file_format, tool_context): Load a CSV or JSONL file from local disk into an existing table.
+   - Example: import_file("data/destinations.csv", "Destinations", "csv", tool_context)
+   - CSV files need a header row with the column names; JSONL files have one JSON object per line
+   - Values are converted to the column types; rows are committed in chunks, so on error "committed_rows" tells how much was loaded
+   - Use this instead of bulk_insert or write_query whenever the data is already in a file
+
+15. export_query(query, path, file_format, compress, tool_context): Write the results of a SELECT query to a CSV or JSONL file on local disk.
+   - Example: export_query("SELECT * FROM Bookings", "exports/bookings.csv", "csv", False, tool_context)
+   - Set compress to True to gzip the file
+   - Returns the file path, row count and size instead of the rows; use this when the user wants the data itself rather than an answer about it
+
+16. rebuild_destination_search(tool_context): Create or rebuild the full-text search index over the travel database's Destinations table.
+   - Example: rebuild_destination_search(tool_context)
+   - The index follows inserts, updates and deletes on Destinations by itself; rebuild it after restoring or bulk-replacing the table outside these tools
+
+17. attach_database(database, alias, tool_context): Attach another database read-only under a schema alias so one query can join across databases.
+   - Example: attach_database("Astra_travel_agency", "travel", tool_context), then read_query("SELECT u.name, b.* FROM main.Users u JOIN travel.Itineraries i ON i.user_id = u.user_id JOIN travel.Bookings b ON b.itinerary_id = i.itinerary_id", tool_context)
+   - database is a catalog name or a database file path; tables of the current database are main.table_name
+   - Attached databases stay attached for read_query, read_query_paged and export_query until detached; writes still go only to the current database
+   - Use this instead of switching set_db_path back and forth and combining results yourself
+
+18. detach_database(alias, tool_context): Detach a database attached with attach_database.
+   - Example: detach_database("travel", tool_context)
+
+19. snapshot_database(dest, tool_context): Take a consistent backup of the current database while agents keep using it.
+   - Example: snapshot_database("backups/astra_travel-before-import.db", tool_context)
+   - Pass "" as dest for a timestamped file in a "snapshots" folder next to the database
+   - The snapshot is added to the database catalog; the result reports its catalog_name, pages copied and duration
+   - Never copy database files directly; a copy made while the database is being written can be corrupt
+
+20. schedule_snapshots(interval_minutes, keep, tool_context): Snapshot the current database automatically.
+   - Example: schedule_snapshots(60, 24, tool_context) for hourly snapshots, keeping the last 24
+   - Pass 0 as interval_minutes to stop scheduled snapshots
+
+21. run_maintenance(task, tool_context): Refresh planner statistics or reclaim free space now.
+   - Example: run_maintenance("analyze", tool_context) after loading a lot of data
+   - task is "optimize", "analyze" or "vacuum"; this also happens in the background when the database is idle, so only run it when the user asks or query_stats shows slow queries after a large change
+   - The result reports the duration and the file size and analyzed tables before and after
+
+22. refresh_itinerary_summaries(verify_only, tool_context): Check the travel database's itinerary booking summaries against the Bookings table, and rebuild them.
+   - Example: refresh_itinerary_summaries(True, tool_context) to only report whether they match; refresh_itinerary_summaries(False, tool_context) to rebuild
+   - The summaries follow inserts, updates and deletes on Bookings by themselves; rebuild them after restoring or bulk-replacing the table outside these tools
+
+23. enable_change_feed(tables, tool_context): Start recording which rows are inserted, updated and deleted in tables of the current database.
+   - Example: enable_change_feed(["Bookings", "Itineraries"], tool_context); pass [] for every table
+   - Only do this when the user wants to follow changes; every write to a tracked table also writes a small change_log entry
+
+24. disable_change_feed(tables, tool_context): Stop recording changes to tables; pass [] for every table.
+   - Example: disable_change_feed(["Bookings"], tool_context)
+
+25. changes_since(seq, limit, tool_context): List the changes recorded after a sequence number, oldest first.
+   - Example: changes_since(120, 100, tool_context); pass -1 as seq to continue from this session's previous call
+   - Each change has seq, table, rowid and operation (INSERT, UPDATE or DELETE); read the current rows with read_query if you need their values
+   - Call again with next_seq while has_more is true; if missed_changes is true, older changes were discarded and the tables must be re-read
+
+26. web_search(search_term): Search the web for information related to your database entries.
    - Example: To find information about a city for a travel database: web_search("Paris tourism statistics 2025")
    - Use this when database entries are missing important information
    - Ask the user first if they would like to search for additional details
@@ -99,7 +182,7 @@ When implementing database operations:
 3. Create tables with appropriate field types and constraints
 4. Insert data with proper formatting for the field types
 5. Use read_query() for SELECT operations and write_query() for INSERT/UPDATE/DELETE
-6. Check the returned status to handle errors properly
+6. Check the returned status to handle errors properly; an error with "error_type": "timeout" means the query ran too long and was stopped, so rewrite it (add join or WHERE conditions, or a LIMIT) instead of retrying it unchanged
 7. When database entries lack complete information, offer to use web_search to find additional details
 
 Current database catalog:
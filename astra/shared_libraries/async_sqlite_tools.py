@@ -0,0 +1,594 @@
+"""
+Asynchronous SQLite tools for Astra agents.
+
+These are drop-in async variants of the query tools in sqlite_tools, backed by
+a pool of aiosqlite connections so a slow query does not block the event loop
+the ADK Runner uses for every other conversation in the process.
+
+Queries run under the same limits as the sync tools. When the task awaiting a
+query is cancelled, the statement is interrupted too rather than left running
+on the connection's thread.
+
+The remaining sync tools (paging, batches, import/export, search, summaries,
+the change feed, maintenance, ...) get async variants at the end of this
+module that run them on a worker thread, so agents can register every tool
+without any of them blocking the event loop. Their work still goes through
+the same writer thread and connection pools; cancelling the awaiting task
+does not stop a call that has already started.
+"""
+
+import os
+import time
+import functools
+import sqlite3
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+from contextlib import asynccontextmanager, contextmanager
+
+import aiosqlite
+from google.adk.tools.tool_context import ToolContext
+
+from astra.shared_libraries.sqlite_pool import (
+    DEFAULT_POOL_SIZE, DEFAULT_POOL_TIMEOUT, PROGRESS_INTERVAL, StepCounter, read_only_uri,
+    attachment_changes, attach_statement, detach_statement
+)
+from astra.shared_libraries.sqlite_cache import schema_cache, result_cache
+from astra.shared_libraries.sqlite_catalog import table_kinds_query, visible_tables
+from astra.shared_libraries.sqlite_profiles import DEFAULT_PROFILE, profile_for_path, profile_pragma_statements
+from astra.shared_libraries.sqlite_tools import (
+    BUDGET_FETCH_SIZE, _budgeted_response, _elapsed_ms, _error_response, _write_job, read_tables,
+    session_attachments, written_tables
+)
+from astra.shared_libraries.sqlite_limits import QueryLimits, limits_for_path
+from astra.shared_libraries.sqlite_analyzer import analyze_sql
+from astra.shared_libraries.sqlite_writer import get_writer
+from astra.shared_libraries.sqlite_stats import query_stats_log
+from astra.shared_libraries.sqlite_encoding import RESULT_FORMATS, format_results
+from astra.shared_libraries.sqlite_budget import RESULT_TOKEN_BUDGET, ResultBudgeter
+from astra.shared_libraries import (
+    sqlite_tools, sqlite_advisor, sqlite_import, sqlite_export, sqlite_search, sqlite_spatial,
+    sqlite_summaries, sqlite_changes, sqlite_attach, sqlite_backup
+)
+
+logger = logging.getLogger('astra_async_sqlite_tools')
+
+
+@contextmanager
+def _limited(conn: aiosqlite.Connection, limits: Optional[QueryLimits]) -> Iterator[None]:
+    """StepCounter.limited for a pooled connection, also stopping the statement if the awaiting task is cancelled"""
+    with conn.step_counter.limited(limits):
+        try:
+            yield
+        except asyncio.CancelledError:
+            conn.step_counter.cancel()
+            raise
+
+
+class AsyncSqliteConnectionPool:
+    """Bounded pool of reusable aiosqlite connections to a single database file."""
+
+    def __init__(self, db_path: str, max_size: int = DEFAULT_POOL_SIZE,
+                 timeout: float = DEFAULT_POOL_TIMEOUT, profile: str = DEFAULT_PROFILE,
+                 read_only: bool = False):
+        self.db_path = db_path
+        self.profile = profile
+        self.read_only = read_only
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle: asyncio.LifoQueue = asyncio.LifoQueue(maxsize=max_size)
+        self._created = 0
+        self._closed = False
+        self.attaches = 0
+
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a new connection configured for use by the tools"""
+        logger.debug(f"Opening pooled async connection to {self.db_path}")
+        if self.read_only:
+            pending = aiosqlite.connect(read_only_uri(self.db_path), timeout=self.timeout, uri=True)
+        else:
+            pending = aiosqlite.connect(self.db_path, timeout=self.timeout)
+        # Pooled connections live as long as the process, so their worker
+        # thread must not keep the interpreter alive at shutdown
+        worker = getattr(pending, "_thread", pending)
+        worker.daemon = True
+        conn = await pending
+        conn.row_factory = sqlite3.Row
+        conn.attached = {}
+        conn.step_counter = StepCounter()
+        await conn.set_progress_handler(conn.step_counter, PROGRESS_INTERVAL)
+        for statement in profile_pragma_statements(self.profile, self.read_only):
+            try:
+                await conn.execute(statement)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not apply '{statement}' to {self.db_path}: {e}")
+        return conn
+
+    async def _apply_attachments(self, conn: aiosqlite.Connection, wanted: Dict[str, str]):
+        """Make a connection's attached databases match wanted, keeping those already attached"""
+        detach, attach = attachment_changes(conn.attached, wanted)
+        for alias in detach:
+            await conn.execute(detach_statement(alias))
+            del conn.attached[alias]
+        for alias, path in attach:
+            await conn.execute(attach_statement(alias), (read_only_uri(path),))
+            conn.attached[alias] = path
+            self.attaches += 1
+
+    async def _discard(self, conn: aiosqlite.Connection):
+        """Close a connection and free its slot in the pool"""
+        try:
+            await conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing pooled async connection: {e}")
+        self._created -= 1
+
+    async def acquire(self) -> aiosqlite.Connection:
+        """Take a connection from the pool, opening one if the pool is not full"""
+        if self._closed:
+            raise RuntimeError(f"Async connection pool for {self.db_path} is closed")
+
+        try:
+            return self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+
+        # No await between the check and the increment, so this is race-free
+        if self._created < self.max_size:
+            self._created += 1
+            try:
+                return await self._connect()
+            except Exception:
+                self._created -= 1
+                raise
+
+        try:
+            return await asyncio.wait_for(self._idle.get(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Timed out after {self.timeout}s waiting for a connection to {self.db_path}"
+            )
+
+    async def release(self, conn: aiosqlite.Connection):
+        """Return a connection to the pool, rolling back any open transaction"""
+        if conn.step_counter.cancelled:
+            # Its cancelled statement may still be unwinding; never hand it out again
+            await self._discard(conn)
+            return
+
+        try:
+            if conn.in_transaction:
+                await conn.rollback()
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding pooled async connection after failed rollback: {e}")
+            await self._discard(conn)
+            return
+
+        if self._closed:
+            await self._discard(conn)
+            return
+
+        try:
+            self._idle.put_nowait(conn)
+        except asyncio.QueueFull:
+            await self._discard(conn)
+
+    @asynccontextmanager
+    async def connection(self, attached: Optional[Dict[str, str]] = None) -> AsyncIterator[aiosqlite.Connection]:
+        """Async context manager that borrows a connection and always returns it.
+
+        attached maps schema aliases to database paths; the connection has
+        exactly those databases attached while it is borrowed.
+        """
+        conn = await self.acquire()
+        try:
+            await self._apply_attachments(conn, attached or {})
+            yield conn
+        finally:
+            await self.release(conn)
+
+    async def close(self):
+        """Close every idle connection; busy connections close when released"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            await self._discard(conn)
+
+
+class AsyncSqliteDatabase:
+    def __init__(self, db_path: str, pool_size: int = DEFAULT_POOL_SIZE, profile: Optional[str] = None):
+        self.db_path = str(Path(db_path).expanduser())
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.profile = profile or profile_for_path(self.db_path)
+        # Writes share the database's writer thread with the sync tools;
+        # reads use read-only connections
+        self.writer = get_writer(self.db_path, self.profile)
+        self.pool = AsyncSqliteConnectionPool(self.db_path, max_size=pool_size, profile=self.profile,
+                                              read_only=True)
+        self.query_limits = limits_for_path(self.db_path)
+
+    async def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                            use_cache: bool = False, attached: Optional[Dict[str, str]] = None,
+                            limits: Optional[QueryLimits] = None) -> List[Dict[str, Any]]:
+        """Execute a SQL query asynchronously and return results as a list of dictionaries.
+
+        Reads run with the databases in attached (schema alias -> path) attached.
+        Statements are interrupted with QueryTimeout once they exceed limits
+        (by default the database's query_limits).
+        """
+        logger.debug(f"Executing async query: {query}")
+        started = time.perf_counter()
+        analysis = analyze_sql(query)
+        limits = limits or self.query_limits
+        # Unqualified names may resolve to an attached database, which the cache does not watch
+        use_cache = use_cache and not attached
+        try:
+            # Anything not provably read-only goes to the writer
+            if not analysis.read_only:
+                job, transactional = _write_job(query, params, analysis, limits)
+                affected, vm_steps = await asyncio.wrap_future(self.writer.submit(
+                    job, transactional=transactional, tables=written_tables(analysis)
+                ))
+                if analysis.schema_change:
+                    schema_cache.invalidate(self.db_path)
+                logger.debug(f"Write query affected {affected} rows")
+                query_stats_log.record(self.db_path, query, _elapsed_ms(started),
+                                       rows_affected=affected, vm_steps=vm_steps)
+                return [{"affected_rows": affected}]
+
+            async with self.pool.connection(attached) as conn:
+                if use_cache:
+                    data_version = await asyncio.to_thread(self.writer.data_version)
+                    generation = result_cache.check_external(self.writer.db_path, data_version)
+                    # None while the writer is busy, when outside changes cannot be ruled out
+                    use_cache = generation is not None
+                if use_cache:
+                    cache_key = result_cache.make_key(self.writer.db_path, query, params)
+                    cached = result_cache.get(cache_key)
+                    if cached is not None:
+                        logger.debug(f"Read query served {len(cached)} rows from cache")
+                        query_stats_log.record(self.db_path, query, _elapsed_ms(started),
+                                               rows_returned=len(cached), cached=True)
+                        return cached
+
+                steps_before = conn.step_counter.steps
+                with _limited(conn, limits):
+                    async with conn.execute(query, params or ()) as cursor:
+                        rows = await cursor.fetchall()
+                results = [dict(row) for row in rows]
+                logger.debug(f"Read query returned {len(results)} rows")
+                query_stats_log.record(self.db_path, query, _elapsed_ms(started), rows_returned=len(results),
+                                       vm_steps=conn.step_counter.steps - steps_before)
+                if use_cache:
+                    result_cache.put(cache_key, results, generation, read_tables(analysis))
+                return results
+        except Exception as e:
+            logger.error(f"Database error executing async query: {e}")
+            query_stats_log.record(self.db_path, query, _elapsed_ms(started), error=str(e))
+            raise
+
+    async def execute_budgeted(self, query: str, max_tokens: int, params: Optional[Dict[str, Any]] = None,
+                               use_cache: bool = False, attached: Optional[Dict[str, str]] = None,
+                               limits: Optional[QueryLimits] = None) -> ResultBudgeter:
+        """Stream a read query through a ResultBudgeter, keeping only the rows that fit the budget"""
+        logger.debug(f"Executing async budgeted query: {query}")
+        started = time.perf_counter()
+        budgeter = ResultBudgeter(max_tokens)
+        limits = limits or self.query_limits
+        use_cache = use_cache and not attached
+        try:
+            async with self.pool.connection(attached) as conn:
+                if use_cache:
+                    data_version = await asyncio.to_thread(self.writer.data_version)
+                    generation = result_cache.check_external(self.writer.db_path, data_version)
+                    # None while the writer is busy, when outside changes cannot be ruled out
+                    use_cache = generation is not None
+                if use_cache:
+                    cache_key = result_cache.make_key(self.writer.db_path, query, params)
+                    cached = result_cache.get(cache_key)
+                    if cached is not None:
+                        logger.debug(f"Budgeted query served {len(cached)} rows from cache")
+                        query_stats_log.record(self.db_path, query, _elapsed_ms(started),
+                                               rows_returned=len(cached), cached=True)
+                        return budgeter.consume(cached)
+
+                steps_before = conn.step_counter.steps
+                with _limited(conn, limits):
+                    async with conn.execute(query, params or ()) as cursor:
+                        while True:
+                            batch = await cursor.fetchmany(BUDGET_FETCH_SIZE)
+                            if not batch:
+                                break
+                            budgeter.consume(dict(row) for row in batch)
+                logger.debug(f"Budgeted query kept {len(budgeter.rows)} of {budgeter.total_rows} rows")
+                query_stats_log.record(self.db_path, query, _elapsed_ms(started), rows_returned=budgeter.total_rows,
+                                       vm_steps=conn.step_counter.steps - steps_before)
+                # Only complete results are cached
+                if use_cache and not budgeter.truncated:
+                    result_cache.put(cache_key, budgeter.rows, generation, read_tables(analyze_sql(query)))
+                return budgeter
+        except Exception as e:
+            logger.error(f"Database error executing async budgeted query: {e}")
+            query_stats_log.record(self.db_path, query, _elapsed_ms(started), error=str(e))
+            raise
+
+    async def _schema_version(self, conn: aiosqlite.Connection) -> int:
+        """Read the current schema version on a borrowed connection"""
+        async with conn.execute("PRAGMA schema_version") as cursor:
+            return (await cursor.fetchone())[0]
+
+    async def get_table_names(self, include_internal: bool = True) -> List[str]:
+        """Return table names, served from the schema cache while the schema is unchanged.
+
+        With include_internal False, SQLite's own tables, shadow tables of
+        virtual tables and the tools' bookkeeping tables are left out.
+        """
+        async with self.pool.connection() as conn:
+            version = await self._schema_version(conn)
+            tables = schema_cache.lookup(self.db_path, version, "tables")
+            if tables is None:
+                async with conn.execute(table_kinds_query()) as cursor:
+                    tables = [(row[0], bool(row[1])) for row in await cursor.fetchall()]
+                schema_cache.store(self.db_path, version, "tables", tables)
+            return [name for name, _ in tables] if include_internal else visible_tables(tables)
+
+    async def get_table_info(self, table_name: str) -> List[Dict[str, Any]]:
+        """Return PRAGMA table_info rows, served from the schema cache while the schema is unchanged"""
+        async with self.pool.connection() as conn:
+            version = await self._schema_version(conn)
+            columns = schema_cache.lookup(self.db_path, version, ("columns", table_name))
+            if columns is None:
+                async with conn.execute(f"PRAGMA table_info({table_name})") as cursor:
+                    columns = [dict(row) for row in await cursor.fetchall()]
+                schema_cache.store(self.db_path, version, ("columns", table_name), columns)
+            return [dict(column) for column in columns]
+
+    async def close(self):
+        """Close all pooled read connections for this database"""
+        await self.pool.close()
+
+# One async instance (and connection pool) per database path
+_async_db_instances: Dict[str, AsyncSqliteDatabase] = {}
+
+def get_async_db_instance(db_path: str = "sqlite_db.db") -> AsyncSqliteDatabase:
+    """Get or create the async database instance for the given path"""
+    key = os.path.abspath(os.path.expanduser(db_path))
+    db = _async_db_instances.get(key)
+    if db is None:
+        db = AsyncSqliteDatabase(key)
+        _async_db_instances[key] = db
+    return db
+
+async def create_table(query: str, tool_context: ToolContext) -> dict:
+    """Create a new table in the SQLite database.
+
+    Args:
+        query (str): CREATE TABLE SQL statement
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with status
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_async_db_instance(db_path)
+
+    try:
+        # Validate that this is a single CREATE TABLE statement
+        analysis = analyze_sql(query)
+        if len(analysis.statements) != 1 or analysis.verb != "CREATE TABLE":
+            return {
+                "status": "error",
+                "error_message": "Only CREATE TABLE statements are allowed"
+            }
+
+        # Execute the query
+        await db.execute_query(query)
+
+        # Return success
+        return {
+            "status": "success",
+            "message": "Table created successfully"
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
+
+async def write_query(query: str, tool_context: ToolContext) -> dict:
+    """Execute an INSERT, UPDATE, or DELETE query on the SQLite database.
+
+    Args:
+        query (str): SQL query to execute
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with status and affected rows
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_async_db_instance(db_path)
+
+    try:
+        # Validate that this is a single statement that writes
+        analysis = analyze_sql(query)
+        if len(analysis.statements) > 1:
+            return {
+                "status": "error",
+                "error_message": "Only one statement can be executed at a time; use execute_batch for several"
+            }
+        if analysis.read_only:
+            return {
+                "status": "error",
+                "error_message": "SELECT queries are not allowed for write_query"
+            }
+
+        # Execute the query
+        result = await db.execute_query(query)
+
+        # Return the result
+        return {
+            "status": "success",
+            "affected_rows": result[0].get("affected_rows", 0) if result else 0
+        }
+    except Exception as e:
+        return _error_response(e)
+
+async def read_query(query: str, tool_context: ToolContext) -> dict:
+    """Execute a SELECT query on the SQLite database.
+
+    Small results come back as a "data" list of rows and large ones in the
+    columnar format; use read_query_formatted to pick the format.
+
+    Args:
+        query (str): SELECT SQL query to execute
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Query results with status and data
+    """
+    return await read_query_formatted(query, "auto", tool_context)
+
+async def read_query_formatted(query: str, result_format: str, tool_context: ToolContext) -> dict:
+    """Execute a SELECT query on the SQLite database and return its results in a chosen format.
+
+    Args:
+        query (str): SELECT SQL query to execute
+        result_format (str): "rows" for a list of row objects, "columnar" for column names plus row lists, or "auto" to use columnar for large results
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Query results with status and data
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_async_db_instance(db_path)
+
+    try:
+        # Validate that this is a single read-only query
+        analysis = analyze_sql(query)
+        if len(analysis.statements) != 1 or not analysis.read_only:
+            return {
+                "status": "error",
+                "error_message": "Only SELECT queries are allowed for read_query"
+            }
+        if result_format.strip().lower() not in RESULT_FORMATS:
+            return {
+                "status": "error",
+                "error_message": f"result_format must be one of: {', '.join(RESULT_FORMATS)}"
+            }
+
+        # Execute the query within the session's token budget, using the result cache when it is enabled
+        max_tokens = int(tool_context.state.get("sqlite_result_token_budget", RESULT_TOKEN_BUDGET))
+        budgeted = await db.execute_budgeted(query, max_tokens, use_cache=result_cache.enabled,
+                                             attached=session_attachments(tool_context))
+
+        # Return the results in the requested encoding
+        return _budgeted_response(budgeted, result_format)
+    except Exception as e:
+        return _error_response(e)
+
+async def list_tables(tool_context: ToolContext) -> dict:
+    """List all tables in the SQLite database.
+
+    Args:
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: List of tables with status
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_async_db_instance(db_path)
+
+    try:
+        # Get the data tables, without internal and shadow tables (cached until the schema changes)
+        tables = await db.get_table_names(include_internal=False)
+
+        # Return the table list
+        return {
+            "status": "success",
+            "tables": tables
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
+
+async def describe_table(table_name: str, tool_context: ToolContext) -> dict:
+    """Get the schema information for a specific table.
+
+    Args:
+        table_name (str): Name of the table to describe
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Table schema with status
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_async_db_instance(db_path)
+
+    try:
+        # Get table schema (cached until the schema changes)
+        results = await db.get_table_info(table_name)
+
+        # If no results, table might not exist
+        if not results:
+            return {
+                "status": "error",
+                "error_message": f"Table '{table_name}' does not exist"
+            }
+
+        # Return the schema information
+        return {
+            "status": "success",
+            "schema": results
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
+
+def in_thread(tool: Callable[..., dict]) -> Callable[..., Awaitable[dict]]:
+    """Async variant of a sync tool that runs it on a worker thread.
+
+    The variant keeps the tool's name, signature and docstring, which ADK
+    reads to describe it to the model.
+    """
+    @functools.wraps(tool)
+    async def run(*args, **kwargs) -> dict:
+        return await asyncio.to_thread(tool, *args, **kwargs)
+    return run
+
+# Sync tools without a native async implementation
+set_db_path = in_thread(sqlite_tools.set_db_path)
+create_database = in_thread(sqlite_tools.create_database)
+read_query_paged = in_thread(sqlite_tools.read_query_paged)
+fetch_next_page = in_thread(sqlite_tools.fetch_next_page)
+bulk_insert = in_thread(sqlite_tools.bulk_insert)
+execute_batch = in_thread(sqlite_tools.execute_batch)
+query_stats = in_thread(sqlite_tools.query_stats)
+run_maintenance = in_thread(sqlite_tools.run_maintenance)
+explain_query = in_thread(sqlite_advisor.explain_query)
+import_file = in_thread(sqlite_import.import_file)
+export_query = in_thread(sqlite_export.export_query)
+search_destinations = in_thread(sqlite_search.search_destinations)
+rebuild_destination_search = in_thread(sqlite_search.rebuild_destination_search)
+nearby_destinations = in_thread(sqlite_spatial.nearby_destinations)
+get_itinerary_summary = in_thread(sqlite_summaries.get_itinerary_summary)
+refresh_itinerary_summaries = in_thread(sqlite_summaries.refresh_itinerary_summaries)
+enable_change_feed = in_thread(sqlite_changes.enable_change_feed)
+disable_change_feed = in_thread(sqlite_changes.disable_change_feed)
+changes_since = in_thread(sqlite_changes.changes_since)
+attach_database = in_thread(sqlite_attach.attach_database)
+detach_database = in_thread(sqlite_attach.detach_database)
+snapshot_database = in_thread(sqlite_backup.snapshot_database)
+schedule_snapshots = in_thread(sqlite_backup.schedule_snapshots)
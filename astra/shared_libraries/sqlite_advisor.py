@@ -0,0 +1,278 @@
+"""
+Query plan inspection and index advice for SQLite databases.
+
+explain_query runs EXPLAIN QUERY PLAN, flags full-table scans and suggests
+CREATE INDEX statements for the columns a query filters or joins on, plus any
+foreign keys without an index. Suggestions can be benchmarked on a scratch
+copy of the database so the real file is never modified; benchmark runs get
+the database's query limits like any other read.
+"""
+
+import os
+import re
+import time
+import shutil
+import sqlite3
+import logging
+import tempfile
+import statistics
+from typing import Any, Dict, List, Optional, Set, Tuple
+from contextlib import closing
+from google.adk.tools.tool_context import ToolContext
+
+from astra.shared_libraries.sqlite_tools import SqliteDatabase, get_db_instance, quote_identifier
+from astra.shared_libraries.sqlite_analyzer import Token, analyze_sql, table_references, tokenize
+from astra.shared_libraries.sqlite_pool import PooledConnection, install_step_counter
+from astra.shared_libraries.sqlite_limits import QueryLimits, QueryTimeout
+
+logger = logging.getLogger('astra_sqlite_advisor')
+
+BENCHMARK_RUNS = 5
+
+# Comparison operators, spelled as the tokens the analyzer splits them into
+_OPERATORS = {"=", "==", "<>", "!=", "<=", ">=", "<", ">", "IN", "LIKE", "BETWEEN", "IS", "GLOB"}
+_EQUALITY_OPERATORS = {"=", "==", "IN", "IS"}
+# "SCAN t" on recent SQLite, "SCAN TABLE t" on older versions
+_SCAN_DETAIL = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS (\w+))?', re.IGNORECASE)
+
+
+def _is_name(token: Optional[Token]) -> bool:
+    return token is not None and token.kind in ("word", "identifier")
+
+def _column_at(tokens: List[Token], end: int) -> Optional[Tuple[Optional[str], str]]:
+    """The [qualifier.]column whose last token is at end, if there is one"""
+    if end < 0 or not _is_name(tokens[end]):
+        return None
+    if end >= 2 and tokens[end - 1].value == "." and _is_name(tokens[end - 2]):
+        return tokens[end - 2].value, tokens[end].value
+    return None, tokens[end].value
+
+def _predicate_columns(query: str) -> List[Tuple[Optional[str], str, bool]]:
+    """Return (qualifier, column, is_equality) for every column compared in the query"""
+    tokens = tokenize(query)
+    found = []
+    position = 0
+    while position < len(tokens):
+        token = tokens[position]
+        # Operators such as <= arrive as one punctuation token per character
+        operator_end = position
+        if token.kind == "punct":
+            while (operator_end + 1 < len(tokens) and tokens[operator_end + 1].kind == "punct"
+                   and tokens[operator_end + 1].value in "=<>!"):
+                operator_end += 1
+            operator = "".join(t.value for t in tokens[position:operator_end + 1])
+        else:
+            operator = token.value.upper() if token.kind == "word" else ""
+        if operator not in _OPERATORS:
+            position += 1
+            continue
+
+        # col NOT IN (...), col NOT LIKE ...
+        negated = position > 0 and tokens[position - 1].kind == "word" and tokens[position - 1].value.upper() == "NOT"
+        is_equality = operator in _EQUALITY_OPERATORS and not negated
+        left = _column_at(tokens, position - 2 if negated else position - 1)
+        right_at = operator_end + 1
+        if right_at < len(tokens) and tokens[right_at].kind == "word" and tokens[right_at].value.upper() == "NOT":
+            right_at += 1
+        if right_at + 2 < len(tokens) and tokens[right_at + 1].value == ".":
+            right_at += 2
+        right = _column_at(tokens, right_at) if right_at < len(tokens) else None
+        for column in (left, right):
+            if column:
+                found.append((column[0], column[1], is_equality))
+        position = operator_end + 1
+    return found
+
+def parse_query_plan(rows: List[Any]) -> List[Dict[str, Any]]:
+    """Turn EXPLAIN QUERY PLAN rows into a tree of steps with scan flags"""
+    nodes: Dict[int, Dict[str, Any]] = {}
+    roots = []
+    for row in rows:
+        node_id, parent_id, detail = row[0], row[1], row[3]
+        scan = _SCAN_DETAIL.match(detail)
+        full_scan = bool(scan) and "USING" not in detail.upper() and scan.group(1).upper() not in ("CONSTANT", "SUBQUERY")
+        node = {
+            "id": node_id,
+            "detail": detail,
+            "full_table_scan": full_scan,
+            "uses_temp_btree": "TEMP B-TREE" in detail.upper(),
+            "children": []
+        }
+        if full_scan:
+            node["table"] = scan.group(2) or scan.group(1)
+        nodes[node_id] = node
+        if parent_id in nodes:
+            nodes[parent_id]["children"].append(node)
+        else:
+            roots.append(node)
+    return roots
+
+def _walk(nodes: List[Dict[str, Any]]):
+    for node in nodes:
+        yield node
+        yield from _walk(node["children"])
+
+def _indexed_leading_columns(conn: sqlite3.Connection, table: str) -> Set[str]:
+    """Columns that are already the leftmost column of some index (or the rowid)"""
+    leading = set()
+    for index in conn.execute(f"PRAGMA index_list({quote_identifier(table)})").fetchall():
+        columns = conn.execute(f"PRAGMA index_info({quote_identifier(index[1])})").fetchall()
+        if columns:
+            leading.add(str(columns[0][2]).lower())
+    for column in conn.execute(f"PRAGMA table_info({quote_identifier(table)})").fetchall():
+        if column[5] == 1 and str(column[2]).upper() == "INTEGER":
+            leading.add(str(column[1]).lower())
+    return leading
+
+def _index_statement(table: str, columns: List[str]) -> str:
+    name = "idx_" + "_".join([table] + columns).lower()
+    column_list = ", ".join(quote_identifier(column) for column in columns)
+    return f"CREATE INDEX IF NOT EXISTS {quote_identifier(name)} ON {quote_identifier(table)} ({column_list})"
+
+def suggest_indexes(conn: sqlite3.Connection, query: str, plan: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Suggest indexes for scanned tables' predicate columns and unindexed foreign keys"""
+    references = table_references(query)
+    tables = sorted(set(references.values()))
+    columns_by_table = {
+        table: {str(row[1]).lower(): row[1] for row in conn.execute(f"PRAGMA table_info({quote_identifier(table)})")}
+        for table in tables
+    }
+    predicates = _predicate_columns(query)
+    suggestions: List[Dict[str, Any]] = []
+    seen = set()
+
+    def add(table: str, columns: List[str], reason: str):
+        leading = _indexed_leading_columns(conn, table)
+        if not columns or columns[0].lower() in leading or (table, tuple(columns)) in seen:
+            return
+        seen.add((table, tuple(columns)))
+        suggestions.append({"table": table, "columns": columns, "reason": reason,
+                            "sql": _index_statement(table, columns)})
+
+    # Columns the scanned tables are filtered or joined on, equality first
+    for node in _walk(plan):
+        if not node["full_table_scan"]:
+            continue
+        table = references.get(node["table"].lower(), node["table"])
+        known = columns_by_table.get(table, {})
+        equality, ranged = [], []
+        for qualifier, column, is_equality in predicates:
+            if column.lower() not in known:
+                continue
+            if qualifier and references.get(qualifier.lower()) != table:
+                continue
+            if not qualifier and sum(column.lower() in cols for cols in columns_by_table.values()) > 1:
+                continue
+            target = equality if is_equality else ranged
+            name = known[column.lower()]
+            if name not in equality and name not in ranged:
+                target.append(name)
+        columns = (equality + ranged)[:3]
+        add(table, columns, f"Full scan of {table} filtered or joined on {', '.join(columns)}")
+
+    # Foreign keys without an index make every join through them a scan
+    for table in tables:
+        for fk in conn.execute(f"PRAGMA foreign_key_list({quote_identifier(table)})").fetchall():
+            add(table, [fk[3]], f"Foreign key {table}.{fk[3]} -> {fk[2]}.{fk[4]} has no index")
+
+    return suggestions
+
+def _time_query(conn: sqlite3.Connection, query: str, runs: int, limits: QueryLimits) -> float:
+    """Median wall time in milliseconds of running and fully fetching a query, each run under limits"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        with conn.step_counter.limited(limits):
+            conn.execute(query).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 3)
+
+def benchmark_indexes(db: SqliteDatabase, query: str, statements: List[str],
+                      runs: int = BENCHMARK_RUNS) -> Dict[str, Any]:
+    """Time a query on a scratch copy of the database before and after creating indexes.
+
+    Every run gets the database's query limits; QueryTimeout ends the benchmark.
+    """
+    scratch_dir = tempfile.mkdtemp(prefix="astra_index_bench_")
+    scratch_path = os.path.join(scratch_dir, "scratch.db")
+    try:
+        with db.pool.connection() as source, \
+                closing(sqlite3.connect(scratch_path, factory=PooledConnection)) as scratch:
+            install_step_counter(scratch)
+            source.backup(scratch)
+            before_ms = _time_query(scratch, query, runs, db.query_limits)
+            for statement in statements:
+                scratch.execute(statement)
+            scratch.execute("ANALYZE")
+            scratch.commit()
+            after_ms = _time_query(scratch, query, runs, db.query_limits)
+            plan_after = parse_query_plan(scratch.execute(f"EXPLAIN QUERY PLAN {query}").fetchall())
+        return {
+            "runs": runs,
+            "before_ms": before_ms,
+            "after_ms": after_ms,
+            "speedup": round(before_ms / after_ms, 2) if after_ms > 0 else None,
+            "plan_after": plan_after
+        }
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+def explain_query(query: str, benchmark: bool, tool_context: ToolContext) -> dict:
+    """Show how SQLite will run a query, flag full-table scans and suggest indexes.
+
+    Args:
+        query (str): SELECT, UPDATE or DELETE statement to analyze (it is not executed)
+        benchmark (bool): Also time a SELECT before and after the suggested indexes on a scratch copy of the database
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Query plan, full-scan flags, suggested CREATE INDEX statements and optional benchmark
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        # Validate the statement type
+        analysis = analyze_sql(query)
+        if len(analysis.statements) != 1 or analysis.verb not in ("SELECT", "VALUES", "UPDATE", "DELETE"):
+            return {
+                "status": "error",
+                "error_message": "Only SELECT, WITH, UPDATE or DELETE statements can be explained"
+            }
+
+        # Read the plan and derive suggestions
+        with db.pool.connection() as conn:
+            plan = parse_query_plan(conn.execute(f"EXPLAIN QUERY PLAN {query}").fetchall())
+            suggestions = suggest_indexes(conn, query, plan)
+
+        references = table_references(query)
+        result = {
+            "status": "success",
+            "plan": plan,
+            "full_table_scans": sorted({
+                references.get(node["table"].lower(), node["table"])
+                for node in _walk(plan) if node["full_table_scan"]
+            }),
+            "uses_temp_btree": any(node["uses_temp_btree"] for node in _walk(plan)),
+            "suggested_indexes": suggestions
+        }
+
+        # Optionally measure the suggestions on a scratch copy
+        if benchmark:
+            if not analysis.read_only:
+                result["benchmark"] = {"skipped": "Only SELECT queries can be benchmarked"}
+            elif not suggestions:
+                result["benchmark"] = {"skipped": "No indexes to benchmark"}
+            else:
+                try:
+                    result["benchmark"] = benchmark_indexes(db, query, [s["sql"] for s in suggestions])
+                except QueryTimeout as e:
+                    result["benchmark"] = {"skipped": str(e)}
+
+        return result
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
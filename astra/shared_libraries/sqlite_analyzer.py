@@ -0,0 +1,481 @@
+"""
+Lightweight SQL statement analyzer for the shared SQLite tools.
+
+A small tokenizer (comments, string literals and quoted identifiers are
+handled properly) splits a SQL string into statements and classifies each one:
+what kind of statement it is, whether it only reads, and which tables it reads
+and writes. This replaces prefix checks such as startswith("SELECT"), which
+misclassify CTEs (WITH ... INSERT), REPLACE, PRAGMA assignments, leading
+comments and multi-statement strings.
+
+The analyzer does not validate SQL; SQLite remains the judge of that. When a
+statement cannot be classified it is treated as a write, so it is never
+routed to a read-only connection by mistake.
+"""
+
+import re
+from collections import namedtuple
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+Token = namedtuple("Token", "kind value")
+
+_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<blob>[xX]'[0-9a-fA-F]*')
+  | (?P<string>'(?:[^']|'')*'?)
+  | (?P<quoted>"(?:[^"]|"")*"?|`(?:[^`]|``)*`?|\[[^\]]*\]?)
+  | (?P<number>0[xX][0-9a-fA-F]+|(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)
+  | (?P<param>\?\d*|[:@$][\w$]+)
+  | (?P<word>[^\W\d][\w$]*)
+  | (?P<punct>.)
+""", re.VERBOSE | re.DOTALL)
+
+# Statement kinds
+READ = "read"
+WRITE = "write"
+SCHEMA = "schema"
+PRAGMA = "pragma"
+TRANSACTION = "transaction"
+MAINTENANCE = "maintenance"
+CONNECTION = "connection"
+UNKNOWN = "unknown"
+
+_TRANSACTION_VERBS = {"BEGIN", "COMMIT", "END", "ROLLBACK", "SAVEPOINT", "RELEASE"}
+_MAINTENANCE_VERBS = {"VACUUM", "ANALYZE", "REINDEX"}
+_CONFLICT_ACTIONS = {"ROLLBACK", "ABORT", "REPLACE", "FAIL", "IGNORE"}
+
+# Pragmas that take an argument in parentheses but only report information
+_READ_PRAGMA_FUNCTIONS = {
+    "table_info", "table_xinfo", "table_list", "index_list", "index_info", "index_xinfo",
+    "foreign_key_list", "foreign_key_check", "integrity_check", "quick_check",
+}
+# Pragmas that modify the database even without an assignment
+_WRITE_PRAGMAS = {"optimize", "wal_checkpoint", "incremental_vacuum"}
+
+# Words that end a table reference rather than aliasing it
+_CLAUSE_WORDS = {
+    "ON", "USING", "WHERE", "GROUP", "ORDER", "LIMIT", "HAVING", "WINDOW", "UNION", "EXCEPT",
+    "INTERSECT", "JOIN", "INNER", "LEFT", "RIGHT", "FULL", "OUTER", "CROSS", "NATURAL", "SET",
+    "VALUES", "SELECT", "RETURNING", "INDEXED", "NOT", "DEFAULT", "DO", "FROM", "AS",
+}
+# Words that end a table list or a join constraint: the next join or the next clause
+_REFERENCE_END_WORDS = {
+    "JOIN", "INNER", "LEFT", "RIGHT", "FULL", "OUTER", "CROSS", "NATURAL", "WHERE", "GROUP", "ORDER",
+    "LIMIT", "HAVING", "WINDOW", "UNION", "EXCEPT", "INTERSECT", "RETURNING", "SET", "DO", "ON",
+}
+
+
+def tokenize(sql: str) -> List[Token]:
+    """Split SQL into tokens, dropping whitespace and comments.
+
+    Quoted identifiers are returned unquoted with kind "identifier"; unquoted
+    words have kind "word" and may be keywords.
+    """
+    tokens = []
+    for match in _TOKEN.finditer(sql):
+        kind = match.lastgroup
+        value = match.group()
+        if kind in ("space", "comment"):
+            continue
+        if kind == "quoted":
+            closing = {"[": "]"}.get(value[0], value[0])
+            inner = value[1:-1] if len(value) > 1 and value.endswith(closing) else value[1:]
+            tokens.append(Token("identifier", inner.replace(closing * 2, closing) if closing != "]" else inner))
+        elif kind == "blob":
+            tokens.append(Token("string", value))
+        else:
+            tokens.append(Token(kind, value))
+    return tokens
+
+def _keyword(token: Optional[Token]) -> Optional[str]:
+    return token.value.upper() if token is not None and token.kind == "word" else None
+
+def split_statements(tokens: List[Token]) -> List[List[Token]]:
+    """Split tokens into statements on semicolons, keeping trigger bodies whole"""
+    statements: List[List[Token]] = []
+    current: List[Token] = []
+    depth = 0
+    for token in tokens:
+        if token.kind == "punct" and token.value == ";" and depth == 0:
+            if current:
+                statements.append(current)
+            current = []
+            continue
+        current.append(token)
+        # CREATE TRIGGER ... BEGIN ...; ...; END contains semicolons of its own
+        if _keyword(current[0]) == "CREATE" and any(_keyword(t) == "TRIGGER" for t in current[1:4]):
+            keyword = _keyword(token)
+            if keyword in ("BEGIN", "CASE"):
+                depth += 1
+            elif keyword == "END" and depth > 0:
+                depth -= 1
+    if current:
+        statements.append(current)
+    return statements
+
+
+class StatementInfo:
+    """Classification of one SQL statement"""
+
+    def __init__(self, kind: str, verb: str, reads: Set[str], writes: Set[str],
+                 read_only: bool, targets_known: bool = True, autocommit: bool = False,
+                 reads_known: bool = True):
+        self.kind = kind
+        self.verb = verb
+        self.reads = frozenset(reads)
+        self.writes = frozenset(writes)
+        self.read_only = read_only
+        # False when the statement may read tables missing from reads
+        self.reads_known = reads_known
+        # False when the statement changes data in ways not captured by writes
+        self.targets_known = targets_known
+        # True for statements SQLite refuses to run inside a transaction
+        self.autocommit = autocommit
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "kind": self.kind,
+            "verb": self.verb,
+            "read_only": self.read_only,
+            "reads": sorted(self.reads),
+            "writes": sorted(self.writes),
+        }
+
+
+class SqlAnalysis:
+    """Classification of a SQL string, which may hold several statements"""
+
+    def __init__(self, statements: List[StatementInfo]):
+        self.statements = statements
+
+    @property
+    def read_only(self) -> bool:
+        """True only if there is at least one statement and none of them writes"""
+        return bool(self.statements) and all(s.read_only for s in self.statements)
+
+    @property
+    def schema_change(self) -> bool:
+        return any(s.kind == SCHEMA for s in self.statements)
+
+    @property
+    def targets_known(self) -> bool:
+        return all(s.targets_known for s in self.statements)
+
+    @property
+    def reads_known(self) -> bool:
+        return all(s.reads_known for s in self.statements)
+
+    @property
+    def autocommit(self) -> bool:
+        return any(s.autocommit for s in self.statements)
+
+    @property
+    def reads(self) -> FrozenSet[str]:
+        return frozenset().union(*(s.reads for s in self.statements))
+
+    @property
+    def writes(self) -> FrozenSet[str]:
+        return frozenset().union(*(s.writes for s in self.statements))
+
+    @property
+    def verb(self) -> Optional[str]:
+        """Main verb of the first statement (INSERT for WITH ... INSERT)"""
+        return self.statements[0].verb if self.statements else None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "read_only": self.read_only,
+            "reads": sorted(self.reads),
+            "writes": sorted(self.writes),
+            "statements": [s.to_dict() for s in self.statements],
+        }
+
+
+def _qualified_name(tokens: List[Token], position: int) -> Tuple[Optional[str], int]:
+    """Read [schema.]name at position; return the lowercased name and the position after it"""
+    if position >= len(tokens) or tokens[position].kind not in ("word", "identifier", "string"):
+        return None, position
+    name = tokens[position].value
+    if tokens[position].kind == "string":
+        name = name[1:-1]
+    position += 1
+    if (position + 1 < len(tokens) and tokens[position].value == "."
+            and tokens[position + 1].kind in ("word", "identifier")):
+        schema = name.lower()
+        name = tokens[position + 1].value
+        position += 2
+        if schema not in ("main", "temp"):
+            return f"{schema}.{name.lower()}", position
+    return name.lower(), position
+
+def _skip_parens(tokens: List[Token], position: int) -> int:
+    """Skip a balanced parenthesized group starting at position"""
+    depth = 0
+    while position < len(tokens):
+        if tokens[position].value == "(" and tokens[position].kind == "punct":
+            depth += 1
+        elif tokens[position].value == ")" and tokens[position].kind == "punct":
+            depth -= 1
+            if depth == 0:
+                return position + 1
+        position += 1
+    return position
+
+def _skip_words(tokens: List[Token], position: int, *words: str) -> int:
+    """Skip a run of the given keywords"""
+    while position < len(tokens) and _keyword(tokens[position]) in words:
+        position += 1
+    return position
+
+def _common_table_names(tokens: List[Token]) -> Tuple[Set[str], int]:
+    """Collect the names defined by a leading WITH clause; return them and the main verb's position"""
+    names: Set[str] = set()
+    position = _skip_words(tokens, 1, "RECURSIVE")
+    while position < len(tokens):
+        name, position = _qualified_name(tokens, position)
+        if name is None:
+            break
+        names.add(name)
+        if position < len(tokens) and tokens[position].value == "(":
+            position = _skip_parens(tokens, position)
+        position = _skip_words(tokens, position, "AS", "NOT", "MATERIALIZED")
+        if position < len(tokens) and tokens[position].value == "(":
+            position = _skip_parens(tokens, position)
+        if position < len(tokens) and tokens[position].value == ",":
+            position += 1
+            continue
+        break
+    return names, position
+
+def _skip_join_constraint(tokens: List[Token], position: int) -> int:
+    """Skip an ON expression or USING column list starting at position"""
+    if _keyword(tokens[position]) == "USING":
+        return _skip_parens(tokens, position + 1)
+    position += 1
+    while position < len(tokens):
+        token = tokens[position]
+        if token.value == "(" and token.kind == "punct":
+            # Subqueries in the expression; their own FROM clauses are found separately
+            position = _skip_parens(tokens, position)
+            continue
+        if (token.kind == "punct" and token.value in (",", ")")) or _keyword(token) in _REFERENCE_END_WORDS:
+            break
+        position += 1
+    return position
+
+def _table_refs(tokens: List[Token], skip: Iterable[int],
+                after: Tuple[str, ...] = ("FROM", "JOIN")) -> Iterator[Optional[Tuple[str, str, Optional[str]]]]:
+    """Yield (name, name as written, alias) for each table named after the given keywords, including FROM a, b lists.
+
+    Yields None where a table list cannot be followed with confidence, so
+    callers can treat the statement's tables as unknown.
+    """
+    skipped = set(skip)
+    for index, token in enumerate(tokens):
+        keyword = _keyword(token)
+        if index in skipped or keyword not in after:
+            continue
+        if keyword == "FROM" and index > 0 and _keyword(tokens[index - 1]) == "DISTINCT":
+            # IS [NOT] DISTINCT FROM compares values
+            continue
+        position = index + 1
+        if keyword == "UPDATE":
+            position = _skip_words(tokens, position, "OR", *_CONFLICT_ACTIONS)
+        while position < len(tokens):
+            table = None
+            if tokens[position].value == "(":
+                # Subquery; its own FROM clauses are found separately
+                position = _skip_parens(tokens, position)
+            else:
+                name = None
+                if _keyword(tokens[position]) not in _CLAUSE_WORDS:
+                    name, position = _qualified_name(tokens, position)
+                if name is None:
+                    yield None
+                    break
+                if position < len(tokens) and tokens[position].value == "(":
+                    # Table-valued function such as json_each(...)
+                    position = _skip_parens(tokens, position)
+                else:
+                    table = (name, tokens[position - 1].value)
+            # Skip an alias and index hints
+            alias = None
+            if _keyword(tokens[position] if position < len(tokens) else None) == "AS":
+                position += 1
+            if (position < len(tokens) and tokens[position].kind in ("word", "identifier")
+                    and _keyword(tokens[position]) not in _CLAUSE_WORDS):
+                alias = tokens[position].value
+                position += 1
+            if _keyword(tokens[position] if position < len(tokens) else None) == "INDEXED":
+                position += 3
+            elif _keyword(tokens[position] if position < len(tokens) else None) == "NOT":
+                position += 2
+            if table:
+                yield table[0], table[1], alias
+            # A join constraint may be followed by more comma-separated tables
+            if _keyword(tokens[position] if position < len(tokens) else None) in ("ON", "USING"):
+                position = _skip_join_constraint(tokens, position)
+            if position >= len(tokens):
+                break
+            if tokens[position].value == ",":
+                position += 1
+                continue
+            # Anything but the end of the table list means it was not understood
+            if tokens[position].value != ")" and _keyword(tokens[position]) not in _REFERENCE_END_WORDS:
+                yield None
+            break
+
+def _table_reads(tokens: List[Token], skip: Iterable[int], local_names: Set[str]) -> Tuple[Set[str], bool]:
+    """Tables named after FROM or JOIN anywhere in the statement, and whether all of them were identified"""
+    reads: Set[str] = set()
+    known = True
+    for reference in _table_refs(tokens, skip):
+        if reference is None:
+            known = False
+        elif reference[0] not in local_names:
+            reads.add(reference[0])
+    return reads, known
+
+def _analyze_statement(tokens: List[Token]) -> StatementInfo:
+    verb = _keyword(tokens[0]) or ""
+    local_names: Set[str] = set()
+    position = 0
+
+    if verb == "EXPLAIN":
+        inner = _analyze_statement(tokens[_skip_words(tokens, 1, "QUERY", "PLAN"):] or tokens[:1])
+        return StatementInfo(READ, "EXPLAIN", inner.reads, set(), read_only=True, reads_known=inner.reads_known)
+
+    if verb == "WITH":
+        local_names, position = _common_table_names(tokens)
+        verb = _keyword(tokens[position] if position < len(tokens) else None) or ""
+
+    if verb in ("SELECT", "VALUES"):
+        reads, reads_known = _table_reads(tokens, (), local_names)
+        return StatementInfo(READ, verb, reads, set(), read_only=True, reads_known=reads_known)
+
+    if verb in ("INSERT", "REPLACE", "UPDATE", "DELETE"):
+        target_at = _skip_words(tokens, position + 1, "OR", *_CONFLICT_ACTIONS)
+        target_at = _skip_words(tokens, target_at, "INTO", "FROM")
+        target, _ = _qualified_name(tokens, target_at)
+        reads, reads_known = _table_reads(tokens, range(position, target_at), local_names)
+        return StatementInfo(WRITE, verb, reads, {target} if target else set(), read_only=False,
+                             targets_known=target is not None, reads_known=reads_known)
+
+    if verb in ("CREATE", "DROP", "ALTER"):
+        object_at = _skip_words(tokens, position + 1, "TEMP", "TEMPORARY", "UNIQUE", "VIRTUAL")
+        object_type = _keyword(tokens[object_at] if object_at < len(tokens) else None) or ""
+        name, after = _qualified_name(tokens, _skip_words(tokens, object_at + 1, "IF", "NOT", "EXISTS"))
+        writes = {name} if name and object_type in ("TABLE", "VIEW") else set()
+        if verb == "ALTER" and _keyword(tokens[after] if after < len(tokens) else None) == "RENAME":
+            new_name, _ = _qualified_name(tokens, _skip_words(tokens, after + 1, "TO"))
+            if new_name and _keyword(tokens[after + 1] if after + 1 < len(tokens) else None) == "TO":
+                writes.add(new_name)
+        reads, reads_known = set(), True
+        if object_type in ("TABLE", "VIEW"):
+            reads, reads_known = _table_reads(tokens, (), local_names)
+        return StatementInfo(SCHEMA, f"{verb} {object_type}".strip(), reads, writes, read_only=False,
+                             reads_known=reads_known)
+
+    if verb == "PRAGMA":
+        name, after = _qualified_name(tokens, 1)
+        name = (name or "").rsplit(".", 1)[-1]
+        following = tokens[after].value if after < len(tokens) else None
+        read_only = following != "=" and name not in _WRITE_PRAGMAS and (
+            following != "(" or name in _READ_PRAGMA_FUNCTIONS
+        )
+        # Pragmas such as foreign_keys and journal_mode are silently ignored
+        # inside a transaction, so settings run outside one
+        return StatementInfo(PRAGMA, "PRAGMA", set(), set(), read_only=read_only,
+                             targets_known=read_only or name not in _WRITE_PRAGMAS, autocommit=not read_only)
+
+    if verb in _TRANSACTION_VERBS:
+        return StatementInfo(TRANSACTION, verb, set(), set(), read_only=False)
+
+    if verb in _MAINTENANCE_VERBS:
+        # VACUUM may renumber rowids, so it counts as changing every table
+        return StatementInfo(MAINTENANCE, verb, set(), set(), read_only=False,
+                             targets_known=verb != "VACUUM", autocommit=verb == "VACUUM")
+
+    if verb in ("ATTACH", "DETACH"):
+        return StatementInfo(CONNECTION, verb, set(), set(), read_only=False)
+
+    return StatementInfo(UNKNOWN, verb, set(), set(), read_only=False, targets_known=False)
+
+def analyze_sql(sql: str) -> SqlAnalysis:
+    """Classify every statement in a SQL string"""
+    return SqlAnalysis([_analyze_statement(tokens) for tokens in split_statements(tokenize(sql))])
+
+def table_references(sql: str) -> Dict[str, str]:
+    """Map each table name and alias a statement uses, lowercased, to the table name as written.
+
+    Covers FROM and JOIN clauses and UPDATE targets; names defined by WITH
+    and table-valued functions are left out.
+    """
+    references: Dict[str, str] = {}
+    for tokens in split_statements(tokenize(sql)):
+        local_names = _common_table_names(tokens)[0] if _keyword(tokens[0]) == "WITH" else set()
+        for reference in _table_refs(tokens, (), ("FROM", "JOIN", "UPDATE")):
+            if reference is None or reference[0] in local_names:
+                continue
+            name, written, alias = reference
+            references[written.lower()] = written
+            if alias:
+                references[alias.lower()] = written
+    return references
+
+def trigger_effects(sql: str) -> Tuple[Optional[str], FrozenSet[str]]:
+    """Return the table a CREATE TRIGGER statement fires on and the tables its body writes"""
+    tokens = tokenize(sql)
+    on = next((i for i, token in enumerate(tokens) if _keyword(token) == "ON"), None)
+    if on is None:
+        return None, frozenset()
+    target, _ = _qualified_name(tokens, on + 1)
+    begin = next((i for i in range(on + 1, len(tokens)) if _keyword(tokens[i]) == "BEGIN"), None)
+    if begin is None:
+        return target, frozenset()
+    body = tokens[begin + 1:]
+    if body and _keyword(body[-1]) == "END":
+        body = body[:-1]
+    writes = frozenset().union(*(_analyze_statement(statement).writes for statement in split_statements(body)))
+    return target, writes
+
+# Foreign key actions that change the child table when the parent changes
+_CASCADING_ACTIONS = {"CASCADE", "SET NULL", "SET DEFAULT"}
+
+def table_dependencies(conn) -> Dict[str, Set[str]]:
+    """Map each table or view to the tables and views a write to it can also change.
+
+    Covers trigger bodies, cascading foreign keys and views reading the table.
+    """
+    dependencies: Dict[str, Set[str]] = {}
+    objects = conn.execute(
+        "SELECT type, name, sql FROM sqlite_master WHERE sql IS NOT NULL "
+        "UNION ALL SELECT type, name, sql FROM sqlite_temp_master WHERE sql IS NOT NULL"
+    ).fetchall()
+    for object_type, name, sql in objects:
+        if object_type == "view":
+            for table in analyze_sql(sql).reads:
+                dependencies.setdefault(table, set()).add(name.lower())
+        elif object_type == "trigger":
+            target, writes = trigger_effects(sql)
+            if target:
+                dependencies.setdefault(target, set()).update(writes)
+        elif object_type == "table":
+            quoted = '"' + name.replace('"', '""') + '"'
+            for fk in conn.execute(f"PRAGMA foreign_key_list({quoted})").fetchall():
+                if str(fk[5]).upper() in _CASCADING_ACTIONS or str(fk[6]).upper() in _CASCADING_ACTIONS:
+                    dependencies.setdefault(str(fk[2]).lower(), set()).add(name.lower())
+    return dependencies
+
+def expand_writes(dependencies: Dict[str, Set[str]], tables: Iterable[str]) -> Set[str]:
+    """Every table or view a write to the given tables can change, following dependencies"""
+    changed: Set[str] = set()
+    pending = [table.lower() for table in tables]
+    while pending:
+        table = pending.pop()
+        if table in changed:
+            continue
+        changed.add(table)
+        pending.extend(dependencies.get(table, ()))
+    return changed
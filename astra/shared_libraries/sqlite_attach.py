@@ -0,0 +1,113 @@
+"""
+Cross-database queries for the shared SQLite tools.
+
+attach_database adds a database from the catalog (or any database file) to
+the session under a schema alias, after which read_query, read_query_paged
+and export_query can join its tables with the current database's as
+alias.table. Attached databases are read-only. The session only records the
+alias -> path mapping; pooled connections attach the databases when a query
+needs them and keep them attached, so repeated queries pay nothing for it.
+"""
+
+import os
+import re
+import logging
+from google.adk.tools.tool_context import ToolContext
+
+from astra.shared_libraries.sqlite_tools import ATTACHED_STATE_KEY, session_attachments
+from astra.shared_libraries.sqlite_catalog import database_catalog, database_stats, resolve_database_path
+
+logger = logging.getLogger('astra_sqlite_attach')
+
+# SQLite allows 10 attached databases per connection by default
+MAX_ATTACHED_DATABASES = 8
+RESERVED_ALIASES = {"main", "temp"}
+
+_ALIAS = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+def attach_database(database: str, alias: str, tool_context: ToolContext) -> dict:
+    """Attach another database read-only so queries can join across databases.
+
+    After attaching, refer to its tables as alias.table_name in read_query,
+    read_query_paged and export_query, e.g.
+    SELECT * FROM main.Users u JOIN travel.Itineraries i ON i.user_id = u.user_id
+    JOIN travel.Bookings b ON b.itinerary_id = i.itinerary_id.
+
+    Args:
+        database (str): Name of a database in the catalog, or the path of a database file
+        alias (str): Schema name to use for it in queries (letters, digits and underscores)
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with the attached database's path and tables
+    """
+    try:
+        if not _ALIAS.match(alias or "") or alias.lower() in RESERVED_ALIASES:
+            return {
+                "status": "error",
+                "error_message": "Alias must be letters, digits and underscores, and not 'main' or 'temp'"
+            }
+
+        # Catalog names take precedence over file paths
+        entry = database_catalog.get(database)
+        path = entry["path"] if entry and entry.get("path") else resolve_database_path(database)
+        if not os.path.isfile(path):
+            return {
+                "status": "error",
+                "error_message": f"Database '{database}' is not in the catalog and no such file exists"
+            }
+        path = os.path.abspath(path)
+
+        attached = session_attachments(tool_context)
+        if alias not in attached and len(attached) >= MAX_ATTACHED_DATABASES:
+            return {
+                "status": "error",
+                "error_message": f"At most {MAX_ATTACHED_DATABASES} databases can be attached; detach one first"
+            }
+
+        # Reading its tables also checks that the file is a SQLite database
+        stats = database_stats(path)
+
+        attached[alias] = path
+        tool_context.state[ATTACHED_STATE_KEY] = attached
+        logger.info(f"Attached {path} as {alias}")
+
+        return {
+            "status": "success",
+            "message": f"Attached {database} as '{alias}'; query its tables as {alias}.table_name",
+            "alias": alias,
+            "path": path,
+            "tables": ", ".join(stats["tables"]),
+            "attached": ", ".join(f"{name}={attached_path}" for name, attached_path in attached.items())
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
+
+def detach_database(alias: str, tool_context: ToolContext) -> dict:
+    """Detach a database attached with attach_database.
+
+    Args:
+        alias (str): Alias the database was attached under
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with the databases still attached
+    """
+    attached = session_attachments(tool_context)
+    if alias not in attached:
+        return {
+            "status": "error",
+            "error_message": f"No database is attached as '{alias}'"
+        }
+
+    del attached[alias]
+    tool_context.state[ATTACHED_STATE_KEY] = attached
+
+    return {
+        "status": "success",
+        "message": f"Detached '{alias}'",
+        "attached": ", ".join(f"{name}={path}" for name, path in attached.items())
+    }
@@ -0,0 +1,282 @@
+"""
+Online snapshots of SQLite databases with the sqlite3 backup API.
+
+snapshot_database copies a live database page by page with
+Connection.backup, a few hundred pages per step with a short sleep between
+steps. The source is only locked while a step runs, so writers keep making
+progress during the copy, and the result is always a consistent snapshot:
+if another connection writes mid-copy, SQLite restarts the backup. A database
+that keeps restarting the copy is finished in a single step instead. The
+snapshot is written under a temporary name, renamed when complete and
+registered in the database catalog.
+
+schedule_snapshots takes snapshots in a background thread at a fixed
+interval, keeping only the most recent ones.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+from google.adk.tools.tool_context import ToolContext
+
+from astra.shared_libraries.sqlite_tools import SqliteDatabase, get_db_instance
+from astra.shared_libraries.sqlite_catalog import database_catalog, database_stats
+
+logger = logging.getLogger('astra_sqlite_backup')
+
+BACKUP_PAGES_PER_STEP = int(os.getenv("ASTRA_SQLITE_BACKUP_PAGES", "256"))
+BACKUP_STEP_SLEEP = int(os.getenv("ASTRA_SQLITE_BACKUP_SLEEP_MS", "10")) / 1000
+# Restarts caused by concurrent writes before the copy is finished in one step
+MAX_BACKUP_RESTARTS = 3
+SNAPSHOT_DIRECTORY = "snapshots"
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def snapshot(db: SqliteDatabase, dest: str, pages_per_step: int = BACKUP_PAGES_PER_STEP,
+             step_sleep: float = BACKUP_STEP_SLEEP) -> Dict[str, Any]:
+    """Copy a live database to dest in page-sized steps; returns pages copied, steps and duration"""
+    dest = os.path.abspath(os.path.expanduser(dest))
+    if os.path.normcase(dest) == os.path.normcase(os.path.abspath(db.db_path)):
+        raise ValueError("The snapshot cannot overwrite the database itself")
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    partial = dest + ".part"
+    if os.path.exists(partial):
+        os.remove(partial)
+
+    progress = {"steps": 0, "restarts": 0, "pages": 0, "remaining": None}
+
+    def on_step(status: int, remaining: int, total: int):
+        progress["steps"] += 1
+        progress["pages"] = total
+        # A write by another connection starts the copy again from the first page
+        if progress["remaining"] is not None and remaining > progress["remaining"]:
+            progress["restarts"] += 1
+            if progress["restarts"] > MAX_BACKUP_RESTARTS:
+                raise _TooManyRestarts()
+        progress["remaining"] = remaining
+        if remaining:
+            time.sleep(step_sleep)
+
+    started = time.perf_counter()
+    single_step = False
+    try:
+        with db.pool.connection() as source, closing(sqlite3.connect(partial)) as target:
+            try:
+                source.backup(target, pages=pages_per_step, progress=on_step)
+            except _TooManyRestarts:
+                logger.warning(f"Snapshot of {db.db_path} kept restarting under writes; copying in one step")
+                single_step = True
+                source.backup(target)
+            progress["pages"] = target.execute("PRAGMA page_count").fetchone()[0]
+        os.replace(partial, dest)
+    except Exception:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Snapshot of {db.db_path} to {dest}: {progress['pages']} pages in {elapsed:.2f}s")
+    return {
+        "source": db.db_path,
+        "path": dest,
+        "pages_copied": progress["pages"],
+        "steps": progress["steps"],
+        "restarts": progress["restarts"],
+        "finished_in_one_step": single_step,
+        "bytes": os.path.getsize(dest),
+        "elapsed_seconds": round(elapsed, 4)
+    }
+
+def register_snapshot(source_path: str, result: Dict[str, Any], taken_at: datetime) -> str:
+    """Add a snapshot to the database catalog; returns its catalog name"""
+    source = database_catalog.find_by_path(source_path)
+    source_name = source["name"] if source else Path(source_path).stem
+    base_name = f"{source_name}_snapshot_{taken_at.strftime('%Y%m%d_%H%M%S')}"
+    # Snapshots taken within the same second get a numbered name
+    name, number = base_name, 1
+    while (database_catalog.get(name) or {}).get("path", result["path"]) != result["path"]:
+        number += 1
+        name = f"{base_name}_{number}"
+    entry = {
+        "name": name,
+        "description": f"Snapshot of {source_name} taken {taken_at.strftime('%Y-%m-%d %H:%M:%S')}",
+        "path": result["path"],
+        "type": "SQLite",
+        "snapshot_of": source_name,
+        "tables": database_stats(result["path"])["tables"],
+        "created_at": taken_at.strftime("%Y-%m-%d"),
+    }
+    if source and source.get("profile"):
+        entry["profile"] = source["profile"]
+    database_catalog.register(entry)
+    return name
+
+def take_snapshot(db: SqliteDatabase, dest: Optional[str] = None) -> Dict[str, Any]:
+    """Snapshot a database (by default into a timestamped file next to it) and register it in the catalog"""
+    taken_at = datetime.now()
+    if not dest:
+        source = Path(db.db_path)
+        dest = str(source.parent / SNAPSHOT_DIRECTORY / f"{source.stem}-{taken_at.strftime('%Y%m%d-%H%M%S')}.db")
+    result = snapshot(db, dest)
+    result["catalog_name"] = register_snapshot(db.db_path, result, taken_at)
+    return result
+
+
+class SnapshotScheduler:
+    """Background thread snapshotting one database every interval, keeping the newest few"""
+
+    def __init__(self, db: SqliteDatabase, directory: str, interval_seconds: float, keep: int):
+        self.db = db
+        self.directory = Path(directory)
+        self.interval_seconds = interval_seconds
+        self.keep = keep
+        self.runs = 0
+        self.failures = 0
+        self.last_result: Optional[Dict[str, Any]] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"sqlite-snapshots-{Path(db.db_path).name}",
+                                        daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                stem = Path(self.db.db_path).stem
+                dest = self.directory / f"{stem}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.db"
+                self.last_result = take_snapshot(self.db, str(dest))
+                self.runs += 1
+                self._prune(stem)
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Scheduled snapshot of {self.db.db_path} failed: {e}")
+
+    def _prune(self, stem: str):
+        """Delete all but the newest keep snapshots and drop them from the catalog"""
+        snapshots = sorted(self.directory.glob(f"{stem}-*.db"))
+        for old in snapshots[:-self.keep]:
+            entry = database_catalog.find_by_path(str(old))
+            if entry is not None:
+                database_catalog.unregister(entry["name"])
+            old.unlink()
+            logger.info(f"Removed old snapshot {old}")
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "db_path": self.db.db_path,
+            "directory": str(self.directory),
+            "interval_seconds": self.interval_seconds,
+            "keep": self.keep,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_snapshot": self.last_result["path"] if self.last_result else None
+        }
+
+
+# One scheduler per database path
+_schedulers: Dict[str, SnapshotScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+def start_scheduler(db: SqliteDatabase, directory: str, interval_seconds: float, keep: int) -> SnapshotScheduler:
+    """Start snapshotting a database on a schedule, replacing any existing schedule for it"""
+    stop_scheduler(db.db_path)
+    scheduler = SnapshotScheduler(db, directory, interval_seconds, keep)
+    with _schedulers_lock:
+        _schedulers[db.db_path] = scheduler
+    return scheduler
+
+def stop_scheduler(db_path: str) -> bool:
+    """Stop the snapshot schedule for a database; returns whether one was running"""
+    with _schedulers_lock:
+        scheduler = _schedulers.pop(db_path, None)
+    if scheduler is None:
+        return False
+    scheduler.stop()
+    return True
+
+def snapshot_database(dest: str, tool_context: ToolContext) -> dict:
+    """Take a consistent snapshot of the current database while it stays in use.
+
+    The copy is made a few pages at a time so agents can keep writing, and
+    the snapshot is added to the database catalog.
+
+    Args:
+        dest (str): Path of the snapshot file, or "" for a timestamped file in a "snapshots" folder next to the database
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with the snapshot path, catalog name, pages copied and duration
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        result = take_snapshot(db, dest.strip() or None)
+
+        return {
+            "status": "success",
+            **result
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
+
+def schedule_snapshots(interval_minutes: float, keep: int, tool_context: ToolContext) -> dict:
+    """Snapshot the current database automatically at a fixed interval.
+
+    Snapshots go to a "snapshots" folder next to the database and only the
+    newest ones are kept. Calling this again replaces the schedule.
+
+    Args:
+        interval_minutes (float): Minutes between snapshots; 0 stops scheduled snapshots
+        keep (int): Number of most recent snapshots to keep
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with the schedule
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        if interval_minutes <= 0:
+            stopped = stop_scheduler(db.db_path)
+            return {
+                "status": "success",
+                "message": "Stopped scheduled snapshots" if stopped else "No snapshots were scheduled"
+            }
+        if keep < 1:
+            return {
+                "status": "error",
+                "error_message": "keep must be at least 1"
+            }
+
+        directory = Path(db.db_path).parent / SNAPSHOT_DIRECTORY
+        scheduler = start_scheduler(db, str(directory), interval_minutes * 60, int(keep))
+
+        return {
+            "status": "success",
+            "message": f"Snapshotting every {interval_minutes:g} minutes, keeping the newest {int(keep)}",
+            **scheduler.status()
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
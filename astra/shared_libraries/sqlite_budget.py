@@ -0,0 +1,176 @@
+"""
+Token-budgeted query results for the shared SQLite tools.
+
+A ResultBudgeter is fed rows straight from the cursor. It keeps rows while
+their estimated serialized size fits the token budget, and summarizes every
+column of every row in the same pass: count, nulls, min/max, an estimate of
+the number of distinct values and the most frequent values. Over-budget
+results can then be sent to the model as the first rows plus summaries
+instead of thousands of rows.
+"""
+
+import os
+import json
+import bisect
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Roughly four characters of JSON per token for gpt-4o-mini style tokenizers
+CHARS_PER_TOKEN = 4
+RESULT_TOKEN_BUDGET = int(os.getenv("ASTRA_SQLITE_RESULT_TOKENS", "4000"))
+
+# Distinct values are counted exactly up to this many, then estimated with a
+# k-minimum-values sketch of the same size
+DISTINCT_SKETCH_SIZE = 1024
+# Counters kept for the frequent-values (Misra-Gries) summary
+TOP_VALUE_COUNTERS = 32
+TOP_VALUES_REPORTED = 5
+MAX_VALUE_LENGTH = 100
+
+_HASH_SPACE = float(2 ** 64)
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate how many tokens a value costs once serialized to JSON"""
+    return len(json.dumps(value, default=str)) // CHARS_PER_TOKEN + 1
+
+def _display(value: Any) -> Any:
+    """Shorten long text and describe blobs so summaries stay small"""
+    if isinstance(value, bytes):
+        return f"<blob {len(value)} bytes>"
+    if isinstance(value, str) and len(value) > MAX_VALUE_LENGTH:
+        return value[:MAX_VALUE_LENGTH] + "..."
+    return value
+
+def _hash(value: Any) -> int:
+    return int.from_bytes(hashlib.blake2b(repr(value).encode(), digest_size=8).digest(), "big")
+
+
+class ColumnSummary:
+    """Single-pass summary of one result column"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.nulls = 0
+        self.min: Any = None
+        self.max: Any = None
+        self._exact: Optional[Set[Any]] = set()
+        self._sketch: List[int] = []
+        self._sketch_set: Set[int] = set()
+        self._counters: Dict[Any, int] = {}
+        self._counters_exact = True
+
+    def add(self, value: Any):
+        self.count += 1
+        if value is None:
+            self.nulls += 1
+            return
+
+        # Numbers and text are compared within their own kind, as SQLite
+        # orders all numbers before all text
+        if not isinstance(value, bytes):
+            key = (isinstance(value, str), value)
+            if self.min is None or key < (isinstance(self.min, str), self.min):
+                self.min = value
+            if self.max is None or key > (isinstance(self.max, str), self.max):
+                self.max = value
+
+        self._add_distinct(value)
+
+        # Misra-Gries: counts are exact until the counters overflow, then lower bounds
+        if value in self._counters:
+            self._counters[value] += 1
+        elif len(self._counters) < TOP_VALUE_COUNTERS:
+            self._counters[value] = 1
+        else:
+            self._counters_exact = False
+            for tracked in list(self._counters):
+                self._counters[tracked] -= 1
+                if self._counters[tracked] == 0:
+                    del self._counters[tracked]
+
+    def _add_distinct(self, value: Any):
+        if self._exact is not None:
+            self._exact.add(value)
+            if len(self._exact) <= DISTINCT_SKETCH_SIZE:
+                return
+            for seen in self._exact:
+                self._add_hash(_hash(seen))
+            self._exact = None
+            return
+        self._add_hash(_hash(value))
+
+    def _add_hash(self, hashed: int):
+        """Keep the DISTINCT_SKETCH_SIZE smallest hashes seen"""
+        if hashed in self._sketch_set:
+            return
+        if len(self._sketch) < DISTINCT_SKETCH_SIZE:
+            self._sketch.append(hashed)
+            self._sketch_set.add(hashed)
+            if len(self._sketch) == DISTINCT_SKETCH_SIZE:
+                self._sketch.sort()
+            return
+        if hashed >= self._sketch[-1]:
+            return
+        self._sketch_set.discard(self._sketch.pop())
+        self._sketch_set.add(hashed)
+        bisect.insort(self._sketch, hashed)
+
+    def distinct_estimate(self) -> int:
+        if self._exact is not None:
+            return len(self._exact)
+        return int((DISTINCT_SKETCH_SIZE - 1) / (self._sketch[-1] / _HASH_SPACE))
+
+    def summary(self) -> Dict[str, Any]:
+        # Values seen once are not "top" values, just whatever came last
+        top = sorted(
+            ((value, count) for value, count in self._counters.items() if count > 1),
+            key=lambda item: item[1], reverse=True
+        )[:TOP_VALUES_REPORTED]
+        return {
+            "column": self.name,
+            "count": self.count,
+            "nulls": self.nulls,
+            "min": _display(self.min),
+            "max": _display(self.max),
+            "distinct": self.distinct_estimate(),
+            "distinct_is_estimate": self._exact is None,
+            "top_values": [{"value": _display(value), "count": count} for value, count in top],
+            "top_counts_are_exact": self._counters_exact,
+        }
+
+
+class ResultBudgeter:
+    """Keep rows up to a token budget while summarizing every row in one pass."""
+
+    def __init__(self, max_tokens: int = RESULT_TOKEN_BUDGET):
+        self.max_tokens = max_tokens
+        self.rows: List[Dict[str, Any]] = []
+        self.total_rows = 0
+        self.kept_tokens = 0
+        self.truncated = False
+        self.columns: Dict[str, ColumnSummary] = {}
+
+    def add(self, row: Dict[str, Any]):
+        self.total_rows += 1
+        for name, value in row.items():
+            summary = self.columns.get(name)
+            if summary is None:
+                summary = self.columns[name] = ColumnSummary(name)
+            summary.add(value)
+        if self.truncated:
+            return
+        cost = estimate_tokens(row)
+        if self.kept_tokens + cost > self.max_tokens:
+            self.truncated = True
+            return
+        self.rows.append(row)
+        self.kept_tokens += cost
+
+    def consume(self, rows: Iterable[Dict[str, Any]]) -> "ResultBudgeter":
+        for row in rows:
+            self.add(row)
+        return self
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        return [summary.summary() for summary in self.columns.values()]
@@ -0,0 +1,201 @@
+"""
+In-process caches for the shared SQLite tools.
+
+Entries are validated against SQLite's own change counters, so a cache hit
+costs a single PRAGMA instead of re-running the underlying query.
+"""
+
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger('astra_sqlite_cache')
+
+
+class SchemaCache:
+    """Per-database cache of schema metadata, validated by PRAGMA schema_version.
+
+    SQLite bumps schema_version on every schema change made by any connection,
+    so cached table lists and column info stay valid until the version moves.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, db_path: str, schema_version: int, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or stale"""
+        with self._lock:
+            entry = self._entries.get(db_path)
+            if entry is None:
+                return None
+            if entry["version"] != schema_version:
+                logger.debug(f"Schema of {db_path} changed to version {schema_version}, dropping cache")
+                del self._entries[db_path]
+                return None
+            return entry["values"].get(key)
+
+    def store(self, db_path: str, schema_version: int, key: Hashable, value: Any):
+        """Cache a value computed at the given schema version"""
+        with self._lock:
+            entry = self._entries.get(db_path)
+            if entry is None or entry["version"] != schema_version:
+                entry = {"version": schema_version, "values": {}}
+                self._entries[db_path] = entry
+            entry["values"][key] = value
+
+    def invalidate(self, db_path: str):
+        """Forget everything cached for a database"""
+        with self._lock:
+            self._entries.pop(db_path, None)
+
+
+class ResultCache:
+    """LRU cache of read query results, bounded by entry count and total bytes.
+
+    Each entry records the tables its query reads. Writes made through the
+    database's writer thread drop only the entries that read a table they
+    changed (see SqliteWriter), and every entry whose tables could not be
+    worked out. Changes made by anything else are caught by
+    reporting PRAGMA data_version from the writer's connection before every
+    lookup: it only moves when another connection commits, and a changed
+    value drops every entry for the database. While the writer is busy the
+    value cannot be read and lookups bypass the cache. A per-database generation
+    counter stops a result computed before an invalidation from being stored
+    after it.
+    """
+
+    def __init__(self, enabled: bool = True, max_entries: int = 256,
+                 max_bytes: int = 8 * 1024 * 1024):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[List[Dict[str, Any]], int, Optional[FrozenSet[str]]]]" = OrderedDict()
+        self._bytes = 0
+        self._generations: Dict[str, int] = {}
+        self._external_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(db_path: str, query: str, params: Any = None) -> Tuple:
+        """Build a cache key from the database, whitespace-normalized SQL and parameters"""
+        normalized = " ".join(query.split()).rstrip(";").rstrip()
+        if isinstance(params, dict):
+            params_key = tuple(sorted(params.items()))
+        else:
+            params_key = tuple(params or ())
+        return (db_path, normalized, params_key)
+
+    def check_external(self, db_path: str, data_version: Optional[int]) -> Optional[int]:
+        """Drop the database's entries if it was changed from outside; return its generation.
+
+        data_version must come from the writer's connection, where it only
+        moves when some other connection commits. None (the writer was busy)
+        returns None: the cache must not be used for this read.
+        """
+        if data_version is None:
+            return None
+        with self._lock:
+            if self._external_versions.get(db_path) != data_version:
+                self._invalidate_locked(db_path)
+                self._external_versions[db_path] = data_version
+            return self._generations.get(db_path, 0)
+
+    def get(self, key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of the cached rows for key, counting the hit or miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return [dict(row) for row in entry[0]]
+
+    def put(self, key: Tuple, rows: List[Dict[str, Any]], generation: int, tables: Optional[Iterable[str]]):
+        """Cache rows read from tables unless the database changed since generation or they are too large.
+
+        tables None means the query's tables are unknown; any write drops the entry.
+        """
+        if tables is not None:
+            tables = frozenset(table.lower() for table in tables)
+            # Attached databases are not watched for changes, so their results are not cached
+            if any("." in table for table in tables):
+                return
+        size = len(json.dumps(rows, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if self._generations.get(key[0], 0) != generation:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = ([dict(row) for row in rows], size, tables)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def _invalidate_locked(self, db_path: str):
+        self._generations[db_path] = self._generations.get(db_path, 0) + 1
+        stale = [key for key in self._entries if key[0] == db_path]
+        for key in stale:
+            self._bytes -= self._entries.pop(key)[1]
+        if stale:
+            self.invalidations += 1
+            logger.debug(f"Dropped {len(stale)} cached results for {db_path}")
+
+    def invalidate(self, db_path: str):
+        """Forget every cached result for a database"""
+        with self._lock:
+            self._invalidate_locked(db_path)
+
+    def invalidate_tables(self, db_path: str, tables: Iterable[str]):
+        """Forget the cached results for a database that read any of the given tables"""
+        changed = {table.lower() for table in tables}
+        with self._lock:
+            self._generations[db_path] = self._generations.get(db_path, 0) + 1
+            stale = [key for key, entry in self._entries.items()
+                     if key[0] == db_path and (entry[2] is None or entry[2] & changed)]
+            for key in stale:
+                self._bytes -= self._entries.pop(key)[1]
+            if stale:
+                self.invalidations += 1
+                logger.debug(f"Dropped {len(stale)} cached results reading {', '.join(sorted(changed))}")
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+
+# Shared by the sync and async tools so either one sees the other's entries
+schema_cache = SchemaCache()
+
+# The result cache is opt-in: set ASTRA_SQLITE_RESULT_CACHE=1 to enable it
+result_cache = ResultCache(
+    enabled=os.getenv("ASTRA_SQLITE_RESULT_CACHE", "").lower() in ("1", "true", "yes"),
+    max_entries=int(os.getenv("ASTRA_SQLITE_RESULT_CACHE_ENTRIES", "256")),
+    max_bytes=int(os.getenv("ASTRA_SQLITE_RESULT_CACHE_BYTES", str(8 * 1024 * 1024))),
+)
@@ -0,0 +1,247 @@
+"""
+Shared access to the database catalog in db_manager_agent/databases.json.
+
+The catalog is parsed once and indexed by name and by database path; it is
+only re-read when the file's modification time or size changes. Catalog
+paths written on another machine (e.g. Windows paths) are resolved to the
+file of the same name in the local data directory. Live statistics for a
+database (file size, tables, row estimates) are gathered only when asked
+for, and cached until the database file changes.
+"""
+
+import os
+import copy
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from contextlib import closing
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger('astra_sqlite_catalog')
+
+CATALOG_PATH = Path(__file__).parent.parent / "db_manager_agent" / "databases.json"
+DATA_DIR = Path(os.getenv("ASTRA_SQLITE_DATA_DIR", str(CATALOG_PATH.parent / "data")))
+
+# Table holding the change feed of sqlite_changes
+CHANGE_LOG_TABLE = "change_log"
+# Tables the shared tools keep for themselves, which are not data to query
+INTERNAL_TABLES = frozenset({CHANGE_LOG_TABLE})
+# Suffixes of the shadow tables FTS3/4, FTS5 and R*Tree virtual tables create
+_SHADOW_SUFFIXES = ("content", "data", "idx", "docsize", "config", "segments", "segdir", "stat",
+                    "node", "parent", "rowid")
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _path_key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+def resolve_database_path(path: str, data_dir: Path = DATA_DIR) -> str:
+    """Map a catalog path to a database file on this machine.
+
+    Paths that exist are used as they are. Anything else, such as an absolute
+    Windows path from another machine, resolves to the file of the same name
+    in the data directory if there is one.
+    """
+    expanded = os.path.expanduser(path)
+    if os.path.exists(expanded):
+        return os.path.abspath(expanded)
+    local = data_dir / path.replace("\\", "/").rsplit("/", 1)[-1]
+    if local.exists():
+        return str(local)
+    return path
+
+def _row_estimates(conn: sqlite3.Connection, tables: List[str]) -> Dict[str, int]:
+    """Row counts from ANALYZE's sqlite_stat1 where available, else from each table's largest rowid"""
+    estimates: Dict[str, int] = {}
+    try:
+        for table, stat in conn.execute("SELECT tbl, stat FROM sqlite_stat1"):
+            if table in tables and stat:
+                estimates.setdefault(table, int(stat.split()[0]))
+    except sqlite3.OperationalError:
+        pass  # Never analyzed
+    for table in tables:
+        if table in estimates:
+            continue
+        quoted = '"' + table.replace('"', '""') + '"'
+        try:
+            # The largest rowid is read from the end of the table's b-tree without a scan
+            estimates[table] = conn.execute(f"SELECT max(rowid) FROM {quoted}").fetchone()[0] or 0
+        except sqlite3.OperationalError:
+            # WITHOUT ROWID tables
+            estimates[table] = conn.execute(f"SELECT count(*) FROM {quoted}").fetchone()[0]
+    return estimates
+
+def visible_tables(tables: Iterable[Tuple[str, bool]]) -> List[str]:
+    """Names of the tables worth showing an agent, from (name, is virtual table) pairs.
+
+    Leaves out SQLite's own tables, the shadow tables FTS and R*Tree virtual
+    tables keep their data in, and the tools' own bookkeeping tables.
+    """
+    tables = list(tables)
+    virtual = [name for name, is_virtual in tables if is_virtual]
+    shadow = {f"{name}_{suffix}" for name in virtual for suffix in _SHADOW_SUFFIXES}
+    return sorted(
+        name for name, is_virtual in tables
+        if not name.startswith("sqlite_") and name not in INTERNAL_TABLES and (is_virtual or name not in shadow)
+    )
+
+def table_kinds_query() -> str:
+    """Query listing (name, is virtual table) for every table of the main database"""
+    return "SELECT name, sql LIKE 'CREATE VIRTUAL TABLE%' FROM sqlite_master WHERE type='table'"
+
+def _user_tables(conn: sqlite3.Connection) -> List[str]:
+    """Names of the tables in a database, leaving out internal and shadow tables"""
+    return visible_tables((name, bool(is_virtual)) for name, is_virtual in conn.execute(table_kinds_query()))
+
+def database_stats(path: str) -> Dict[str, Any]:
+    """File size, tables and estimated row counts of a database file, read without modifying it"""
+    uri = Path(path).resolve().as_uri() + "?mode=ro"
+    with closing(sqlite3.connect(uri, uri=True)) as conn:
+        tables = _user_tables(conn)
+        estimates = _row_estimates(conn, tables)
+    return {
+        "exists": True,
+        "file_size_bytes": os.path.getsize(path),
+        "tables": tables,
+        "row_estimates": estimates,
+    }
+
+
+class DatabaseCatalog:
+    """databases.json parsed once, indexed, and reloaded when the file changes.
+
+    Entries are returned as copies whose "path" is the resolved local path;
+    the path as written in the catalog is kept in "catalog_path" when it
+    differs.
+    """
+
+    def __init__(self, path: Path = CATALOG_PATH, data_dir: Path = DATA_DIR):
+        self.path = Path(path)
+        self.data_dir = Path(data_dir)
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._document: Dict[str, Any] = {}
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._by_path: Dict[str, Dict[str, Any]] = {}
+        self._stats: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def _refresh_locked(self):
+        """Re-read the catalog if the file changed since it was last parsed"""
+        stamp = _file_stamp(str(self.path))
+        if stamp == self._stamp:
+            return
+        document: Dict[str, Any] = {}
+        if stamp is not None:
+            try:
+                with open(self.path, 'r') as f:
+                    document = json.load(f)
+            except (OSError, ValueError) as e:
+                # Keep serving the last good catalog until the file is fixed
+                logger.warning(f"Could not read database catalog {self.path}: {e}")
+                self._stamp = stamp
+                return
+        by_name, by_path = {}, {}
+        for entry in document.get("database_catalog", {}).get("databases", []):
+            resolved = dict(entry)
+            if entry.get("path"):
+                resolved["path"] = resolve_database_path(entry["path"], self.data_dir)
+                if resolved["path"] != entry["path"]:
+                    resolved["catalog_path"] = entry["path"]
+                by_path[_path_key(resolved["path"])] = resolved
+            if entry.get("name"):
+                by_name[entry["name"]] = resolved
+        self._stamp = stamp
+        self._document = document
+        self._by_name = by_name
+        self._by_path = by_path
+        self.loads += 1
+        logger.debug(f"Loaded {len(by_name)} databases from {self.path}")
+
+    def document(self) -> Dict[str, Any]:
+        """The "database_catalog" section with resolved paths, for prompts and listings"""
+        with self._lock:
+            self._refresh_locked()
+            section = {key: copy.deepcopy(value) for key, value in self._document.get("database_catalog", {}).items()
+                       if key != "databases"}
+            section["databases"] = [copy.deepcopy(entry) for entry in self._by_name.values()]
+            return section
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """The entry with the given name (matched without regard to case if there is no exact match)"""
+        with self._lock:
+            self._refresh_locked()
+            entry = self._by_name.get(name)
+            if entry is None:
+                matches = [value for key, value in self._by_name.items() if key.lower() == name.lower()]
+                entry = matches[0] if len(matches) == 1 else None
+            return copy.deepcopy(entry) if entry is not None else None
+
+    def find_by_path(self, db_path: str) -> Optional[Dict[str, Any]]:
+        """The entry whose resolved path is the given database file, if any"""
+        with self._lock:
+            self._refresh_locked()
+            entry = self._by_path.get(_path_key(db_path))
+            return copy.deepcopy(entry) if entry is not None else None
+
+    def stats(self, name: str) -> Dict[str, Any]:
+        """Live statistics for a catalog database, cached until its file changes"""
+        entry = self.get(name)
+        if entry is None:
+            raise KeyError(f"Database '{name}' is not in the catalog")
+        path = entry.get("path", "")
+        # Writes in WAL mode reach the -wal file before the database file
+        stamp = (_file_stamp(path), _file_stamp(path + "-wal"))
+        if stamp[0] is None:
+            return {"exists": False}
+        with self._lock:
+            cached = self._stats.get(path)
+            if cached is not None and cached[0] == stamp:
+                return copy.deepcopy(cached[1])
+        stats = database_stats(path)
+        with self._lock:
+            self._stats[path] = (stamp, stats)
+        return copy.deepcopy(stats)
+
+    def _rewrite_locked(self, update):
+        """Apply update to the catalog's list of entries and write the file atomically"""
+        try:
+            with open(self.path, 'r') as f:
+                document = json.load(f)
+        except FileNotFoundError:
+            document = {"database_catalog": {"version": "1.0", "databases": []}}
+        section = document.setdefault("database_catalog", {})
+        section["databases"] = update(section.get("databases", []))
+        section["last_updated"] = datetime.now().strftime("%Y-%m-%d")
+        partial = self.path.with_name(self.path.name + ".tmp")
+        with open(partial, 'w') as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+        os.replace(partial, self.path)
+        self._stamp = None
+        self._refresh_locked()
+
+    def register(self, entry: Dict[str, Any]):
+        """Add an entry to databases.json, replacing any entry with the same name"""
+        with self._lock:
+            self._rewrite_locked(lambda entries: [existing for existing in entries
+                                                  if existing.get("name") != entry["name"]] + [entry])
+        logger.info(f"Registered database '{entry['name']}' in the catalog")
+
+    def unregister(self, name: str):
+        """Remove the entry with the given name from databases.json"""
+        with self._lock:
+            self._rewrite_locked(lambda entries: [existing for existing in entries if existing.get("name") != name])
+
+
+# Shared catalog used by the agents and connection profiles
+database_catalog = DatabaseCatalog()
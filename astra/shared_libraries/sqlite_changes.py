@@ -0,0 +1,263 @@
+"""
+Opt-in change capture for databases used by the shared SQLite tools.
+
+enable_change_feed adds triggers to the chosen tables that record every
+insert, update and delete in a compact change_log table as (seq, table,
+rowid, operation). seq comes from an AUTOINCREMENT key, so it only ever
+grows, even after old entries are removed. changes_since(seq) returns just
+the changes after a sequence number, so an agent, session state or cache
+that remembers the last seq it saw can catch up without re-reading whole
+tables.
+
+Retention is bounded: a trigger on change_log deletes all but the newest
+ASTRA_SQLITE_CHANGE_LOG_ROWS entries, in batches. A reader whose seq is
+older than the oldest entry kept is told it missed changes and must re-read
+the tables.
+"""
+
+import os
+import sqlite3
+import logging
+from typing import Any, Dict, List
+from google.adk.tools.tool_context import ToolContext
+
+from astra.shared_libraries.sqlite_tools import SqliteDatabase, get_db_instance, quote_identifier
+from astra.shared_libraries.sqlite_cache import schema_cache, result_cache
+from astra.shared_libraries.sqlite_catalog import CHANGE_LOG_TABLE
+
+logger = logging.getLogger('astra_sqlite_changes')
+
+CHANGE_LOG_MAX_ROWS = int(os.getenv("ASTRA_SQLITE_CHANGE_LOG_ROWS", "10000"))
+# Old entries are removed every this many changes, so the log holds at most
+# CHANGE_LOG_MAX_ROWS + CHANGE_LOG_PRUNE_EVERY entries
+CHANGE_LOG_PRUNE_EVERY = 1000
+MAX_CHANGES = 1000
+# Session state key holding the next seq to read when changes_since is given -1
+CHANGE_SEQ_STATE_KEY = "sqlite_change_seq"
+
+_TRIGGERS = {"INSERT": "ai", "UPDATE": "au", "DELETE": "ad"}
+
+def _trigger_name(table: str, operation: str) -> str:
+    return quote_identifier(f"{CHANGE_LOG_TABLE}_{_TRIGGERS[operation]}_{table}")
+
+def _log_ddl(max_rows: int) -> List[str]:
+    """Statements creating the change log and its retention trigger"""
+    log = CHANGE_LOG_TABLE
+    return [
+        f"CREATE TABLE IF NOT EXISTS {log} (seq INTEGER PRIMARY KEY AUTOINCREMENT, table_name TEXT NOT NULL, "
+        f"row_id INTEGER NOT NULL, operation TEXT NOT NULL)",
+        # Recreated so a changed ASTRA_SQLITE_CHANGE_LOG_ROWS takes effect
+        f"DROP TRIGGER IF EXISTS {log}_retention",
+        f"CREATE TRIGGER {log}_retention AFTER INSERT ON {log} WHEN new.seq % {CHANGE_LOG_PRUNE_EVERY} = 0 "
+        f"BEGIN DELETE FROM {log} WHERE seq <= new.seq - {max_rows}; END",
+    ]
+
+def _table_ddl(table: str) -> List[str]:
+    """Statements creating the triggers that log a table's changes"""
+    log = CHANGE_LOG_TABLE
+    quoted = quote_identifier(table)
+    name = "'" + table.replace("'", "''") + "'"
+    columns = f"{log} (table_name, row_id, operation)"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {_trigger_name(table, 'INSERT')} AFTER INSERT ON {quoted} BEGIN "
+        f"INSERT INTO {columns} VALUES ({name}, new.rowid, 'INSERT'); END",
+        # An update that changes the rowid moves the row: log it as gone from its old rowid
+        f"CREATE TRIGGER IF NOT EXISTS {_trigger_name(table, 'UPDATE')} AFTER UPDATE ON {quoted} BEGIN "
+        f"INSERT INTO {columns} SELECT {name}, old.rowid, 'DELETE' WHERE old.rowid IS NOT new.rowid; "
+        f"INSERT INTO {columns} VALUES ({name}, new.rowid, 'UPDATE'); END",
+        f"CREATE TRIGGER IF NOT EXISTS {_trigger_name(table, 'DELETE')} AFTER DELETE ON {quoted} BEGIN "
+        f"INSERT INTO {columns} VALUES ({name}, old.rowid, 'DELETE'); END",
+    ]
+
+def trackable_tables(conn: sqlite3.Connection) -> List[str]:
+    """Ordinary rowid tables whose changes can be logged.
+
+    Leaves out SQLite's own tables, the change log, virtual tables and their
+    shadow tables, and WITHOUT ROWID tables.
+    """
+    try:
+        rows = conn.execute("PRAGMA main.table_list").fetchall()
+        names = [row[1] for row in rows if row[2] == "table" and not row[4]]
+    except sqlite3.OperationalError:
+        # SQLite before 3.37 has no table_list
+        names = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND sql NOT LIKE 'CREATE VIRTUAL%'")]
+    return sorted(name for name in names if not name.startswith("sqlite_") and name != CHANGE_LOG_TABLE)
+
+def tracked_tables(conn: sqlite3.Connection) -> List[str]:
+    """Tables whose changes are currently logged"""
+    rows = conn.execute(
+        "SELECT DISTINCT tbl_name FROM sqlite_master WHERE type='trigger' AND name LIKE ? ESCAPE '\\'",
+        (CHANGE_LOG_TABLE.replace("_", "\\_") + "\\_ai\\_%",)
+    )
+    return sorted(name for name, in rows)
+
+def enable_tracking(db: SqliteDatabase, tables: List[str], max_rows: int = CHANGE_LOG_MAX_ROWS) -> List[str]:
+    """Start logging changes to tables (every trackable table if empty); returns all tracked tables"""
+    def enable(conn: sqlite3.Connection) -> List[str]:
+        available = trackable_tables(conn)
+        wanted = list(tables) or available
+        unknown = [table for table in wanted if table not in available]
+        if unknown:
+            raise ValueError(f"Cannot track {', '.join(unknown)}: not an ordinary table of this database")
+        for statement in _log_ddl(max_rows):
+            conn.execute(statement)
+        for table in wanted:
+            for statement in _table_ddl(table):
+                conn.execute(statement)
+        return tracked_tables(conn)
+
+    tracked = db.writer.execute(enable)
+    schema_cache.invalidate(db.db_path)
+    logger.info(f"Logging changes to {', '.join(tracked)} in {db.db_path}")
+    return tracked
+
+def disable_tracking(db: SqliteDatabase, tables: List[str]) -> List[str]:
+    """Stop logging changes to tables (every tracked table if empty); returns the tables still tracked.
+
+    The change log itself is kept, so sequence numbers never go back.
+    """
+    def disable(conn: sqlite3.Connection) -> List[str]:
+        for table in list(tables) or tracked_tables(conn):
+            for operation in _TRIGGERS:
+                conn.execute(f"DROP TRIGGER IF EXISTS {_trigger_name(table, operation)}")
+        return tracked_tables(conn)
+
+    tracked = db.writer.execute(disable)
+    schema_cache.invalidate(db.db_path)
+    return tracked
+
+def read_changes(db: SqliteDatabase, since: int, limit: int) -> Dict[str, Any]:
+    """Changes with seq greater than since, oldest first, and whether any were lost to retention"""
+    if CHANGE_LOG_TABLE not in db.get_table_names():
+        raise ValueError("Change capture is not enabled for this database; use enable_change_feed first")
+    # One statement, so the bounds and the page come from the same snapshot
+    rows = db.execute_query(f"""
+        WITH bounds AS (
+            SELECT (SELECT min(seq) FROM {CHANGE_LOG_TABLE}) AS oldest,
+                   (SELECT seq FROM sqlite_sequence WHERE name = '{CHANGE_LOG_TABLE}') AS latest
+        ), page AS (
+            SELECT seq, table_name, row_id, operation FROM {CHANGE_LOG_TABLE}
+            WHERE seq > :since ORDER BY seq LIMIT :limit
+        )
+        SELECT bounds.oldest, bounds.latest, page.seq, page.table_name, page.row_id, page.operation
+        FROM bounds LEFT JOIN page ORDER BY page.seq
+    """, {"since": since, "limit": limit}, use_cache=result_cache.enabled)
+    oldest, latest = rows[0]["oldest"], rows[0]["latest"] or 0
+    changes = [
+        {"seq": row["seq"], "table": row["table_name"], "rowid": row["row_id"], "operation": row["operation"]}
+        for row in rows if row["seq"] is not None
+    ]
+    next_seq = changes[-1]["seq"] if changes else latest
+    return {
+        "changes": changes,
+        "next_seq": next_seq,
+        "latest_seq": latest,
+        "has_more": next_seq < latest,
+        # Entries after since were removed before they were read
+        "missed_changes": since < latest and (oldest is None or oldest > since + 1),
+    }
+
+def enable_change_feed(tables: list, tool_context: ToolContext) -> dict:
+    """Start recording inserts, updates and deletes on tables of the current database.
+
+    Once enabled, changes_since returns what changed after a given sequence
+    number, so nobody needs to re-read whole tables to find out.
+
+    Args:
+        tables (list): Names of the tables to track, or an empty list for every table
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with the tracked tables and the latest sequence number
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        tracked = enable_tracking(db, [str(table) for table in tables or []])
+        latest = read_changes(db, 0, 1)["latest_seq"]
+
+        return {
+            "status": "success",
+            "message": f"Recording changes to {', '.join(tracked)}; read them with changes_since({latest}, ...)",
+            "tracked_tables": tracked,
+            "latest_seq": latest
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
+
+def disable_change_feed(tables: list, tool_context: ToolContext) -> dict:
+    """Stop recording changes to tables of the current database.
+
+    Args:
+        tables (list): Names of the tables to stop tracking, or an empty list for every table
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with the tables still tracked
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        tracked = disable_tracking(db, [str(table) for table in tables or []])
+
+        return {
+            "status": "success",
+            "tracked_tables": tracked
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
+
+def changes_since(seq: int, limit: int, tool_context: ToolContext) -> dict:
+    """List the rows inserted, updated or deleted in the current database after a sequence number.
+
+    Each change names the table, the rowid of the row and the operation;
+    read the current values of changed rows with read_query if needed. Pass
+    the returned next_seq to the next call to continue from there.
+
+    Args:
+        seq (int): Sequence number of the last change already seen; 0 for all retained changes, -1 to continue from this session's previous call
+        limit (int): Maximum number of changes to return (at most 1000)
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with the changes oldest first, next_seq, has_more and missed_changes (true if changes were dropped by retention and the tables must be re-read)
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        seq = int(seq)
+        if seq < 0:
+            seq = int((tool_context.state.get(CHANGE_SEQ_STATE_KEY) or {}).get(db.db_path, 0))
+        limit = max(1, min(int(limit), MAX_CHANGES))
+
+        result = read_changes(db, seq, limit)
+
+        # Remember where this session got to, per database
+        positions = dict(tool_context.state.get(CHANGE_SEQ_STATE_KEY) or {})
+        positions[db.db_path] = result["next_seq"]
+        tool_context.state[CHANGE_SEQ_STATE_KEY] = positions
+
+        return {
+            "status": "success",
+            "since": seq,
+            "count": len(result["changes"]),
+            **result
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
@@ -0,0 +1,89 @@
+"""
+Compact result encodings for the shared SQLite tools.
+
+The default row format repeats every column name in every row, which is
+wasted tokens once results reach the model. The columnar format sends the
+column names once and each row as a plain list, and dictionary-encodes
+low-cardinality text columns: their distinct values are listed once and rows
+carry an index into that list.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+RESULT_FORMATS = ("auto", "rows", "columnar")
+
+# "auto" switches to columnar above this many rows
+COMPACT_ROW_THRESHOLD = int(os.getenv("ASTRA_SQLITE_COMPACT_ROWS", "50"))
+
+# A text column is dictionary-encoded when it has at most this many distinct
+# values and at most one distinct value for every DICTIONARY_MIN_REPEATS rows
+DICTIONARY_MAX_VALUES = 256
+DICTIONARY_MIN_REPEATS = 2
+
+def choose_format(result_format: str, row_count: int) -> str:
+    """Resolve a requested result format, picking rows or columnar for "auto" by row count"""
+    requested = (result_format or "auto").strip().lower()
+    if requested not in RESULT_FORMATS:
+        raise ValueError(f"Unknown result format '{result_format}', expected one of {', '.join(RESULT_FORMATS)}")
+    if requested == "auto":
+        return "columnar" if row_count > COMPACT_ROW_THRESHOLD else "rows"
+    return requested
+
+def _dictionary(values: List[Any]) -> Optional[List[str]]:
+    """Return the distinct values of a text column worth dictionary-encoding, or None"""
+    present = [value for value in values if value is not None]
+    if not present or not all(isinstance(value, str) for value in present):
+        return None
+    distinct = list(dict.fromkeys(present))
+    if len(distinct) > DICTIONARY_MAX_VALUES or len(distinct) * DICTIONARY_MIN_REPEATS > len(present):
+        return None
+    # Only worth it if the indexes are shorter than the strings they replace
+    if sum(len(value) for value in present) <= sum(len(value) for value in distinct) + 2 * len(present):
+        return None
+    return distinct
+
+def encode_columnar(rows: List[Dict[str, Any]], columns: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Encode a list of row dictionaries as column names plus row lists"""
+    if columns is None:
+        columns = list(rows[0].keys()) if rows else []
+    encoded_rows = [[row[column] for column in columns] for row in rows]
+
+    dictionaries = {}
+    for position, column in enumerate(columns):
+        distinct = _dictionary([row[position] for row in encoded_rows])
+        if distinct is None:
+            continue
+        lookup = {value: index for index, value in enumerate(distinct)}
+        for row in encoded_rows:
+            if row[position] is not None:
+                row[position] = lookup[row[position]]
+        dictionaries[column] = distinct
+
+    return {"columns": columns, "rows": encoded_rows, "dictionaries": dictionaries}
+
+def decode_columnar(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Turn a columnar payload back into a list of row dictionaries"""
+    columns = payload["columns"]
+    dictionaries = payload.get("dictionaries", {})
+    decoded = []
+    for row in payload["rows"]:
+        item = dict(zip(columns, row))
+        for column, distinct in dictionaries.items():
+            if item.get(column) is not None:
+                item[column] = distinct[item[column]]
+        decoded.append(item)
+    return decoded
+
+def format_results(rows: List[Dict[str, Any]], result_format: str) -> Dict[str, Any]:
+    """Build the result fields of a tool response in the requested format"""
+    if choose_format(result_format, len(rows)) == "rows":
+        return {"data": rows}
+    encoded = encode_columnar(rows)
+    return {
+        "format": "columnar",
+        "columns": encoded["columns"],
+        "rows": encoded["rows"],
+        "dictionaries": encoded["dictionaries"],
+        "row_count": len(rows)
+    }
@@ -0,0 +1,165 @@
+"""
+Streaming query export for the shared SQLite tools.
+
+export_query writes a query's rows straight from the cursor to a CSV or JSONL
+file (optionally gzip-compressed) in batches, so exports of any size use
+constant memory and the rows never pass through the model. The file is
+written under a temporary name and renamed when complete; an export stopped
+by the database's query limits leaves no file behind.
+
+The limits apply to the time and VM steps spent in SQLite, running the query
+and fetching its rows, added up over the whole export. Writing and
+compressing the file does not count against them, so a large export is not
+cut short by slow disk or gzip.
+"""
+
+import os
+import csv
+import sqlite3
+import gzip
+import json
+import time
+import logging
+from contextlib import closing
+from typing import Any, Callable, Dict, List, Optional
+from google.adk.tools.tool_context import ToolContext
+
+from astra.shared_libraries.sqlite_tools import (
+    SqliteDatabase, get_db_instance, session_attachments, _elapsed_ms, _error_response
+)
+from astra.shared_libraries.sqlite_limits import QueryLimits, QueryTimeout
+from astra.shared_libraries.sqlite_stats import query_stats_log
+from astra.shared_libraries.sqlite_analyzer import analyze_sql
+
+logger = logging.getLogger('astra_sqlite_export')
+
+EXPORT_FORMATS = ("csv", "jsonl")
+EXPORT_FETCH_SIZE = 1000
+
+def _plain(value: Any) -> Any:
+    """Blobs are written as hex strings; everything else as is"""
+    return value.hex() if isinstance(value, bytes) else value
+
+class _DatabaseTime:
+    """Runs cursor calls under query limits that count only the time and steps spent inside them"""
+
+    def __init__(self, conn: sqlite3.Connection, limits: QueryLimits):
+        self.limits = limits
+        self.counter = getattr(conn, "step_counter", None)
+        self.elapsed = 0.0
+        self.steps = 0
+
+    def __call__(self, call: Callable[[], Any]) -> Any:
+        if self.counter is None:
+            return call()
+        # What is left of the limits; QueryLimits treats 0 as unlimited, so never go below a minimum
+        timeout = max(self.limits.timeout - self.elapsed, 0.001) if self.limits.timeout else None
+        max_steps = max(self.limits.max_steps - self.steps, 1) if self.limits.max_steps else None
+        started, steps_before = time.monotonic(), self.counter.steps
+        try:
+            with self.counter.limited(QueryLimits(timeout, max_steps)):
+                return call()
+        except QueryTimeout as e:
+            # Report the export's totals against its full limits
+            raise QueryTimeout(e.reason, self.limits, (self.elapsed + time.monotonic() - started) * 1000,
+                               self.steps + self.counter.steps - steps_before) from e
+        finally:
+            self.elapsed += time.monotonic() - started
+            self.steps += self.counter.steps - steps_before
+
+def export_rows(db: SqliteDatabase, query: str, path: str, file_format: str, compress: bool,
+                attached: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Stream the rows of a read query into a CSV or JSONL file"""
+    file_format = file_format.strip().lower()
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported format '{file_format}', expected one of {', '.join(EXPORT_FORMATS)}")
+    path = os.path.abspath(os.path.expanduser(path))
+    if compress and not path.endswith(".gz"):
+        path += ".gz"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = path + ".part"
+
+    started = time.perf_counter()
+    try:
+        with db.pool.connection(attached) as conn, closing(conn.cursor()) as cursor:
+            # Only the query and the fetches run under the limits, not the file writes
+            timed = _DatabaseTime(conn, db.query_limits)
+            rows = 0
+            timed(lambda: cursor.execute(query))
+            columns: List[str] = [description[0] for description in cursor.description or ()]
+            opener = gzip.open if compress else open
+            with opener(partial, "wt", encoding="utf-8", newline="") as handle:
+                writer = csv.writer(handle) if file_format == "csv" else None
+                if writer:
+                    writer.writerow(columns)
+                for batch in iter(lambda: timed(lambda: cursor.fetchmany(EXPORT_FETCH_SIZE)), []):
+                    if writer:
+                        writer.writerows([_plain(value) for value in row] for row in batch)
+                    else:
+                        handle.writelines(
+                            json.dumps({name: _plain(value) for name, value in zip(columns, row)}, default=str) + "\n"
+                            for row in batch
+                        )
+                    rows += len(batch)
+            vm_steps = timed.steps
+        os.replace(partial, path)
+    except Exception as e:
+        if os.path.exists(partial):
+            os.remove(partial)
+        query_stats_log.record(db.db_path, query, _elapsed_ms(started), error=str(e))
+        raise
+
+    query_stats_log.record(db.db_path, query, _elapsed_ms(started), rows_returned=rows, vm_steps=vm_steps)
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(path)
+    logger.info(f"Exported {rows} rows ({size} bytes) to {path} in {elapsed:.2f}s")
+    return {
+        "path": path,
+        "format": file_format,
+        "compressed": compress,
+        "columns": columns,
+        "rows": rows,
+        "bytes": size,
+        "elapsed_seconds": round(elapsed, 4),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None
+    }
+
+def export_query(query: str, path: str, file_format: str, compress: bool, tool_context: ToolContext) -> dict:
+    """Export the results of a SELECT query to a CSV or JSONL file on local disk.
+
+    Rows are written straight to the file and are not returned, so this works
+    for results of any size.
+
+    Args:
+        query (str): SELECT SQL query whose rows to export
+        path (str): Path of the file to write; an existing file is replaced
+        file_format (str): "csv" or "jsonl"
+        compress (bool): Gzip the file (".gz" is added to the path if missing)
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with the file path, row count and file size in bytes
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        # Validate that this is a single read-only query
+        analysis = analyze_sql(query)
+        if len(analysis.statements) != 1 or not analysis.read_only:
+            return {
+                "status": "error",
+                "error_message": "Only SELECT queries can be exported"
+            }
+
+        # Stream the rows to the file
+        result = export_rows(db, query, path, file_format, compress, session_attachments(tool_context))
+
+        # Return where the data went, not the data
+        return {
+            "status": "success",
+            **result
+        }
+    except Exception as e:
+        return _error_response(e)
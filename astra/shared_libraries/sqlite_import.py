@@ -0,0 +1,310 @@
+"""
+Streaming CSV and JSONL import for the shared SQLite tools.
+
+import_file reads a file one record at a time, coerces each value to the
+target column's type affinity and hands fixed-size chunks to the database's
+writer thread, each chunk in its own transaction. Memory use stays constant
+no matter how large the file is.
+
+Coercion follows SQLite's own rules: numeric columns convert text that reads
+as a number and keep anything else, such as the dates stored in DATE and
+DATETIME columns, as text.
+"""
+
+import os
+import re
+import csv
+import json
+import time
+import logging
+from collections import deque
+from concurrent.futures import Future
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterator, List, Tuple
+from google.adk.tools.tool_context import ToolContext
+
+from astra.shared_libraries.sqlite_tools import SqliteDatabase, get_db_instance, quote_identifier
+
+logger = logging.getLogger('astra_sqlite_import')
+
+IMPORT_FORMATS = ("csv", "jsonl")
+IMPORT_CHUNK_SIZE = 5000
+# Chunks queued on the writer at once; bounds memory while keeping it busy
+MAX_CHUNKS_IN_FLIGHT = 2
+
+_TRUE = {"true", "t", "yes", "y"}
+_FALSE = {"false", "f", "no", "n"}
+# Text SQLite reads as a number: decimal integers and reals, no hex, underscores or inf/nan
+_NUMBER = re.compile(r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?")
+_MIN_INT, _MAX_INT = -2 ** 63, 2 ** 63 - 1
+
+
+class ImportRowError(ValueError):
+    """Raised when a record cannot be converted to the table's columns"""
+
+    def __init__(self, line: int, message: str):
+        super().__init__(f"Line {line}: {message}")
+        self.line = line
+        self.committed_rows = 0
+
+
+def column_affinity(declared_type: str) -> str:
+    """SQLite's type affinity for a declared column type (datatype3.html, section 3.1)"""
+    declared = (declared_type or "").upper()
+    if "INT" in declared:
+        return "INTEGER"
+    if "CHAR" in declared or "CLOB" in declared or "TEXT" in declared:
+        return "TEXT"
+    if not declared or "BLOB" in declared:
+        return "BLOB"
+    if "REAL" in declared or "FLOA" in declared or "DOUB" in declared:
+        return "REAL"
+    return "NUMERIC"
+
+def _to_number(value: Any, affinity: str) -> Any:
+    """Convert a value the way SQLite's numeric affinities do; text that is not a number is kept as it is"""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return float(value) if affinity == "REAL" else value
+    text = str(value).strip()
+    if not _NUMBER.fullmatch(text):
+        # e.g. dates in DATE/DATETIME columns, which have NUMERIC affinity
+        return value
+    if affinity == "REAL":
+        return float(text)
+    try:
+        number = int(text)
+    except ValueError:
+        number = float(text)
+        # Like SQLite, reals without a fractional part are stored as integers
+        if number.is_integer():
+            number = int(number)
+    # Integers beyond 64 bits are stored as reals
+    return number if not isinstance(number, int) or _MIN_INT <= number <= _MAX_INT else float(number)
+
+def _to_bool(value: Any) -> Any:
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return 1
+    if text in _FALSE:
+        return 0
+    return value
+
+def make_coercer(declared_type: str) -> Callable[[Any], Any]:
+    """Return a function converting a raw CSV/JSON value for a column of the given declared type"""
+    affinity = column_affinity(declared_type)
+    # Only columns declared as booleans take yes/no/true/false words
+    boolean = "BOOL" in (declared_type or "").upper()
+
+    def coerce(value: Any) -> Any:
+        # Empty CSV fields and JSON nulls are NULL
+        if value is None or value == "":
+            return None
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        if boolean:
+            value = _to_bool(value)
+        if affinity in ("INTEGER", "REAL", "NUMERIC"):
+            return _to_number(value, affinity)
+        if affinity == "TEXT":
+            return value if isinstance(value, str) else str(value)
+        return value
+    return coerce
+
+def _match_columns(table: str, names: List[str], table_columns: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Map file column names to table columns, ignoring case"""
+    by_lower = {name.lower(): name for name in table_columns}
+    matched, unknown = [], []
+    for name in names:
+        column = by_lower.get(name.strip().lower())
+        if column is None:
+            unknown.append(name)
+        else:
+            matched.append(column)
+    if unknown:
+        raise ValueError(f"Columns not in table '{table}': {', '.join(unknown)}")
+    if len(set(matched)) != len(matched):
+        raise ValueError("The file names the same column more than once")
+    return matched
+
+def _read_csv(handle, table: str, table_columns: Dict[str, Dict[str, Any]]
+              ) -> Tuple[List[str], Iterator[Tuple[int, List[Any]]]]:
+    """Return the target columns and an iterator of (line, raw values) for a CSV file with a header"""
+    reader = csv.reader(handle)
+    header = next(reader, None)
+    if not header:
+        raise ValueError("CSV file is empty or has no header row")
+    columns = _match_columns(table, header, table_columns)
+
+    def records():
+        for values in reader:
+            if not values:
+                continue
+            if len(values) != len(columns):
+                raise ImportRowError(reader.line_num, f"expected {len(columns)} values, found {len(values)}")
+            yield reader.line_num, values
+    return columns, records()
+
+def _read_jsonl(handle, table: str, table_columns: Dict[str, Dict[str, Any]]
+                ) -> Tuple[List[str], Iterator[Tuple[int, List[Any]]]]:
+    """Return the target columns and an iterator of (line, raw values) for a JSON Lines file.
+
+    The columns are taken from the first record; later records may omit keys
+    (imported as NULL) but may not add new ones.
+    """
+    lines = ((number, line) for number, line in enumerate(handle, start=1) if line.strip())
+    first = next(lines, None)
+    if first is None:
+        raise ValueError("JSONL file is empty")
+
+    def parse(number: int, line: str) -> Dict[str, Any]:
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ImportRowError(number, f"invalid JSON: {e}") from e
+        if not isinstance(record, dict):
+            raise ImportRowError(number, "each line must be a JSON object")
+        return record
+
+    first_record = parse(*first)
+    keys = list(first_record.keys())
+    columns = _match_columns(table, keys, table_columns)
+
+    def records():
+        yield first[0], [first_record[key] for key in keys]
+        for number, line in lines:
+            record = parse(number, line)
+            extra = set(record) - set(keys)
+            if extra:
+                raise ImportRowError(number, f"keys not in the first record: {', '.join(sorted(extra))}")
+            yield number, [record.get(key) for key in keys]
+    return columns, records()
+
+def import_rows(db: SqliteDatabase, path: str, table: str, file_format: str,
+                chunk_size: int = IMPORT_CHUNK_SIZE) -> Dict[str, Any]:
+    """Stream a CSV or JSONL file into a table in chunked transactions"""
+    file_format = file_format.strip().lower()
+    if file_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported format '{file_format}', expected one of {', '.join(IMPORT_FORMATS)}")
+    table_columns = {column["name"]: column for column in db.get_table_info(quote_identifier(table))}
+    if not table_columns:
+        raise ValueError(f"Table '{table}' does not exist")
+
+    started = time.perf_counter()
+    inserted = 0
+    chunks = 0
+    in_flight: Deque[Tuple[Future, int, int]] = deque()
+
+    def wait_oldest():
+        nonlocal inserted, chunks
+        future, first_line, count = in_flight.popleft()
+        try:
+            future.result()
+        except Exception as e:
+            raise ImportRowError(first_line, f"chunk starting here failed: {e}") from e
+        inserted += count
+        chunks += 1
+
+    with open(os.path.expanduser(path), "r", encoding="utf-8-sig", newline="") as handle:
+        reader = _read_csv if file_format == "csv" else _read_jsonl
+        columns, records = reader(handle, table, table_columns)
+        coercers = [make_coercer(table_columns[column]["type"]) for column in columns]
+        column_list = ", ".join(quote_identifier(column) for column in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"INSERT INTO {quote_identifier(table)} ({column_list}) VALUES ({placeholders})"
+
+        def coerced() -> Iterator[Tuple[int, List[Any]]]:
+            for line, values in records:
+                try:
+                    row = [coerce(value) for coerce, value in zip(coercers, values)]
+                except (TypeError, ValueError) as e:
+                    raise ImportRowError(line, str(e)) from e
+                yield line, row
+
+        try:
+            stream = coerced()
+            while True:
+                chunk = list(islice(stream, chunk_size))
+                if not chunk:
+                    break
+                values = [row for _, row in chunk]
+                future = db.writer.submit(lambda conn, values=values: conn.executemany(sql, values).rowcount,
+                                          tables=[table])
+                in_flight.append((future, chunk[0][0], len(values)))
+                if len(in_flight) >= MAX_CHUNKS_IN_FLIGHT:
+                    wait_oldest()
+            while in_flight:
+                wait_oldest()
+        except Exception as e:
+            # Let chunks already queued finish so the committed count is accurate
+            while in_flight:
+                try:
+                    wait_oldest()
+                except ImportRowError:
+                    pass
+            logger.warning(f"Import of {path} into {table} stopped after {inserted} rows")
+            if isinstance(e, ImportRowError):
+                e.committed_rows = inserted
+            raise
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Imported {inserted} rows from {path} into {table} in {elapsed:.2f}s")
+    return {
+        "table": table,
+        "columns": columns,
+        "inserted_rows": inserted,
+        "chunks": chunks,
+        "elapsed_seconds": round(elapsed, 4),
+        "rows_per_second": round(inserted / elapsed, 1) if elapsed > 0 else None
+    }
+
+def import_file(path: str, table: str, file_format: str, tool_context: ToolContext) -> dict:
+    """Import a CSV or JSONL file from local disk into an existing table.
+
+    CSV files need a header row naming the columns; JSONL files hold one JSON
+    object per line. Values are converted to each column's type, and rows are
+    committed in chunks, so an error stops the import after the last committed
+    chunk.
+
+    Args:
+        path (str): Path of the file to import
+        table (str): Name of the table to insert into
+        file_format (str): "csv" or "jsonl"
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with imported row count and throughput
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        # Check the file before touching the database
+        if not os.path.isfile(os.path.expanduser(path)):
+            return {
+                "status": "error",
+                "error_message": f"File '{path}' does not exist"
+            }
+
+        # Stream the file into the table
+        result = import_rows(db, path, table, file_format)
+
+        # Return the counts and throughput
+        return {
+            "status": "success",
+            **result
+        }
+    except ImportRowError as e:
+        return {
+            "status": "error",
+            "error_message": f"Import error: {str(e)}",
+            "failed_line": e.line,
+            "committed_rows": e.committed_rows
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
@@ -0,0 +1,82 @@
+"""
+Time and work limits for queries run by the shared SQLite tools.
+
+Every connection's StepCounter progress handler also enforces limits: while
+a statement runs inside StepCounter.limited(), the handler interrupts it once
+it has run longer than the time limit or more virtual machine steps than the
+step limit, or when it is cancelled. The interrupted statement is rolled back
+and the caller gets a QueryTimeout, which tools turn into a structured
+"timeout" error so the agent can rewrite the query instead of waiting on it.
+
+Databases set their own limits with "query_timeout_ms" and "query_max_steps"
+in their databases.json entry; anything else uses ASTRA_SQLITE_QUERY_TIMEOUT_MS
+and ASTRA_SQLITE_QUERY_MAX_STEPS. Callers of execute_query can pass their own
+QueryLimits for a single call.
+"""
+
+import os
+import logging
+from typing import Any, Dict, Optional
+
+from astra.shared_libraries.sqlite_catalog import database_catalog
+
+logger = logging.getLogger('astra_sqlite_limits')
+
+# 0 means no limit
+QUERY_TIMEOUT = int(os.getenv("ASTRA_SQLITE_QUERY_TIMEOUT_MS", "30000")) / 1000
+QUERY_MAX_STEPS = int(os.getenv("ASTRA_SQLITE_QUERY_MAX_STEPS", "0"))
+
+
+class QueryLimits:
+    """Longest time (seconds) and most VM steps one statement may use; None or 0 means unlimited"""
+
+    def __init__(self, timeout: Optional[float] = None, max_steps: Optional[int] = None):
+        self.timeout = timeout or None
+        self.max_steps = max_steps or None
+
+    def __bool__(self) -> bool:
+        return self.timeout is not None or self.max_steps is not None
+
+    def __repr__(self) -> str:
+        return f"QueryLimits(timeout={self.timeout}, max_steps={self.max_steps})"
+
+
+class QueryTimeout(Exception):
+    """Raised when a statement is interrupted for exceeding its limits or being cancelled"""
+
+    def __init__(self, reason: str, limits: QueryLimits, elapsed_ms: float, vm_steps: int):
+        self.reason = reason
+        self.limits = limits
+        self.elapsed_ms = elapsed_ms
+        self.vm_steps = vm_steps
+        if reason == "time":
+            what = f"its {limits.timeout:g}s time limit"
+        elif reason == "steps":
+            what = f"its limit of {limits.max_steps:,} VM steps"
+        else:
+            what = None
+        stopped = f"Query stopped after exceeding {what}" if what else "Query cancelled"
+        super().__init__(f"{stopped} ({elapsed_ms / 1000:.1f}s, {vm_steps:,} VM steps)")
+
+    def response(self) -> Dict[str, Any]:
+        """Tool response describing the timeout"""
+        return {
+            "status": "error",
+            "error_type": "timeout" if self.reason != "cancelled" else "cancelled",
+            "error_message": f"{self}. Narrow the query with WHERE or join conditions, or add a LIMIT, and try again",
+            "reason": self.reason,
+            "timeout_seconds": self.limits.timeout,
+            "max_steps": self.limits.max_steps,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "vm_steps": self.vm_steps
+        }
+
+
+def limits_for_path(db_path: str) -> QueryLimits:
+    """Look up the query limits configured for a database path"""
+    entry = database_catalog.find_by_path(db_path) or {}
+    timeout = entry.get("query_timeout_ms")
+    return QueryLimits(
+        timeout=timeout / 1000 if timeout is not None else QUERY_TIMEOUT,
+        max_steps=entry.get("query_max_steps", QUERY_MAX_STEPS)
+    )
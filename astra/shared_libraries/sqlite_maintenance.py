@@ -0,0 +1,280 @@
+"""
+Background maintenance for databases written through the shared SQLite tools.
+
+Each database's writer thread runs maintenance on its own connection when no
+writes have arrived for a while, so it never competes with tool calls:
+
+- PRAGMA optimize periodically, and when the writer closes
+- ANALYZE once enough rows have changed since the last one, so the query
+  planner has statistics for data the agents added
+- incremental_vacuum (auto_vacuum=INCREMENTAL databases) or VACUUM (when a
+  large share of the file is free pages) inside a configured time window
+
+Every task runs under a time budget: ANALYZE is approximate
+(PRAGMA analysis_limit), and anything still running when the budget is
+spent is interrupted and rolled back. VACUUM rewrites the whole file, so it
+gets a larger budget of its own (capped by the time left in the window) and
+is skipped, with the reason recorded, when the file is too large to rewrite
+within it. Each run is logged with its effect on the planner statistics and
+on the file size.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from datetime import time as clock_time
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+from astra.shared_libraries.sqlite_cache import result_cache
+
+logger = logging.getLogger('astra_sqlite_maintenance')
+
+# Seconds without writes before the writer runs due maintenance; 0 disables it
+MAINTENANCE_IDLE_SECONDS = float(os.getenv("ASTRA_SQLITE_MAINTENANCE_IDLE_SECONDS", "30"))
+MAINTENANCE_BUDGET = int(os.getenv("ASTRA_SQLITE_MAINTENANCE_BUDGET_MS", "2000")) / 1000
+ANALYZE_CHANGE_THRESHOLD = int(os.getenv("ASTRA_SQLITE_ANALYZE_CHANGES", "1000"))
+# Local time window for vacuuming, e.g. "02:00-05:00"; empty means never automatically
+MAINTENANCE_WINDOW = os.getenv("ASTRA_SQLITE_MAINTENANCE_WINDOW", "")
+VACUUM_BUDGET = int(os.getenv("ASTRA_SQLITE_VACUUM_BUDGET_MS", "60000")) / 1000
+
+OPTIMIZE_INTERVAL_SECONDS = 3600
+# Rows sampled per index by ANALYZE and PRAGMA optimize
+ANALYSIS_LIMIT = 1000
+# VACUUM a database without auto_vacuum once this share of its pages is free
+VACUUM_FREE_FRACTION = 0.2
+# Assumed VACUUM speed until one has been measured on the database
+VACUUM_BYTES_PER_SECOND = 20 * 1024 * 1024
+INCREMENTAL_VACUUM_PAGES = 256
+MAINTENANCE_TASKS = ("optimize", "analyze", "vacuum")
+MAINTENANCE_HISTORY = 20
+
+Window = Tuple[clock_time, clock_time]
+
+def parse_window(text: str) -> Optional[Window]:
+    """Parse an "HH:MM-HH:MM" window; None for an empty string"""
+    if not text.strip():
+        return None
+    try:
+        start, end = text.split("-")
+        return (datetime.strptime(start.strip(), "%H:%M").time(), datetime.strptime(end.strip(), "%H:%M").time())
+    except ValueError:
+        raise ValueError(f"Maintenance window '{text}' must look like 02:00-05:00")
+
+def in_window(now: datetime, window: Optional[Window]) -> bool:
+    """Whether a time falls inside a window, which may wrap past midnight"""
+    if window is None:
+        return False
+    start, end = window
+    current = now.time()
+    if start <= end:
+        return start <= current < end
+    return current >= start or current < end
+
+def _window_length(window: Window) -> timedelta:
+    start, end = (datetime.combine(datetime.min, moment) for moment in window)
+    return (end - start) % timedelta(days=1)
+
+def _window_remaining(now: datetime, window: Window) -> timedelta:
+    """Time from now until the window closes"""
+    end = datetime.combine(now.date(), window[1])
+    return (end - now) % timedelta(days=1)
+
+def _measure(conn: sqlite3.Connection) -> Dict[str, int]:
+    """File size and planner statistics of the main database"""
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    try:
+        stat_rows, analyzed = conn.execute("SELECT count(*), count(DISTINCT tbl) FROM sqlite_stat1").fetchone()
+    except sqlite3.OperationalError:
+        stat_rows, analyzed = 0, 0  # Never analyzed
+    return {
+        "bytes": page_size * page_count,
+        "free_pages": conn.execute("PRAGMA freelist_count").fetchone()[0],
+        "page_count": page_count,
+        "stat_rows": stat_rows,
+        "analyzed_tables": analyzed,
+    }
+
+@contextmanager
+def time_budget(conn: sqlite3.Connection, seconds: float) -> Iterator[None]:
+    """Interrupt whatever the connection is running once the budget is spent.
+
+    Lock waits are bounded by the same budget.
+    """
+    busy_timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+    conn.execute(f"PRAGMA busy_timeout={int(seconds * 1000)}")
+    finished = threading.Event()
+    lock = threading.Lock()
+
+    def expire():
+        with lock:
+            if not finished.is_set():
+                conn.interrupt()
+
+    timer = threading.Timer(seconds, expire)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield
+    finally:
+        with lock:
+            finished.set()
+        timer.cancel()
+        conn.execute(f"PRAGMA busy_timeout={busy_timeout}")
+
+
+class DatabaseMaintenance:
+    """Maintenance policy and history for one database, run on its writer's connection."""
+
+    def __init__(self, db_path: str, window: Optional[Window] = None, budget: float = MAINTENANCE_BUDGET,
+                 analyze_changes: int = ANALYZE_CHANGE_THRESHOLD, vacuum_budget: float = VACUUM_BUDGET):
+        self.db_path = db_path
+        self.window = window if window is not None else parse_window(MAINTENANCE_WINDOW)
+        self.budget = budget
+        self.vacuum_budget = vacuum_budget
+        # Bytes per second of the last VACUUM that completed
+        self._vacuum_rate = VACUUM_BYTES_PER_SECOND
+        self.analyze_changes = analyze_changes
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=MAINTENANCE_HISTORY)
+        self._changes_at_analyze = 0
+        self._last_optimize = time.monotonic()
+        self._last_vacuum: Optional[datetime] = None
+
+    def idle(self, conn: sqlite3.Connection):
+        """Run whatever maintenance is due; called by the writer when it has been idle"""
+        if conn.total_changes - self._changes_at_analyze >= self.analyze_changes:
+            self.analyze(conn)
+        elif time.monotonic() - self._last_optimize >= OPTIMIZE_INTERVAL_SECONDS:
+            self.optimize(conn)
+
+        # At most one vacuum per occurrence of the window
+        now = datetime.now()
+        if in_window(now, self.window) and (
+                self._last_vacuum is None or now - self._last_vacuum > _window_length(self.window)):
+            self._last_vacuum = now
+            self.vacuum(conn, budget=min(self.vacuum_budget, _window_remaining(now, self.window).total_seconds()))
+
+    def run(self, conn: sqlite3.Connection, task: str) -> Dict[str, Any]:
+        """Run one task now, ignoring the schedule; a requested vacuum runs even if little space is free"""
+        if task == "optimize":
+            return self.optimize(conn)
+        if task == "analyze":
+            return self.analyze(conn)
+        if task == "vacuum":
+            return self.vacuum(conn, force=True)
+        raise ValueError(f"Unknown maintenance task '{task}', expected one of {', '.join(MAINTENANCE_TASKS)}")
+
+    def _timed(self, conn: sqlite3.Connection, task: str, statements,
+               budget: Optional[float] = None) -> Dict[str, Any]:
+        """Run statements under a time budget (the maintenance budget by default) and record their impact"""
+        before = _measure(conn)
+        started = time.perf_counter()
+        completed, error = True, None
+        try:
+            with time_budget(conn, budget or self.budget):
+                statements()
+        except sqlite3.OperationalError as e:
+            completed = False
+            error = "time budget exceeded" if "interrupt" in str(e) else str(e)
+        after = _measure(conn)
+
+        record = {
+            "task": task,
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "completed": completed,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            "bytes_before": before["bytes"],
+            "bytes_after": after["bytes"],
+            "free_pages_before": before["free_pages"],
+            "free_pages_after": after["free_pages"],
+            "analyzed_tables_before": before["analyzed_tables"],
+            "analyzed_tables_after": after["analyzed_tables"],
+            "stat_rows_before": before["stat_rows"],
+            "stat_rows_after": after["stat_rows"],
+        }
+        if error:
+            record["error"] = error
+        self.history.append(record)
+        logger.info(
+            f"{task} on {self.db_path}: {'done' if completed else 'stopped (' + error + ')'} in "
+            f"{record['elapsed_ms']}ms; size {before['bytes']} -> {after['bytes']} bytes, "
+            f"free pages {before['free_pages']} -> {after['free_pages']}, "
+            f"tables with statistics {before['analyzed_tables']} -> {after['analyzed_tables']}"
+        )
+        return record
+
+    def optimize(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+        self._last_optimize = time.monotonic()
+
+        def statements():
+            conn.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+            conn.execute("PRAGMA optimize")
+        return self._timed(conn, "optimize", statements)
+
+    def analyze(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+        self._changes_at_analyze = conn.total_changes
+
+        def statements():
+            conn.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+            conn.execute("ANALYZE")
+        return self._timed(conn, "analyze", statements)
+
+    def _skipped(self, task: str, reason: str) -> Dict[str, Any]:
+        record = {"task": task, "at": datetime.now().isoformat(timespec="seconds"), "skipped": True, "reason": reason}
+        self.history.append(record)
+        logger.info(f"{task} on {self.db_path}: skipped ({reason})")
+        return record
+
+    def vacuum(self, conn: sqlite3.Connection, force: bool = False,
+               budget: Optional[float] = None) -> Dict[str, Any]:
+        """incremental_vacuum for auto_vacuum=INCREMENTAL databases, VACUUM for the rest.
+
+        VACUUM runs under budget (the vacuum budget by default) and is skipped
+        when the file is too large to rewrite within it.
+        """
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if auto_vacuum == 2:
+            deadline = time.monotonic() + self.budget
+
+            def statements():
+                # Release free pages in slices so the budget is checked between them
+                while conn.execute("PRAGMA freelist_count").fetchone()[0] and time.monotonic() < deadline:
+                    conn.execute(f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES})").fetchall()
+            return self._timed(conn, "incremental_vacuum", statements)
+
+        measured = _measure(conn)
+        free_fraction = measured["free_pages"] / max(measured["page_count"], 1)
+        if auto_vacuum == 1 or (not force and free_fraction < VACUUM_FREE_FRACTION):
+            return self._skipped("vacuum", "auto_vacuum is FULL" if auto_vacuum == 1 else
+                                           f"only {free_fraction:.0%} of pages are free")
+
+        # An interrupted VACUUM is rolled back, wasting all the I/O it did
+        budget = budget if budget is not None else self.vacuum_budget
+        estimate = measured["bytes"] / self._vacuum_rate
+        if estimate > budget:
+            return self._skipped("vacuum", f"rewriting {measured['bytes']} bytes would take about {estimate:.0f}s, "
+                                           f"more than the {budget:.0f}s available")
+
+        def statements():
+            conn.execute("VACUUM")
+        record = self._timed(conn, "vacuum", statements, budget)
+        if record["completed"]:
+            # Short runs are mostly fixed overhead and would understate the speed
+            if record["elapsed_ms"] >= 1000:
+                self._vacuum_rate = max(measured["bytes"] / (record["elapsed_ms"] / 1000), 1)
+            # VACUUM may renumber rowids of tables without an INTEGER PRIMARY KEY
+            result_cache.invalidate(self.db_path)
+        return record
+
+    def stats(self, total_changes: int) -> Dict[str, Any]:
+        return {
+            "changes_since_analyze": total_changes - self._changes_at_analyze,
+            "analyze_after_changes": self.analyze_changes,
+            "vacuum_window": "-".join(moment.strftime("%H:%M") for moment in self.window) if self.window else None,
+            "recent_runs": list(self.history)[-5:],
+        }
@@ -0,0 +1,280 @@
+"""
+Connection pooling for the shared SQLite tools.
+
+Each database path gets a bounded set of reusable connections that can be
+handed out safely across threads, so tool calls no longer pay for connection
+setup and page-cache warmup on every query.
+
+Connections can also have other databases attached under schema aliases for
+cross-database queries. Each connection remembers what it has attached, so
+borrowing it again with the same attach set costs no ATTACH statements.
+
+Every connection's progress handler counts the work its statements do and
+enforces query limits (see sqlite_limits).
+"""
+
+import time
+import queue
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from astra.shared_libraries.sqlite_profiles import DEFAULT_PROFILE, profile_pragma_statements
+from astra.shared_libraries.sqlite_limits import QueryLimits, QueryTimeout
+
+logger = logging.getLogger('astra_sqlite_pool')
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_POOL_TIMEOUT = 30.0
+
+# VM instructions between progress handler calls; step counts are this granular
+PROGRESS_INTERVAL = 1000
+
+
+def read_only_uri(db_path: str) -> str:
+    """Build a URI that opens an existing database file read-only"""
+    return Path(db_path).resolve().as_uri() + "?mode=ro"
+
+
+class StepCounter:
+    """Progress handler that counts SQLite virtual machine steps run on a connection.
+
+    Inside limited() it also interrupts statements that run past their limits
+    or are cancelled from another thread.
+    """
+
+    def __init__(self):
+        self.steps = 0
+        self.cancelled = False
+        self.stopped_by: Optional[str] = None
+        self._limited = False
+        self._deadline: Optional[float] = None
+        self._step_limit: Optional[int] = None
+
+    def __call__(self) -> int:
+        self.steps += PROGRESS_INTERVAL
+        if not self._limited:
+            return 0
+        # A nonzero return makes SQLite interrupt the running statement
+        if self.cancelled:
+            self.stopped_by = "cancelled"
+        elif self._step_limit is not None and self.steps >= self._step_limit:
+            self.stopped_by = "steps"
+        elif self._deadline is not None and time.monotonic() >= self._deadline:
+            self.stopped_by = "time"
+        return 1 if self.stopped_by else 0
+
+    def cancel(self):
+        """Interrupt the statement running inside limited(), from any thread"""
+        self.cancelled = True
+
+    @contextmanager
+    def limited(self, limits: Optional[QueryLimits]) -> Iterator[None]:
+        """Enforce limits (and cancel()) on the statements run inside the block.
+
+        A statement stopped by them raises QueryTimeout instead of SQLite's
+        "interrupted" error.
+        """
+        started, steps_before = time.monotonic(), self.steps
+        self.cancelled = False
+        self.stopped_by = None
+        self._deadline = started + limits.timeout if limits and limits.timeout else None
+        self._step_limit = steps_before + limits.max_steps if limits and limits.max_steps else None
+        self._limited = True
+        try:
+            yield
+        except sqlite3.OperationalError as e:
+            if self.stopped_by is None:
+                raise
+            raise QueryTimeout(self.stopped_by, limits or QueryLimits(), (time.monotonic() - started) * 1000,
+                               self.steps - steps_before) from e
+        finally:
+            # A cancelled statement may still be running on another thread; keep interrupting it
+            self._limited = self.cancelled
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection subclass, so connections can carry attributes such as step_counter"""
+
+    step_counter: StepCounter
+    # Schema alias -> database path currently attached to the connection
+    attached: Dict[str, str]
+
+
+def install_step_counter(conn: sqlite3.Connection):
+    """Attach a StepCounter to a connection so callers can measure work per statement"""
+    conn.step_counter = StepCounter()
+    conn.set_progress_handler(conn.step_counter, PROGRESS_INTERVAL)
+
+
+def attachment_changes(current: Dict[str, str], wanted: Dict[str, str]) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Aliases to detach and (alias, path) pairs to attach to turn one attach set into another"""
+    detach = [alias for alias, path in current.items() if wanted.get(alias) != path]
+    attach = [(alias, path) for alias, path in wanted.items() if current.get(alias) != path]
+    return detach, attach
+
+def attach_statement(alias: str) -> str:
+    """ATTACH statement taking the database URI as its parameter"""
+    return 'ATTACH DATABASE ? AS "' + alias.replace('"', '""') + '"'
+
+def detach_statement(alias: str) -> str:
+    return 'DETACH DATABASE "' + alias.replace('"', '""') + '"'
+
+def apply_attachments(conn: sqlite3.Connection, wanted: Dict[str, str]) -> int:
+    """Make a connection's attached databases match wanted, keeping those already attached.
+
+    Databases are attached read-only. Returns the number of ATTACH statements run.
+    """
+    current = conn.attached
+    detach, attach = attachment_changes(current, wanted)
+    for alias in detach:
+        conn.execute(detach_statement(alias))
+        del current[alias]
+    for alias, path in attach:
+        conn.execute(attach_statement(alias), (read_only_uri(path),))
+        current[alias] = path
+    return len(attach)
+
+
+class SqliteConnectionPool:
+    """Bounded pool of reusable connections to a single SQLite database file."""
+
+    def __init__(self, db_path: str, max_size: int = DEFAULT_POOL_SIZE,
+                 timeout: float = DEFAULT_POOL_TIMEOUT, profile: str = DEFAULT_PROFILE,
+                 read_only: bool = False):
+        self.db_path = db_path
+        self.profile = profile
+        self.read_only = read_only
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+        self.attaches = 0
+
+    def open_connection(self) -> sqlite3.Connection:
+        """Open a new connection configured like the pooled ones (not tracked by the pool)"""
+        logger.debug(f"Opening connection to {self.db_path}")
+        if self.read_only:
+            target, uri = read_only_uri(self.db_path), True
+        else:
+            target, uri = self.db_path, False
+        conn = sqlite3.connect(target, timeout=self.timeout, check_same_thread=False,
+                               factory=PooledConnection, uri=uri)
+        conn.row_factory = sqlite3.Row
+        conn.attached = {}
+        install_step_counter(conn)
+        for statement in profile_pragma_statements(self.profile, self.read_only):
+            try:
+                conn.execute(statement)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not apply '{statement}' to {self.db_path}: {e}")
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection):
+        """Close a connection and free its slot in the pool"""
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing pooled connection: {e}")
+        with self._lock:
+            self._created -= 1
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take a connection from the pool, opening one if the pool is not full"""
+        if self._closed:
+            raise RuntimeError(f"Connection pool for {self.db_path} is closed")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.max_size
+            if can_create:
+                self._created += 1
+
+        if can_create:
+            try:
+                return self.open_connection()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"Timed out after {self.timeout}s waiting for a connection to {self.db_path}"
+            )
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, rolling back any open transaction"""
+        if conn.step_counter.cancelled:
+            # Its cancelled statement may still be unwinding; never hand it out again
+            self._discard(conn)
+            return
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding pooled connection after failed rollback: {e}")
+            self._discard(conn)
+            return
+
+        if self._closed:
+            self._discard(conn)
+            return
+
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self, attached: Optional[Dict[str, str]] = None) -> Iterator[sqlite3.Connection]:
+        """Context manager that borrows a connection and always returns it.
+
+        attached maps schema aliases to database paths; the connection has
+        exactly those databases attached while it is borrowed.
+        """
+        conn = self.acquire()
+        try:
+            attaches = apply_attachments(conn, attached or {})
+            if attaches:
+                with self._lock:
+                    self.attaches += attaches
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close every idle connection; busy connections close when released"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        """Return a snapshot of pool usage"""
+        idle = self._idle.qsize()
+        return {
+            "db_path": self.db_path,
+            "profile": self.profile,
+            "read_only": self.read_only,
+            "max_size": self.max_size,
+            "open_connections": self._created,
+            "idle_connections": idle,
+            "busy_connections": self._created - idle,
+            "attach_statements": self.attaches,
+        }
@@ -0,0 +1,67 @@
+"""
+Named SQLite connection profiles.
+
+A profile is an ordered set of pragmas applied to every connection when it is
+opened. Databases pick a profile through the "profile" field of their entry in
+db_manager_agent/databases.json; anything not in the catalog uses
+ASTRA_SQLITE_PROFILE, or SQLite's defaults if that is unset.
+"""
+
+import os
+import logging
+from typing import List, Tuple
+
+from astra.shared_libraries.sqlite_catalog import database_catalog
+
+logger = logging.getLogger('astra_sqlite_profiles')
+
+DEFAULT_PROFILE = "default"
+
+CONNECTION_PROFILES = {
+    # SQLite defaults: rollback journal, synchronous=FULL, small page cache
+    "default": [],
+    # Many concurrent readers: WAL lets readers run alongside the writer,
+    # and memory-mapped I/O plus a 64 MiB page cache keep hot pages in memory
+    "read-heavy": [
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("mmap_size", 268435456),
+        ("cache_size", -65536),
+        ("temp_store", "MEMORY"),
+    ],
+    # Large imports: skip fsyncs and use a big cache; a crash may lose the
+    # most recent transactions but will not corrupt a WAL database
+    "bulk-load": [
+        ("journal_mode", "WAL"),
+        ("synchronous", "OFF"),
+        ("cache_size", -262144),
+        ("temp_store", "MEMORY"),
+    ],
+}
+
+def get_profile_pragmas(profile: str) -> List[Tuple[str, object]]:
+    """Return the pragmas for a profile, falling back to the default profile"""
+    if profile not in CONNECTION_PROFILES:
+        logger.warning(f"Unknown connection profile '{profile}', using '{DEFAULT_PROFILE}'")
+        profile = DEFAULT_PROFILE
+    return CONNECTION_PROFILES[profile]
+
+def profile_pragma_statements(profile: str, read_only: bool = False) -> List[str]:
+    """Return the PRAGMA statements that configure a connection for a profile.
+
+    journal_mode is stored in the database file and can only be changed by a
+    connection that may write, so it is left out for read-only connections.
+    """
+    return [
+        f"PRAGMA {name}={value}"
+        for name, value in get_profile_pragmas(profile)
+        if not (read_only and name == "journal_mode")
+    ]
+
+def profile_for_path(db_path: str) -> str:
+    """Look up the connection profile configured for a database path"""
+    default = os.getenv("ASTRA_SQLITE_PROFILE", DEFAULT_PROFILE)
+    entry = database_catalog.find_by_path(db_path)
+    if entry is None:
+        return default
+    return entry.get("profile", default)
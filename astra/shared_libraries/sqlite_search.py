@@ -0,0 +1,189 @@
+"""
+Full-text search over the travel database's Destinations table.
+
+search_destinations answers questions like "beach destinations with good
+food" from the destination names, places, descriptions and tags already in
+the database, instead of a web search. The text lives in an FTS5 index that
+uses Destinations as its external content table. Triggers on Destinations keep
+the index in sync, and results are ranked by bm25 with name and tag matches
+weighted above description matches.
+"""
+
+import re
+import sqlite3
+import logging
+from typing import Any, Dict, List
+from google.adk.tools.tool_context import ToolContext
+
+from astra.shared_libraries.sqlite_tools import SqliteDatabase, get_db_instance
+from astra.shared_libraries.sqlite_cache import schema_cache, result_cache
+
+logger = logging.getLogger('astra_sqlite_search')
+
+DESTINATION_FTS_TABLE = "destinations_fts"
+# Indexed columns with their bm25 weights, in index column order
+DESTINATION_FTS_COLUMNS = [
+    ("name", 10.0),
+    ("country", 3.0),
+    ("region", 2.0),
+    ("city", 3.0),
+    ("description", 1.0),
+    ("tags", 5.0),
+]
+MAX_SEARCH_RESULTS = 50
+SNIPPET_TOKENS = 12
+
+# Words that match almost every destination and only blur the ranking
+_STOPWORDS = {
+    "a", "an", "and", "any", "are", "as", "at", "by", "destination", "destinations", "for", "from",
+    "good", "great", "in", "is", "it", "near", "nice", "of", "on", "or", "place", "places", "some",
+    "that", "the", "to", "where", "which", "with",
+}
+
+def _index_ddl() -> List[str]:
+    """Statements creating the FTS5 index, its bm25 weights and the sync triggers"""
+    names = [name for name, _ in DESTINATION_FTS_COLUMNS]
+    columns = ", ".join(names)
+    new_values = ", ".join(f"new.{name}" for name in names)
+    old_values = ", ".join(f"old.{name}" for name in names)
+    weights = ", ".join(str(weight) for _, weight in DESTINATION_FTS_COLUMNS)
+    fts = DESTINATION_FTS_TABLE
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, content='Destinations', "
+        f"content_rowid='destination_id', tokenize='porter unicode61 remove_diacritics 2')",
+        # ORDER BY rank then uses these column weights
+        f"INSERT INTO {fts}({fts}, rank) VALUES('rank', 'bm25({weights})')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON Destinations BEGIN "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.destination_id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON Destinations BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.destination_id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF destination_id, {columns} ON Destinations BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.destination_id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.destination_id, {new_values}); END",
+    ]
+
+def build_match_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching any of its words.
+
+    Every word is quoted, so FTS5 operators and punctuation in the text are
+    searched for literally rather than parsed.
+    """
+    words = [word for word in re.findall(r"\w+", text.lower()) if word not in _STOPWORDS]
+    if not words:
+        # Nothing but stopwords: search for them rather than for nothing
+        words = re.findall(r"\w+", text.lower())
+    return " OR ".join(f'"{word}"' for word in dict.fromkeys(words))
+
+def rebuild_index(db: SqliteDatabase) -> int:
+    """Create the index and triggers if missing and reindex every destination; returns the row count"""
+    def rebuild(conn: sqlite3.Connection) -> int:
+        for statement in _index_ddl():
+            conn.execute(statement)
+        conn.execute(f"INSERT INTO {DESTINATION_FTS_TABLE}({DESTINATION_FTS_TABLE}) VALUES('rebuild')")
+        return conn.execute("SELECT COUNT(*) FROM Destinations").fetchone()[0]
+
+    indexed = db.writer.execute(rebuild)
+    schema_cache.invalidate(db.db_path)
+    logger.info(f"Rebuilt {DESTINATION_FTS_TABLE} with {indexed} destinations")
+    return indexed
+
+def ensure_index(db: SqliteDatabase):
+    """Build the index the first time a database is searched"""
+    tables = db.get_table_names()
+    if "Destinations" not in tables:
+        raise ValueError("The database has no Destinations table; connect to the travel database first")
+    if DESTINATION_FTS_TABLE not in tables:
+        rebuild_index(db)
+
+def search_rows(db: SqliteDatabase, text: str, limit: int) -> List[Dict[str, Any]]:
+    """Return the destinations best matching the text, best match first"""
+    ensure_index(db)
+    description_column = [name for name, _ in DESTINATION_FTS_COLUMNS].index("description")
+    query = f"""
+        SELECT d.destination_id, d.name, d.country, d.region, d.city, d.tags, d.best_season,
+               snippet({DESTINATION_FTS_TABLE}, {description_column}, '[', ']', '...', {SNIPPET_TOKENS}) AS snippet,
+               -rank AS score
+        FROM {DESTINATION_FTS_TABLE} JOIN Destinations AS d ON d.destination_id = {DESTINATION_FTS_TABLE}.rowid
+        WHERE {DESTINATION_FTS_TABLE} MATCH :match
+        ORDER BY rank
+        LIMIT :limit
+    """
+    return db.execute_query(query, {"match": build_match_query(text), "limit": limit},
+                            use_cache=result_cache.enabled)
+
+def search_destinations(text: str, limit: int, tool_context: ToolContext) -> dict:
+    """Search the travel database's destinations by name, place, description and tags.
+
+    Matches any of the words in the text, ranks the best matches first and
+    answers from the local database in milliseconds, without a web search.
+
+    Args:
+        text (str): What to look for, e.g. "beach snorkeling natural pools"
+        limit (int): Maximum number of destinations to return (at most 50)
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with matching destinations, each with a description snippet and score
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        if not re.search(r"\w", text or ""):
+            return {
+                "status": "error",
+                "error_message": "Search text must contain at least one word"
+            }
+        limit = max(1, min(int(limit), MAX_SEARCH_RESULTS))
+
+        results = search_rows(db, text, limit)
+
+        # Return the ranked matches
+        return {
+            "status": "success",
+            "query": text,
+            "count": len(results),
+            "data": results
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
+
+def rebuild_destination_search(tool_context: ToolContext) -> dict:
+    """Create or rebuild the full-text search index over the Destinations table.
+
+    The index is kept up to date automatically; rebuild it after loading
+    destinations with triggers disabled or restoring the table from elsewhere.
+
+    Args:
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with the number of destinations indexed
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        if "Destinations" not in db.get_table_names():
+            return {
+                "status": "error",
+                "error_message": "The database has no Destinations table"
+            }
+
+        indexed = rebuild_index(db)
+
+        return {
+            "status": "success",
+            "message": f"Indexed {indexed} destinations for search",
+            "indexed_rows": indexed
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
@@ -0,0 +1,168 @@
+"""
+Nearest-destination queries over the travel database's Destinations table.
+
+nearby_destinations finds the destinations within a radius of a point. The
+coordinates of every destination are mirrored into an R*Tree companion table
+kept in sync by triggers on Destinations. A query first selects the
+destinations inside the radius's latitude/longitude bounding box from the
+R*Tree, then ranks only those candidates by exact haversine distance, so it
+never scans the whole table.
+"""
+
+import math
+import sqlite3
+import logging
+from typing import Any, Dict, List, Tuple
+from google.adk.tools.tool_context import ToolContext
+
+from astra.shared_libraries.sqlite_tools import SqliteDatabase, get_db_instance
+from astra.shared_libraries.sqlite_cache import schema_cache, result_cache
+
+logger = logging.getLogger('astra_sqlite_spatial')
+
+DESTINATION_RTREE_TABLE = "destinations_rtree"
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LATITUDE = math.pi * EARTH_RADIUS_KM / 180
+MAX_NEARBY_RESULTS = 50
+
+# Destinations with usable coordinates, as R*Tree rows (a point is a zero-size box)
+_POINTS = """
+    SELECT destination_id, latitude, latitude, longitude, longitude FROM Destinations
+    WHERE latitude BETWEEN -90 AND 90 AND longitude BETWEEN -180 AND 180
+"""
+
+def _index_ddl() -> List[str]:
+    """Statements creating the R*Tree companion table and the triggers that keep it in sync"""
+    rtree = DESTINATION_RTREE_TABLE
+    has_point = "new.latitude BETWEEN -90 AND 90 AND new.longitude BETWEEN -180 AND 180"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {rtree} USING rtree(id, min_lat, max_lat, min_lon, max_lon)",
+        f"CREATE TRIGGER IF NOT EXISTS {rtree}_ai AFTER INSERT ON Destinations WHEN {has_point} BEGIN "
+        f"INSERT INTO {rtree} VALUES (new.destination_id, new.latitude, new.latitude, new.longitude, new.longitude); END",
+        f"CREATE TRIGGER IF NOT EXISTS {rtree}_ad AFTER DELETE ON Destinations BEGIN "
+        f"DELETE FROM {rtree} WHERE id = old.destination_id; END",
+        f"CREATE TRIGGER IF NOT EXISTS {rtree}_au AFTER UPDATE OF destination_id, latitude, longitude ON Destinations BEGIN "
+        f"DELETE FROM {rtree} WHERE id = old.destination_id; "
+        f"INSERT INTO {rtree} SELECT new.destination_id, new.latitude, new.latitude, new.longitude, new.longitude "
+        f"WHERE {has_point}; END",
+    ]
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def bounding_boxes(lat: float, lon: float, radius_km: float) -> List[Tuple[float, float, float, float]]:
+    """Return (min_lat, max_lat, min_lon, max_lon) boxes covering every point within radius_km.
+
+    A box crossing the antimeridian is split in two; one reaching a pole
+    covers all longitudes.
+    """
+    d_lat = radius_km / KM_PER_DEGREE_LATITUDE
+    min_lat, max_lat = lat - d_lat, lat + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return [(max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0)]
+
+    # Longitude degrees shrink with the cosine of the latitude; use the
+    # latitude in the box closest to a pole so the box is never too narrow
+    widest = max(abs(min_lat), abs(max_lat))
+    d_lon = radius_km / (KM_PER_DEGREE_LATITUDE * math.cos(math.radians(widest)))
+    if d_lon >= 180:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+    min_lon, max_lon = lon - d_lon, lon + d_lon
+    if min_lon < -180:
+        return [(min_lat, max_lat, min_lon + 360, 180.0), (min_lat, max_lat, -180.0, max_lon)]
+    if max_lon > 180:
+        return [(min_lat, max_lat, min_lon, 180.0), (min_lat, max_lat, -180.0, max_lon - 360)]
+    return [(min_lat, max_lat, min_lon, max_lon)]
+
+def rebuild_index(db: SqliteDatabase) -> int:
+    """Create the R*Tree and triggers if missing and reload every destination; returns the points indexed"""
+    def rebuild(conn: sqlite3.Connection) -> int:
+        for statement in _index_ddl():
+            conn.execute(statement)
+        conn.execute(f"DELETE FROM {DESTINATION_RTREE_TABLE}")
+        return conn.execute(f"INSERT INTO {DESTINATION_RTREE_TABLE} {_POINTS}").rowcount
+
+    indexed = db.writer.execute(rebuild)
+    schema_cache.invalidate(db.db_path)
+    logger.info(f"Rebuilt {DESTINATION_RTREE_TABLE} with {indexed} destinations")
+    return indexed
+
+def ensure_index(db: SqliteDatabase):
+    """Build the R*Tree the first time a database is searched"""
+    tables = db.get_table_names()
+    if "Destinations" not in tables:
+        raise ValueError("The database has no Destinations table; connect to the travel database first")
+    if DESTINATION_RTREE_TABLE not in tables:
+        rebuild_index(db)
+
+def nearby_rows(db: SqliteDatabase, lat: float, lon: float, radius_km: float, limit: int) -> List[Dict[str, Any]]:
+    """Return the destinations within radius_km of a point, nearest first, with their distance"""
+    ensure_index(db)
+    query = f"""
+        SELECT d.destination_id, d.name, d.country, d.region, d.city, d.latitude, d.longitude, d.tags
+        FROM {DESTINATION_RTREE_TABLE} AS r JOIN Destinations AS d ON d.destination_id = r.id
+        WHERE r.min_lat <= :max_lat AND r.max_lat >= :min_lat
+          AND r.min_lon <= :max_lon AND r.max_lon >= :min_lon
+    """
+    nearby = {}
+    for min_lat, max_lat, min_lon, max_lon in bounding_boxes(lat, lon, radius_km):
+        params = {"min_lat": min_lat, "max_lat": max_lat, "min_lon": min_lon, "max_lon": max_lon}
+        for row in db.execute_query(query, params, use_cache=result_cache.enabled):
+            distance = haversine_km(lat, lon, float(row["latitude"]), float(row["longitude"]))
+            # The box corners lie outside the circle
+            if distance <= radius_km:
+                nearby[row["destination_id"]] = dict(row, distance_km=round(distance, 2))
+    return sorted(nearby.values(), key=lambda row: row["distance_km"])[:limit]
+
+def nearby_destinations(lat: float, lon: float, radius_km: float, limit: int, tool_context: ToolContext) -> dict:
+    """Find the destinations in the travel database closest to a point.
+
+    Only destinations with a latitude and longitude are found. Distances are
+    great-circle distances in kilometres.
+
+    Args:
+        lat (float): Latitude of the point, -90 to 90
+        lon (float): Longitude of the point, -180 to 180
+        radius_km (float): Search radius in kilometres
+        limit (int): Maximum number of destinations to return (at most 50)
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with the destinations within the radius, nearest first, each with distance_km
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        lat, lon, radius_km = float(lat), float(lon), float(radius_km)
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            return {
+                "status": "error",
+                "error_message": "Latitude must be between -90 and 90 and longitude between -180 and 180"
+            }
+        if radius_km <= 0:
+            return {
+                "status": "error",
+                "error_message": "radius_km must be greater than 0"
+            }
+        limit = max(1, min(int(limit), MAX_NEARBY_RESULTS))
+
+        results = nearby_rows(db, lat, lon, radius_km, limit)
+
+        # Return the destinations, nearest first
+        return {
+            "status": "success",
+            "count": len(results),
+            "data": results
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
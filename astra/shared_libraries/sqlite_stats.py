@@ -0,0 +1,158 @@
+"""
+Per-statement timing and a slow-query log for the shared SQLite tools.
+
+Every statement run through execute_query is recorded under a normalized
+fingerprint (literals replaced by ?), so the many variants of an LLM-written
+query group together with count, latency percentiles and work done. Reads
+answered from the result cache count too, as cache hits. Statements slower
+than the threshold are also kept in a bounded ring buffer.
+"""
+
+import os
+import re
+import math
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger('astra_sqlite_stats')
+
+DEFAULT_SLOW_QUERY_MS = 200.0
+SLOW_LOG_SIZE = 200
+MAX_FINGERPRINTS = 500
+LATENCY_SAMPLES = 1000
+
+_COMMENTS = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b')
+_IN_LISTS = re.compile(r'\bin\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+def fingerprint(query: str) -> str:
+    """Normalize a statement so queries that differ only in literals group together"""
+    normalized = _COMMENTS.sub(' ', query)
+    normalized = _STRINGS.sub('?', normalized)
+    normalized = _NUMBERS.sub('?', normalized)
+    normalized = _IN_LISTS.sub('in (?)', normalized)
+    normalized = _WHITESPACE.sub(' ', normalized).strip().rstrip(';').strip()
+    return normalized.lower()
+
+def _percentile(sorted_samples: List[float], percent: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return None
+    rank = max(1, math.ceil(percent / 100.0 * len(sorted_samples)))
+    return round(sorted_samples[rank - 1], 3)
+
+
+class FingerprintStats:
+    """Running totals and recent latency samples for one query fingerprint"""
+
+    def __init__(self, db_path: str, query_fingerprint: str):
+        self.db_path = db_path
+        self.fingerprint = query_fingerprint
+        self.count = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows_returned = 0
+        self.rows_affected = 0
+        self.vm_steps = 0
+        self.samples: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        return {
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "p50_ms": _percentile(ordered, 50),
+            "p95_ms": _percentile(ordered, 95),
+            "p99_ms": _percentile(ordered, 99),
+            "max_ms": round(self.max_ms, 3),
+            "rows_returned": self.rows_returned,
+            "rows_affected": self.rows_affected,
+            "vm_steps": self.vm_steps,
+        }
+
+
+class QueryStats:
+    """Fingerprint statistics plus a ring buffer of statements above a latency threshold."""
+
+    def __init__(self, slow_query_ms: float = DEFAULT_SLOW_QUERY_MS, slow_log_size: int = SLOW_LOG_SIZE,
+                 max_fingerprints: int = MAX_FINGERPRINTS):
+        self.slow_query_ms = slow_query_ms
+        self.max_fingerprints = max_fingerprints
+        self._fingerprints: "OrderedDict[Tuple[str, str], FingerprintStats]" = OrderedDict()
+        self._slow_log: Deque[Dict[str, Any]] = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+
+    def record(self, db_path: str, query: str, duration_ms: float, rows_returned: int = 0,
+               rows_affected: int = 0, vm_steps: int = 0, error: Optional[str] = None,
+               cached: bool = False):
+        """Record one executed statement, or one read served from the result cache"""
+        key = (db_path, fingerprint(query))
+        with self._lock:
+            stats = self._fingerprints.get(key)
+            if stats is None:
+                stats = FingerprintStats(*key)
+                self._fingerprints[key] = stats
+                if len(self._fingerprints) > self.max_fingerprints:
+                    self._fingerprints.popitem(last=False)
+            else:
+                self._fingerprints.move_to_end(key)
+            stats.count += 1
+            stats.errors += 1 if error else 0
+            stats.cache_hits += 1 if cached else 0
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.rows_returned += rows_returned
+            stats.rows_affected += max(rows_affected, 0)
+            stats.vm_steps += vm_steps
+            stats.samples.append(duration_ms)
+
+            if duration_ms >= self.slow_query_ms:
+                self._slow_log.append({
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "db_path": db_path,
+                    "query": query if len(query) <= 1000 else query[:1000] + "...",
+                    "fingerprint": key[1],
+                    "duration_ms": round(duration_ms, 3),
+                    "rows_returned": rows_returned,
+                    "rows_affected": rows_affected,
+                    "vm_steps": vm_steps,
+                    "error": error,
+                })
+        if duration_ms >= self.slow_query_ms:
+            logger.warning(f"Slow query ({duration_ms:.1f} ms) on {db_path}: {key[1]}")
+
+    def top_fingerprints(self, db_path: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Fingerprint summaries ordered by total time spent"""
+        with self._lock:
+            selected = [s for s in self._fingerprints.values() if db_path is None or s.db_path == db_path]
+            selected.sort(key=lambda s: s.total_ms, reverse=True)
+            return [s.summary() for s in selected[:limit]]
+
+    def slow_queries(self, db_path: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent slow statements, newest first"""
+        with self._lock:
+            entries = [e for e in reversed(self._slow_log) if db_path is None or e["db_path"] == db_path]
+            return entries[:limit]
+
+    def reset(self):
+        """Forget all recorded statistics"""
+        with self._lock:
+            self._fingerprints.clear()
+            self._slow_log.clear()
+
+
+# Shared by the sync and async tools
+query_stats_log = QueryStats(
+    slow_query_ms=float(os.getenv("ASTRA_SQLITE_SLOW_QUERY_MS", str(DEFAULT_SLOW_QUERY_MS)))
+)
@@ -0,0 +1,224 @@
+"""
+Booking spend summaries for the travel database's itineraries.
+
+get_itinerary_summary answers "how much have I spent on this trip" without
+aggregating Bookings on every request. Booking counts and spend are kept per
+itinerary, currency, booking type and status in a small summary table, which
+triggers on Bookings update incrementally on every insert, update and
+delete. Reading an itinerary's summary touches only its few summary rows,
+however many bookings it has. Prices are summed in integer cents so the
+running totals never drift from the bookings they summarize.
+
+refresh_itinerary_summaries checks the summary against Bookings and rebuilds
+it, e.g. after Bookings was loaded with triggers disabled.
+"""
+
+import sqlite3
+import logging
+from typing import Any, Dict, List, Optional
+from google.adk.tools.tool_context import ToolContext
+
+from astra.shared_libraries.sqlite_tools import SqliteDatabase, get_db_instance
+from astra.shared_libraries.sqlite_cache import schema_cache, result_cache
+
+logger = logging.getLogger('astra_sqlite_summaries')
+
+BOOKING_SUMMARY_TABLE = "itinerary_booking_summary"
+# Summary key columns; missing currencies and statuses are summarized as ''
+_KEYS = ("itinerary_id", "currency", "booking_type", "status")
+
+def _key_expressions(row: str) -> List[str]:
+    """The summary key of a Bookings row (new or old in a trigger)"""
+    return [f"{row}.itinerary_id", f"coalesce({row}.currency, '')", f"{row}.booking_type",
+            f"coalesce({row}.status, '')"]
+
+def _key_values(row: str) -> str:
+    return ", ".join(_key_expressions(row))
+
+def _cents(row: str) -> str:
+    return f"CAST(round(coalesce({row}.price, 0) * 100) AS INTEGER)"
+
+def _summary_ddl() -> List[str]:
+    """Statements creating the summary table and the triggers that maintain it"""
+    summary = BOOKING_SUMMARY_TABLE
+    keys = ", ".join(_KEYS)
+    key_match = " AND ".join(f"{key} = {value}" for key, value in zip(_KEYS, _key_expressions("old")))
+    add_new = (
+        f"INSERT INTO {summary} ({keys}, booking_count, total_cents) VALUES ({_key_values('new')}, 1, {_cents('new')}) "
+        f"ON CONFLICT ({keys}) DO UPDATE SET booking_count = booking_count + 1, "
+        f"total_cents = total_cents + excluded.total_cents;"
+    )
+    remove_old = (
+        f"UPDATE {summary} SET booking_count = booking_count - 1, total_cents = total_cents - {_cents('old')} "
+        f"WHERE {key_match}; "
+        f"DELETE FROM {summary} WHERE {key_match} AND booking_count <= 0;"
+    )
+    return [
+        f"CREATE TABLE IF NOT EXISTS {summary} (itinerary_id INTEGER NOT NULL, currency TEXT NOT NULL, "
+        f"booking_type TEXT NOT NULL, status TEXT NOT NULL, booking_count INTEGER NOT NULL, "
+        f"total_cents INTEGER NOT NULL, PRIMARY KEY ({keys})) WITHOUT ROWID",
+        f"CREATE TRIGGER IF NOT EXISTS {summary}_ai AFTER INSERT ON Bookings BEGIN {add_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {summary}_ad AFTER DELETE ON Bookings BEGIN {remove_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {summary}_au AFTER UPDATE OF itinerary_id, currency, booking_type, status, "
+        f"price ON Bookings BEGIN {remove_old} {add_new} END",
+    ]
+
+# The summary computed from scratch, in the summary table's column order
+_EXPECTED = f"""
+    SELECT {_key_values('b')}, count(*), sum({_cents('b')}) FROM Bookings AS b
+    GROUP BY 1, 2, 3, 4
+"""
+
+def rebuild_summaries(db: SqliteDatabase) -> int:
+    """Create the summary table and triggers if missing and recompute it; returns the summary rows"""
+    def rebuild(conn: sqlite3.Connection) -> int:
+        for statement in _summary_ddl():
+            conn.execute(statement)
+        conn.execute(f"DELETE FROM {BOOKING_SUMMARY_TABLE}")
+        return conn.execute(f"INSERT INTO {BOOKING_SUMMARY_TABLE} {_EXPECTED}").rowcount
+
+    rows = db.writer.execute(rebuild)
+    schema_cache.invalidate(db.db_path)
+    logger.info(f"Rebuilt {BOOKING_SUMMARY_TABLE} with {rows} rows")
+    return rows
+
+def ensure_summaries(db: SqliteDatabase):
+    """Build the summary table the first time a database's summaries are read"""
+    tables = db.get_table_names()
+    if "Bookings" not in tables:
+        raise ValueError("The database has no Bookings table; connect to the travel database first")
+    if BOOKING_SUMMARY_TABLE not in tables:
+        rebuild_summaries(db)
+
+def verify_summaries(db: SqliteDatabase) -> int:
+    """Count the summary rows that differ from a fresh aggregation of Bookings"""
+    ensure_summaries(db)
+    actual = f"SELECT {', '.join(_KEYS)}, booking_count, total_cents FROM {BOOKING_SUMMARY_TABLE}"
+    query = f"""
+        SELECT count(*) AS mismatched FROM (
+            SELECT * FROM ({_EXPECTED} EXCEPT {actual})
+            UNION ALL
+            SELECT * FROM ({actual} EXCEPT {_EXPECTED})
+        )
+    """
+    return db.execute_query(query)[0]["mismatched"]
+
+def _add_spend(spend: Dict[str, float], currency: str, cents: int):
+    currency = currency or "unspecified"
+    spend[currency] = round(spend.get(currency, 0) + cents / 100, 2)
+
+def itinerary_summary(db: SqliteDatabase, itinerary_id: int) -> Optional[Dict[str, Any]]:
+    """Booking counts and spend of one itinerary by currency, booking type and status; None if it does not exist"""
+    ensure_summaries(db)
+    use_cache = result_cache.enabled
+    itinerary = db.execute_query(
+        "SELECT itinerary_id, user_id, title, start_date, end_date FROM Itineraries WHERE itinerary_id = :id",
+        {"id": itinerary_id}, use_cache=use_cache
+    )
+    if not itinerary:
+        return None
+    rows = db.execute_query(
+        f"SELECT currency, booking_type, status, booking_count, total_cents FROM {BOOKING_SUMMARY_TABLE} "
+        f"WHERE itinerary_id = :id", {"id": itinerary_id}, use_cache=use_cache
+    )
+
+    # Amounts in different currencies are never added together
+    spend: Dict[str, float] = {}
+    by_type: Dict[str, Dict[str, Any]] = {}
+    by_status: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        _add_spend(spend, row["currency"], row["total_cents"])
+        for groups, key in ((by_type, row["booking_type"]), (by_status, row["status"] or "unspecified")):
+            group = groups.setdefault(key, {"bookings": 0, "spend": {}})
+            group["bookings"] += row["booking_count"]
+            _add_spend(group["spend"], row["currency"], row["total_cents"])
+
+    return {
+        "itinerary": itinerary[0],
+        "booking_count": sum(row["booking_count"] for row in rows),
+        "spend_by_currency": spend,
+        "by_booking_type": by_type,
+        "by_status": by_status,
+    }
+
+def get_itinerary_summary(itinerary_id: int, tool_context: ToolContext) -> dict:
+    """Summarize an itinerary's bookings: how many there are and what they cost.
+
+    Totals are broken down by currency, booking type (flight, hotel, ...) and
+    status, and are kept up to date as bookings change, so this is the
+    quickest way to answer questions about a trip's spending.
+
+    Args:
+        itinerary_id (int): ID of the itinerary in the Itineraries table
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with the itinerary, its booking count, spend per currency and breakdowns by booking type and status
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        summary = itinerary_summary(db, int(itinerary_id))
+        if summary is None:
+            return {
+                "status": "error",
+                "error_message": f"No itinerary with itinerary_id {itinerary_id}"
+            }
+
+        return {
+            "status": "success",
+            **summary
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
+
+def refresh_itinerary_summaries(verify_only: bool, tool_context: ToolContext) -> dict:
+    """Check the itinerary booking summaries against the Bookings table, and rebuild them.
+
+    The summaries follow every change to Bookings by themselves; rebuild them
+    after restoring or bulk-replacing Bookings outside these tools.
+
+    Args:
+        verify_only (bool): True to only report whether the summaries match Bookings, False to rebuild them
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with the number of summary rows that did not match and, after a rebuild, the summary rows written
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        if "Bookings" not in db.get_table_names():
+            return {
+                "status": "error",
+                "error_message": "The database has no Bookings table"
+            }
+
+        mismatched = verify_summaries(db)
+        if verify_only:
+            return {
+                "status": "success",
+                "consistent": mismatched == 0,
+                "mismatched_rows": mismatched
+            }
+
+        rows = rebuild_summaries(db)
+
+        return {
+            "status": "success",
+            "message": f"Rebuilt the itinerary summaries ({rows} rows); {mismatched} rows had not matched Bookings",
+            "mismatched_rows": mismatched,
+            "summary_rows": rows
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
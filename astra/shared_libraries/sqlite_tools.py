@@ -1,60 +1,522 @@
 import os
 import sqlite3
 import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
 from contextlib import closing
 from google.adk.tools.tool_context import ToolContext
 
+from astra.shared_libraries.sqlite_pool import SqliteConnectionPool, DEFAULT_POOL_SIZE, apply_attachments
+from astra.shared_libraries.sqlite_cache import schema_cache, result_cache
+from astra.shared_libraries.sqlite_catalog import table_kinds_query, visible_tables
+from astra.shared_libraries.sqlite_profiles import profile_for_path
+from astra.shared_libraries.sqlite_writer import get_writer
+from astra.shared_libraries.sqlite_stats import query_stats_log
+from astra.shared_libraries.sqlite_analyzer import TRANSACTION, SqlAnalysis, analyze_sql
+from astra.shared_libraries.sqlite_encoding import RESULT_FORMATS, format_results
+from astra.shared_libraries.sqlite_budget import RESULT_TOKEN_BUDGET, ResultBudgeter
+from astra.shared_libraries.sqlite_maintenance import MAINTENANCE_TASKS
+from astra.shared_libraries.sqlite_limits import QueryLimits, QueryTimeout, limits_for_path
+
 logger = logging.getLogger('astra_sqlite_tools')
 
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# Rows fetched per round trip when streaming through a ResultBudgeter
+BUDGET_FETCH_SIZE = 500
+
+# Session state key holding the databases attached with attach_database
+ATTACHED_STATE_KEY = "sqlite_attached"
+
+def quote_identifier(name: str) -> str:
+    """Quote a table or column name for safe use in generated SQL"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+class BatchStatementError(Exception):
+    """Raised when one statement of a transactional batch fails"""
+
+    def __init__(self, index: int, error: Exception):
+        super().__init__(f"Statement {index} failed: {error}")
+        self.index = index
+        self.error = error
+
+def written_tables(analysis: SqlAnalysis) -> Optional[FrozenSet[str]]:
+    """Tables a write changes, or None when that is unknown (schema changes, VACUUM, ...)"""
+    if analysis.schema_change or not analysis.targets_known:
+        return None
+    return analysis.writes
+
+def read_tables(analysis: SqlAnalysis) -> Optional[FrozenSet[str]]:
+    """Tables a read depends on, or None when they could not all be identified"""
+    return analysis.reads if analysis.reads_known else None
+
+def session_attachments(tool_context: ToolContext) -> Dict[str, str]:
+    """Databases the session has attached, as schema alias -> database path"""
+    return dict(tool_context.state.get(ATTACHED_STATE_KEY) or {})
+
+def _elapsed_ms(started: float) -> float:
+    """Milliseconds since a time.perf_counter() reading"""
+    return (time.perf_counter() - started) * 1000
+
+def _counted(conn: sqlite3.Connection, run: Callable[[], Any],
+             limits: Optional[QueryLimits] = None) -> Tuple[Any, int]:
+    """Run a callable on a connection under limits and return its result with the VM steps it took"""
+    counter = getattr(conn, "step_counter", None)
+    if counter is None:
+        return run(), 0
+    before = counter.steps
+    with counter.limited(limits):
+        result = run()
+    return result, counter.steps - before
+
+def _error_response(e: Exception) -> dict:
+    """Tool response for a failed query; timeouts get a structured error the agent can act on"""
+    if isinstance(e, QueryTimeout):
+        return e.response()
+    return {
+        "status": "error",
+        "error_message": f"Database error: {str(e)}"
+    }
+
+def _write_job(query: str, params: Optional[Dict[str, Any]], analysis: SqlAnalysis,
+               limits: QueryLimits) -> Tuple[Callable[[sqlite3.Connection], Tuple[int, int]], bool]:
+    """Writer job running one write statement, and whether it may share a group transaction.
+
+    Writes that also query tables (INSERT ... SELECT, subqueries) run under
+    limits. Interrupting a statement rolls back the whole transaction it is
+    in, so those run alone in autocommit mode where only the statement itself
+    is undone; plain writes keep sharing group commits.
+    """
+    bounded = bool(limits) and (bool(analysis.reads) or not analysis.reads_known)
+
+    def job(conn: sqlite3.Connection) -> Tuple[int, int]:
+        return _counted(conn, lambda: conn.execute(query, params or ()).rowcount, limits if bounded else None)
+    return job, not analysis.autocommit and not bounded
+
+
 class SqliteDatabase:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool_size: int = DEFAULT_POOL_SIZE, profile: Optional[str] = None):
         self.db_path = str(Path(db_path).expanduser())
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.profile = profile or profile_for_path(self.db_path)
+        # All writes go through one writer thread; reads use read-only connections
+        self.writer = get_writer(self.db_path, self.profile)
+        self.pool = SqliteConnectionPool(self.db_path, max_size=pool_size, profile=self.profile,
+                                         read_only=True)
+        self.query_limits = limits_for_path(self.db_path)
         self._init_database()
 
     def _init_database(self):
         """Initialize connection to the SQLite database"""
         logger.debug("Initializing database connection")
-        with closing(sqlite3.connect(self.db_path)) as conn:
-            conn.row_factory = sqlite3.Row
-            conn.close()
+        with self.pool.connection() as conn:
+            conn.execute("SELECT 1")
+
+    def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                      use_cache: bool = False, attached: Optional[Dict[str, str]] = None,
+                      limits: Optional[QueryLimits] = None) -> List[Dict[str, Any]]:
+        """Execute a SQL query synchronously and return results as a list of dictionaries.
 
-    def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Execute a SQL query synchronously and return results as a list of dictionaries"""
+        Reads run with the databases in attached (schema alias -> path) attached.
+        Statements are interrupted with QueryTimeout once they exceed limits
+        (by default the database's query_limits).
+        """
         logger.debug(f"Executing query: {query}")
+        started = time.perf_counter()
+        analysis = analyze_sql(query)
+        limits = limits or self.query_limits
+        # Unqualified names may resolve to an attached database, which the cache does not watch
+        use_cache = use_cache and not attached
         try:
-            with closing(sqlite3.connect(self.db_path)) as conn:
-                conn.row_factory = sqlite3.Row
-                with closing(conn.cursor()) as cursor:
-                    if params:
-                        cursor.execute(query, params)
-                    else:
-                        cursor.execute(query)
+            # Anything not provably read-only goes to the writer
+            if not analysis.read_only:
+                job, transactional = _write_job(query, params, analysis, limits)
+                affected, vm_steps = self.writer.execute(job, transactional=transactional,
+                                                         tables=written_tables(analysis))
+                if analysis.schema_change:
+                    schema_cache.invalidate(self.db_path)
+                logger.debug(f"Write query affected {affected} rows")
+                query_stats_log.record(self.db_path, query, _elapsed_ms(started),
+                                       rows_affected=affected, vm_steps=vm_steps)
+                return [{"affected_rows": affected}]
 
-                    if query.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE', 'CREATE', 'DROP', 'ALTER')):
-                        conn.commit()
-                        affected = cursor.rowcount
-                        logger.debug(f"Write query affected {affected} rows")
-                        return [{"affected_rows": affected}]
+            with self.pool.connection(attached) as conn:
+                if use_cache:
+                    generation = result_cache.check_external(self.writer.db_path, self.writer.data_version())
+                    # None while the writer is busy, when outside changes cannot be ruled out
+                    use_cache = generation is not None
+                if use_cache:
+                    cache_key = result_cache.make_key(self.writer.db_path, query, params)
+                    cached = result_cache.get(cache_key)
+                    if cached is not None:
+                        logger.debug(f"Read query served {len(cached)} rows from cache")
+                        query_stats_log.record(self.db_path, query, _elapsed_ms(started),
+                                               rows_returned=len(cached), cached=True)
+                        return cached
+
+                with closing(conn.cursor()) as cursor:
+                    def run():
+                        if params:
+                            cursor.execute(query, params)
+                        else:
+                            cursor.execute(query)
+                        return [dict(row) for row in cursor.fetchall()]
 
-                    results = [dict(row) for row in cursor.fetchall()]
+                    results, vm_steps = _counted(conn, run, limits)
                     logger.debug(f"Read query returned {len(results)} rows")
+                    query_stats_log.record(self.db_path, query, _elapsed_ms(started),
+                                           rows_returned=len(results), vm_steps=vm_steps)
+                    if use_cache:
+                        result_cache.put(cache_key, results, generation, read_tables(analysis))
                     return results
         except Exception as e:
             logger.error(f"Database error executing query: {e}")
+            query_stats_log.record(self.db_path, query, _elapsed_ms(started), error=str(e))
+            raise
+
+    def execute_budgeted(self, query: str, max_tokens: int, params: Optional[Dict[str, Any]] = None,
+                         use_cache: bool = False, attached: Optional[Dict[str, str]] = None,
+                         limits: Optional[QueryLimits] = None) -> ResultBudgeter:
+        """Stream a read query through a ResultBudgeter, keeping only the rows that fit the budget"""
+        logger.debug(f"Executing budgeted query: {query}")
+        started = time.perf_counter()
+        budgeter = ResultBudgeter(max_tokens)
+        limits = limits or self.query_limits
+        use_cache = use_cache and not attached
+        try:
+            with self.pool.connection(attached) as conn:
+                if use_cache:
+                    generation = result_cache.check_external(self.writer.db_path, self.writer.data_version())
+                    # None while the writer is busy, when outside changes cannot be ruled out
+                    use_cache = generation is not None
+                if use_cache:
+                    cache_key = result_cache.make_key(self.writer.db_path, query, params)
+                    cached = result_cache.get(cache_key)
+                    if cached is not None:
+                        logger.debug(f"Budgeted query served {len(cached)} rows from cache")
+                        query_stats_log.record(self.db_path, query, _elapsed_ms(started),
+                                               rows_returned=len(cached), cached=True)
+                        return budgeter.consume(cached)
+
+                with closing(conn.cursor()) as cursor:
+                    def run():
+                        cursor.execute(query, params or ())
+                        for batch in iter(lambda: cursor.fetchmany(BUDGET_FETCH_SIZE), []):
+                            budgeter.consume(dict(row) for row in batch)
+
+                    _, vm_steps = _counted(conn, run, limits)
+                logger.debug(f"Budgeted query kept {len(budgeter.rows)} of {budgeter.total_rows} rows")
+                query_stats_log.record(self.db_path, query, _elapsed_ms(started),
+                                       rows_returned=budgeter.total_rows, vm_steps=vm_steps)
+                # Only complete results are cached
+                if use_cache and not budgeter.truncated:
+                    result_cache.put(cache_key, budgeter.rows, generation, read_tables(analyze_sql(query)))
+                return budgeter
+        except Exception as e:
+            logger.error(f"Database error executing budgeted query: {e}")
+            query_stats_log.record(self.db_path, query, _elapsed_ms(started), error=str(e))
             raise
 
-# Create a single instance that can be imported and reused
-_db_instance = None
+    def get_table_names(self, include_internal: bool = True) -> List[str]:
+        """Return table names, served from the schema cache while the schema is unchanged.
+
+        With include_internal False, SQLite's own tables, shadow tables of
+        virtual tables and the tools' bookkeeping tables are left out.
+        """
+        with self.pool.connection() as conn:
+            version = conn.execute("PRAGMA schema_version").fetchone()[0]
+            tables = schema_cache.lookup(self.db_path, version, "tables")
+            if tables is None:
+                tables = [(row[0], bool(row[1])) for row in conn.execute(table_kinds_query())]
+                schema_cache.store(self.db_path, version, "tables", tables)
+            return [name for name, _ in tables] if include_internal else visible_tables(tables)
+
+    def get_table_info(self, table_name: str) -> List[Dict[str, Any]]:
+        """Return PRAGMA table_info rows, served from the schema cache while the schema is unchanged"""
+        with self.pool.connection() as conn:
+            version = conn.execute("PRAGMA schema_version").fetchone()[0]
+            columns = schema_cache.lookup(self.db_path, version, ("columns", table_name))
+            if columns is None:
+                columns = [dict(row) for row in conn.execute(f"PRAGMA table_info({table_name})")]
+                schema_cache.store(self.db_path, version, ("columns", table_name), columns)
+            return [dict(column) for column in columns]
+
+    def bulk_insert(self, table: str, columns: List[str], rows: List[Any],
+                    chunk_size: int = BULK_INSERT_CHUNK_SIZE) -> Dict[str, Any]:
+        """Insert many rows with executemany in chunks inside a single write transaction"""
+        logger.debug(f"Bulk inserting {len(rows)} rows into {table}")
+        started = time.perf_counter()
+        # Validate the target columns once for the whole batch
+        table_columns = {column["name"] for column in self.get_table_info(quote_identifier(table))}
+        if not table_columns:
+            raise ValueError(f"Table '{table}' does not exist")
+        unknown = [col for col in columns if col not in table_columns]
+        if unknown:
+            raise ValueError(f"Unknown columns for table '{table}': {', '.join(unknown)}")
+
+        column_list = ", ".join(quote_identifier(col) for col in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"INSERT INTO {quote_identifier(table)} ({column_list}) VALUES ({placeholders})"
+
+        def insert_chunks(conn: sqlite3.Connection) -> Tuple[int, int]:
+            inserted = 0
+            chunks = 0
+            for start in range(0, len(rows), chunk_size):
+                chunk = [
+                    [row[col] for col in columns] if isinstance(row, dict) else row
+                    for row in rows[start:start + chunk_size]
+                ]
+                conn.executemany(sql, chunk)
+                inserted += len(chunk)
+                chunks += 1
+            return inserted, chunks
+
+        # The writer runs the job inside one transaction and rolls it back on failure
+        inserted, chunks = self.writer.execute(insert_chunks, tables=[table])
+
+        elapsed = time.perf_counter() - started
+        logger.debug(f"Bulk insert of {inserted} rows into {table} took {elapsed:.3f}s")
+        return {
+            "inserted_rows": inserted,
+            "chunks": chunks,
+            "elapsed_seconds": round(elapsed, 4),
+            "rows_per_second": round(inserted / elapsed, 1) if elapsed > 0 else None
+        }
+
+    def execute_batch(self, statements: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        """Run an ordered list of (sql, params) writes atomically, rolling back on failure"""
+        logger.debug(f"Executing batch of {len(statements)} statements")
+        started = time.perf_counter()
+
+        analyses = [analyze_sql(sql) for sql, _ in statements]
+
+        def run_statements(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+            results = []
+            for index, (sql, params) in enumerate(statements):
+                try:
+                    cursor = conn.execute(sql, params or ())
+                except Exception as e:
+                    raise BatchStatementError(index, e) from e
+                result = {
+                    "index": index,
+                    "affected_rows": cursor.rowcount
+                }
+                # lastrowid is left over from an earlier insert after anything but a row-adding INSERT/REPLACE
+                if analyses[index].verb in ("INSERT", "REPLACE") and cursor.rowcount > 0:
+                    result["last_insert_rowid"] = cursor.lastrowid
+                results.append(result)
+            return results
+
+        # The writer runs the job inside one transaction and rolls it back on failure
+        written = [written_tables(analysis) for analysis in analyses]
+        tables = None if any(t is None for t in written) else frozenset().union(*written)
+        results = self.writer.execute(run_statements, tables=tables)
+
+        elapsed = time.perf_counter() - started
+        logger.debug(f"Batch of {len(statements)} statements took {elapsed:.3f}s")
+        return {
+            "statements": results,
+            "total_affected_rows": sum(max(r["affected_rows"], 0) for r in results),
+            "elapsed_seconds": round(elapsed, 4)
+        }
+
+    def close(self):
+        """Close all pooled read connections for this database"""
+        self.pool.close()
+
+# One instance (and connection pool) per database path, shared across tool calls
+_db_instances: Dict[str, SqliteDatabase] = {}
+_db_instances_lock = threading.Lock()
+
+def _instance_key(db_path: str) -> str:
+    """Normalize a database path so equivalent paths share one instance"""
+    return os.path.abspath(os.path.expanduser(db_path))
 
 def get_db_instance(db_path: str = "sqlite_db.db") -> SqliteDatabase:
-    """Get or create the database instance"""
-    global _db_instance
-    if _db_instance is None:
-        _db_instance = SqliteDatabase(db_path)
-    return _db_instance
+    """Get or create the database instance for the given path"""
+    key = _instance_key(db_path)
+    with _db_instances_lock:
+        db = _db_instances.get(key)
+        if db is None:
+            db = SqliteDatabase(key)
+            _db_instances[key] = db
+        return db
+
+# Paginated reads hand out one page per tool call. On WAL databases the
+# cursor stays open between calls so later pages resume where the previous
+# one stopped instead of re-running the query
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_OPEN_CURSORS = 16
+CURSOR_TTL_SECONDS = 300
+
+class PagedCursor:
+    """A SELECT whose rows are handed out one page at a time.
+
+    Under WAL, readers never block the writer, so the statement stays open on
+    a dedicated connection and each page continues it with fetchmany. Under a
+    rollback journal an open statement holds a SHARED lock that would make
+    every commit wait out its busy timeout, so each page re-runs the query
+    from the page's offset on a pooled connection and finishes it before
+    returning; rows changed between pages may then shift across pages.
+
+    Each page fetch gets the database's full query limits.
+    """
+
+    def __init__(self, db: SqliteDatabase, query: str, page_size: int,
+                 attached: Optional[Dict[str, str]] = None):
+        self.db_path = db.db_path
+        self.page_size = page_size
+        self.rows_returned = 0
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+        self.limits = db.query_limits
+        self._pool = db.pool
+        self._attached = dict(attached or {})
+        self._cursor: Optional[sqlite3.Cursor] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        with db.pool.connection() as conn:
+            wal = conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+
+        if not wal:
+            self._query = query.rstrip().rstrip(";")
+            # Plain SELECTs are windowed in SQL; anything else (EXPLAIN, PRAGMA) skips rows here
+            self._windowed = analyze_sql(query).verb in ("SELECT", "VALUES")
+            self._offset = 0
+            self._pages = iter(self._read_page, None)
+            self._pending = self._prefetch()
+            return
+
+        # A dedicated connection, so long-lived cursors never starve the pool
+        self._conn = db.pool.open_connection()
+        try:
+            apply_attachments(self._conn, self._attached)
+            with self._conn.step_counter.limited(self.limits):
+                self._cursor = self._conn.execute(query)
+            self.columns = [col[0] for col in self._cursor.description or []]
+            self._pages = self._fetch_pages()
+            self._pending = self._prefetch()
+        except Exception:
+            self.close()
+            raise
+
+    def _fetch_pages(self) -> Iterator[List[Dict[str, Any]]]:
+        """Yield successive pages of rows until the cursor is exhausted"""
+        while True:
+            rows = self._cursor.fetchmany(self.page_size)
+            if not rows:
+                return
+            yield [dict(row) for row in rows]
+
+    def _read_page(self) -> Optional[List[Dict[str, Any]]]:
+        """Run the query for the page at the current offset and close it again; None past the end"""
+        with self._pool.connection(self._attached) as conn:
+            with closing(conn.cursor()) as cursor:
+                def run():
+                    if self._windowed:
+                        cursor.execute(f"SELECT * FROM (\n{self._query}\n) LIMIT ? OFFSET ?",
+                                       (self.page_size, self._offset))
+                    else:
+                        cursor.execute(self._query)
+                        skipped = 0
+                        while skipped < self._offset:
+                            skipped_rows = cursor.fetchmany(min(self._offset - skipped, BUDGET_FETCH_SIZE))
+                            if not skipped_rows:
+                                break
+                            skipped += len(skipped_rows)
+                    return cursor.fetchmany(self.page_size), cursor.description
+
+                (rows, description), _ = _counted(conn, run, self.limits)
+        if self._offset == 0:
+            self.columns = [col[0] for col in description or []]
+        if not rows:
+            return None
+        self._offset += len(rows)
+        return [dict(row) for row in rows]
+
+    def _prefetch(self) -> Optional[List[Dict[str, Any]]]:
+        """Fetch the page after the current one, or None at the end"""
+        if self._conn is None:
+            return next(self._pages, None)
+        with self._conn.step_counter.limited(self.limits):
+            return next(self._pages, None)
+
+    def next_page(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """Return the next page and whether more rows remain after it"""
+        with self.lock:
+            self.last_used = time.monotonic()
+            page = self._pending or []
+            self._pending = self._prefetch()
+            self.rows_returned += len(page)
+            return page, self._pending is not None
+
+    def close(self):
+        """Release the cursor and its connection"""
+        try:
+            if self._cursor is not None:
+                self._cursor.close()
+            if self._conn is not None:
+                self._conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing paged cursor: {e}")
+
+_open_cursors: "OrderedDict[str, PagedCursor]" = OrderedDict()
+_open_cursors_lock = threading.Lock()
+
+def _register_cursor(token: str, paged: PagedCursor):
+    """Store an open cursor under its token, evicting expired and oldest cursors"""
+    evicted = []
+    with _open_cursors_lock:
+        now = time.monotonic()
+        for key, existing in list(_open_cursors.items()):
+            if now - existing.last_used > CURSOR_TTL_SECONDS:
+                evicted.append(_open_cursors.pop(key))
+        while len(_open_cursors) >= MAX_OPEN_CURSORS:
+            evicted.append(_open_cursors.popitem(last=False)[1])
+        _open_cursors[token] = paged
+    for stale in evicted:
+        stale.close()
+
+def _pop_cursor(token: str) -> Optional[PagedCursor]:
+    """Remove and return the cursor for a token, if it exists"""
+    with _open_cursors_lock:
+        return _open_cursors.pop(token, None)
+
+def _page_response(token: str, paged: PagedCursor) -> dict:
+    """Fetch the next page and build the tool response, closing finished cursors"""
+    rows, has_more = paged.next_page()
+    if has_more:
+        _register_cursor(token, paged)
+    else:
+        paged.close()
+    return {
+        "status": "success",
+        "data": rows,
+        "row_count": len(rows),
+        "rows_returned_total": paged.rows_returned,
+        "has_more": has_more,
+        "cursor_token": token if has_more else None
+    }
+
+def _budgeted_response(budgeted: ResultBudgeter, result_format: str) -> dict:
+    """Build a read_query response, adding column summaries when rows were cut to fit the budget"""
+    response = {
+        "status": "success",
+        **format_results(budgeted.rows, result_format)
+    }
+    if budgeted.truncated:
+        response.update({
+            "truncated": True,
+            "total_rows": budgeted.total_rows,
+            "rows_shown": len(budgeted.rows),
+            "column_summaries": budgeted.summaries(),
+            "note": "Result exceeded the token budget; use read_query_paged to page through every row"
+        })
+    return response
 
 def set_db_path(db_path: str, tool_context: ToolContext) -> dict:
     """Set the SQLite database path in the session state.
@@ -111,10 +573,7 @@ def set_db_path(db_path: str, tool_context: ToolContext) -> dict:
             db_instance = get_db_instance(full_path)
             
             # Verify database is accessible by executing a simple query
-            with closing(sqlite3.connect(full_path)) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT 1")
-                cursor.close()
+            db_instance.execute_query("SELECT 1")
                 
             logger.info(f"Database successfully initialized at {full_path}")
         except Exception as e:
@@ -133,7 +592,8 @@ def set_db_path(db_path: str, tool_context: ToolContext) -> dict:
             "status": "success",
             "message": f"Database path set to {full_path}",
             "absolute_path": full_path,
-            "working_directory": working_dir
+            "working_directory": working_dir,
+            "connection_profile": db_instance.profile
         }
     except Exception as e:
         logger.error(f"Unexpected error in set_db_path: {str(e)}")
@@ -230,8 +690,9 @@ def create_table(query: str, tool_context: ToolContext) -> dict:
     db = get_db_instance(db_path)
     
     try:
-        # Validate that this is a CREATE TABLE query
-        if not query.strip().upper().startswith("CREATE TABLE"):
+        # Validate that this is a single CREATE TABLE statement
+        analysis = analyze_sql(query)
+        if len(analysis.statements) != 1 or analysis.verb != "CREATE TABLE":
             return {
                 "status": "error",
                 "error_message": "Only CREATE TABLE statements are allowed"
@@ -266,8 +727,14 @@ def write_query(query: str, tool_context: ToolContext) -> dict:
     db = get_db_instance(db_path)
     
     try:
-        # Validate that this is NOT a SELECT query
-        if query.strip().upper().startswith("SELECT"):
+        # Validate that this is a single statement that writes
+        analysis = analyze_sql(query)
+        if len(analysis.statements) > 1:
+            return {
+                "status": "error",
+                "error_message": "Only one statement can be executed at a time; use execute_batch for several"
+            }
+        if analysis.read_only:
             return {
                 "status": "error",
                 "error_message": "SELECT queries are not allowed for write_query"
@@ -282,18 +749,31 @@ def write_query(query: str, tool_context: ToolContext) -> dict:
             "affected_rows": result[0].get("affected_rows", 0)
         }
     except Exception as e:
-        return {
-            "status": "error",
-            "error_message": f"Database error: {str(e)}"
-        }
+        return _error_response(e)
 
 def read_query(query: str, tool_context: ToolContext) -> dict:
     """Execute a SELECT query on the SQLite database.
+
+    Small results come back as a "data" list of rows and large ones in the
+    columnar format; use read_query_formatted to pick the format.
     
     Args:
         query (str): SELECT SQL query to execute
         tool_context (ToolContext): Context with database configuration
         
+    Returns:
+        dict: Query results with status and data
+    """
+    return read_query_formatted(query, "auto", tool_context)
+
+def read_query_formatted(query: str, result_format: str, tool_context: ToolContext) -> dict:
+    """Execute a SELECT query on the SQLite database and return its results in a chosen format.
+    
+    Args:
+        query (str): SELECT SQL query to execute
+        result_format (str): "rows" for a list of row objects, "columnar" for column names plus row lists, or "auto" to use columnar for large results
+        tool_context (ToolContext): Context with database configuration
+        
     Returns:
         dict: Query results with status and data
     """
@@ -302,20 +782,198 @@ def read_query(query: str, tool_context: ToolContext) -> dict:
     db = get_db_instance(db_path)
     
     try:
-        # Validate that this is a SELECT query
-        if not query.strip().upper().startswith("SELECT"):
+        # Validate that this is a single read-only query
+        analysis = analyze_sql(query)
+        if len(analysis.statements) != 1 or not analysis.read_only:
             return {
                 "status": "error",
                 "error_message": "Only SELECT queries are allowed for read_query"
             }
+        if result_format.strip().lower() not in RESULT_FORMATS:
+            return {
+                "status": "error",
+                "error_message": f"result_format must be one of: {', '.join(RESULT_FORMATS)}"
+            }
         
-        # Execute the query
-        results = db.execute_query(query)
+        # Execute the query within the session's token budget, using the result cache when it is enabled
+        max_tokens = int(tool_context.state.get("sqlite_result_token_budget", RESULT_TOKEN_BUDGET))
+        budgeted = db.execute_budgeted(query, max_tokens, use_cache=result_cache.enabled,
+                                       attached=session_attachments(tool_context))
         
-        # Return the results
+        # Return the results in the requested encoding
+        return _budgeted_response(budgeted, result_format)
+    except Exception as e:
+        return _error_response(e)
+
+def read_query_paged(query: str, page_size: int, tool_context: ToolContext) -> dict:
+    """Execute a SELECT query and return only its first page of rows.
+
+    Use this instead of read_query for queries that may return many rows.
+    When more rows remain, pass the returned cursor_token to fetch_next_page.
+
+    Args:
+        query (str): SELECT SQL query to execute
+        page_size (int): Number of rows per page (capped at 500)
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: First page of rows with has_more and a cursor_token for the next page
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        # Validate that this is a single read-only query
+        analysis = analyze_sql(query)
+        if len(analysis.statements) != 1 or not analysis.read_only:
+            return {
+                "status": "error",
+                "error_message": "Only SELECT queries are allowed for read_query_paged"
+            }
+
+        # Clamp the page size so a single page cannot flood the context
+        page_size = max(1, min(int(page_size or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+
+        # Open the cursor and hand out the first page
+        paged = PagedCursor(db, query, page_size, session_attachments(tool_context))
+        response = _page_response(secrets.token_urlsafe(8), paged)
+        response["columns"] = paged.columns
+        return response
+    except Exception as e:
+        return _error_response(e)
+
+def fetch_next_page(cursor_token: str, tool_context: ToolContext) -> dict:
+    """Fetch the next page of a query started with read_query_paged.
+
+    Args:
+        cursor_token (str): Token returned by the previous page
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Next page of rows with has_more and a cursor_token if rows remain
+    """
+    paged = _pop_cursor(cursor_token)
+    if paged is None:
+        return {
+            "status": "error",
+            "error_message": "Unknown or expired cursor token; run read_query_paged again"
+        }
+
+    try:
+        return _page_response(cursor_token, paged)
+    except Exception as e:
+        paged.close()
+        return _error_response(e)
+
+def bulk_insert(table: str, columns: list, rows: list, tool_context: ToolContext) -> dict:
+    """Insert many rows into a table in a single transaction.
+
+    Use this instead of repeated write_query calls when loading more than a few rows.
+
+    Args:
+        table (str): Name of the table to insert into
+        columns (list): Column names, in the order values appear in each row
+        rows (list): Rows to insert, each a list of values matching columns
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with inserted row count and timing
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        # Validate the shape of the input before touching the database
+        if not columns:
+            return {
+                "status": "error",
+                "error_message": "At least one column is required"
+            }
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict) and len(row) != len(columns):
+                return {
+                    "status": "error",
+                    "error_message": f"Row {index} has {len(row)} values but {len(columns)} columns were given"
+                }
+
+        # Insert all rows in one transaction
+        result = db.bulk_insert(table, list(columns), rows)
+
+        # Return the counts and timing
         return {
             "status": "success",
-            "data": results
+            **result
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
+
+def execute_batch(statements: list, tool_context: ToolContext) -> dict:
+    """Execute an ordered list of write statements in a single transaction.
+
+    Either every statement is applied or, if any statement fails, none are.
+    Each statement is either a SQL string or an object with "sql" and optional
+    "params" (a list for ? placeholders or an object for :name placeholders).
+
+    Args:
+        statements (list): Ordered INSERT, UPDATE, DELETE or DDL statements to run
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with per-statement affected rows and total time
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+    db = get_db_instance(db_path)
+
+    try:
+        # Normalize and validate every statement before starting the transaction
+        if not statements:
+            return {
+                "status": "error",
+                "error_message": "At least one statement is required"
+            }
+        batch = []
+        for index, statement in enumerate(statements):
+            if isinstance(statement, dict):
+                sql, params = statement.get("sql", ""), statement.get("params")
+            else:
+                sql, params = statement, None
+            analysis = analyze_sql(sql)
+            if not analysis.statements:
+                return {
+                    "status": "error",
+                    "error_message": f"Statement {index}: empty statements are not allowed in execute_batch"
+                }
+            if len(analysis.statements) > 1:
+                return {
+                    "status": "error",
+                    "error_message": f"Statement {index}: each entry must hold exactly one statement"
+                }
+            if analysis.read_only or analysis.statements[0].kind == TRANSACTION:
+                return {
+                    "status": "error",
+                    "error_message": f"Statement {index}: {analysis.verb} statements are not allowed in execute_batch"
+                }
+            batch.append((sql, params))
+
+        # Execute all statements atomically
+        result = db.execute_batch(batch)
+
+        # Return per-statement results
+        return {
+            "status": "success",
+            **result
+        }
+    except BatchStatementError as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}. The transaction was rolled back.",
+            "failed_statement_index": e.index
         }
     except Exception as e:
         return {
@@ -337,13 +995,8 @@ def list_tables(tool_context: ToolContext) -> dict:
     db = get_db_instance(db_path)
     
     try:
-        # Execute the query to list tables
-        results = db.execute_query(
-            "SELECT name FROM sqlite_master WHERE type='table'"
-        )
-        
-        # Extract table names from results
-        tables = [row.get("name") for row in results if row.get("name") != "sqlite_sequence"]
+        # Get the data tables, without internal and shadow tables (cached until the schema changes)
+        tables = db.get_table_names(include_internal=False)
         
         # Return the table list
         return {
@@ -371,8 +1024,8 @@ def describe_table(table_name: str, tool_context: ToolContext) -> dict:
     db = get_db_instance(db_path)
     
     try:
-        # Execute the query to get table schema
-        results = db.execute_query(f"PRAGMA table_info({table_name})")
+        # Get table schema (cached until the schema changes)
+        results = db.get_table_info(table_name)
         
         # If no results, table might not exist
         if not results:
@@ -390,4 +1043,73 @@ def describe_table(table_name: str, tool_context: ToolContext) -> dict:
         return {
             "status": "error",
             "error_message": f"Database error: {str(e)}"
-        } 
\ No newline at end of file
+        }
+
+
+def query_stats(tool_context: ToolContext) -> dict:
+    """Report per-query timing statistics, recent slow queries and cache/writer counters.
+
+    Args:
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Top query fingerprints by total time, slow query log and cache and writer statistics
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+
+    try:
+        db_instance = get_db_instance(db_path)
+        return {
+            "status": "success",
+            "db_path": db_instance.db_path,
+            "slow_query_threshold_ms": query_stats_log.slow_query_ms,
+            "top_queries": query_stats_log.top_fingerprints(db_instance.db_path, 20),
+            "slow_queries": query_stats_log.slow_queries(db_instance.db_path, 20),
+            "result_cache": result_cache.stats(),
+            "writer": db_instance.writer.stats()
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
+
+def run_maintenance(task: str, tool_context: ToolContext) -> dict:
+    """Run a database maintenance task now instead of waiting for the background schedule.
+
+    The task runs on the writer's connection between other writes and stops
+    when its time budget is spent; a vacuum that could not finish within its
+    budget is skipped and says why.
+
+    Args:
+        task (str): "optimize" (PRAGMA optimize), "analyze" (refresh planner statistics) or "vacuum" (reclaim free space)
+        tool_context (ToolContext): Context with database configuration
+
+    Returns:
+        dict: Operation result with the task's duration and the file size and planner statistics before and after
+    """
+    # Get the database path from context or use default
+    db_path = tool_context.state.get("sqlite_db_path", "sqlite_db.db")
+
+    if task not in MAINTENANCE_TASKS:
+        return {
+            "status": "error",
+            "error_message": f"Unknown task '{task}', expected one of {', '.join(MAINTENANCE_TASKS)}"
+        }
+
+    try:
+        db_instance = get_db_instance(db_path)
+        maintenance = db_instance.writer.maintenance
+        # Maintenance manages its own transactions and leaves table contents alone
+        record = db_instance.writer.execute(lambda conn: maintenance.run(conn, task),
+                                            transactional=False, tables=[])
+        return {
+            "status": "success",
+            **record
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Database error: {str(e)}"
+        }
@@ -0,0 +1,288 @@
+"""
+Single-writer queue for the shared SQLite tools.
+
+SQLite allows one writer at a time, so instead of letting every tool call
+fight over the write lock (and fail with "database is locked"), each database
+gets one writer thread that drains a queue of write jobs in order. Jobs that
+arrive together are group-committed in a single transaction, each inside its
+own savepoint so a failing job only rolls back its own changes. Reads go to
+read-only connections and are never blocked by the queue.
+
+After each commit the writer drops the cached read results that the committed
+jobs may have changed: only those reading the tables the jobs declared (plus
+tables reached through triggers, cascading foreign keys and views), or all of
+them for jobs that did not declare their tables.
+
+When no writes have arrived for a while the writer runs due maintenance
+(PRAGMA optimize, ANALYZE, vacuuming) on its connection; see
+sqlite_maintenance.
+"""
+
+import os
+import queue
+import sqlite3
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from astra.shared_libraries.sqlite_pool import PooledConnection, DEFAULT_POOL_TIMEOUT, install_step_counter
+from astra.shared_libraries.sqlite_profiles import DEFAULT_PROFILE, profile_pragma_statements
+from astra.shared_libraries.sqlite_cache import schema_cache, result_cache
+from astra.shared_libraries.sqlite_analyzer import table_dependencies, expand_writes
+from astra.shared_libraries.sqlite_maintenance import DatabaseMaintenance, MAINTENANCE_IDLE_SECONDS
+
+logger = logging.getLogger('astra_sqlite_writer')
+
+DEFAULT_MAX_GROUP_SIZE = 64
+
+WriteJob = Callable[[sqlite3.Connection], Any]
+# (job, future, transactional, tables written or None if unknown)
+QueuedJob = Tuple[WriteJob, Future, bool, Optional[FrozenSet[str]]]
+
+
+class SqliteWriter:
+    """Dedicated writer thread that serializes and group-commits writes to one database."""
+
+    def __init__(self, db_path: str, profile: str = DEFAULT_PROFILE,
+                 max_group_size: int = DEFAULT_MAX_GROUP_SIZE, timeout: float = DEFAULT_POOL_TIMEOUT):
+        self.db_path = db_path
+        self.profile = profile
+        self.max_group_size = max_group_size
+        # Autocommit mode: the writer issues BEGIN/COMMIT itself
+        self._conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False,
+                                     isolation_level=None, factory=PooledConnection)
+        self._conn.row_factory = sqlite3.Row
+        install_step_counter(self._conn)
+        for statement in profile_pragma_statements(profile):
+            try:
+                self._conn.execute(statement)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not apply '{statement}' to {db_path}: {e}")
+        # Held while the writer thread uses the connection, so data_version probes from
+        # other threads never land inside a job's transaction or a maintenance task
+        self._conn_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[QueuedJob]]" = queue.Queue()
+        self.maintenance = DatabaseMaintenance(db_path)
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.groups_committed = 0
+        self._thread = threading.Thread(
+            target=self._run, name=f"sqlite-writer-{os.path.basename(db_path)}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, job: WriteJob, transactional: bool = True,
+               tables: Optional[Iterable[str]] = None) -> Future:
+        """Queue a write job and return a future for its result.
+
+        The job receives the writer's connection and must not commit or roll
+        back itself. Non-transactional jobs (e.g. VACUUM) run on their own,
+        outside any transaction. tables names the tables the job writes;
+        None means unknown, which drops every cached result for the database.
+        """
+        future: Future = Future()
+        written = frozenset(table.lower() for table in tables) if tables is not None else None
+        self._queue.put((job, future, transactional, written))
+        return future
+
+    def execute(self, job: WriteJob, transactional: bool = True,
+                tables: Optional[Iterable[str]] = None) -> Any:
+        """Queue a write job and wait for its result"""
+        return self.submit(job, transactional, tables).result()
+
+    def data_version(self) -> Optional[int]:
+        """PRAGMA data_version of the writer's connection, or None while the writer is using it.
+
+        It only changes when a connection other than the writer commits, so it
+        tells callers whether the database was changed from outside. Safe to
+        call from any thread: the probe never waits for the writer and never
+        runs while a job or maintenance task holds the connection, so it cannot
+        see their open transaction or be caught by their limits or interrupts.
+        """
+        if not self._conn_lock.acquire(blocking=False):
+            return None
+        try:
+            # Far fewer VM steps than PROGRESS_INTERVAL, so the step counter never runs for it
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+        finally:
+            self._conn_lock.release()
+
+    def _run(self):
+        """Drain the queue, grouping waiting jobs into shared transactions"""
+        stopping = False
+        while not stopping:
+            item = self._next_job()
+            if item is None:
+                break
+            group = [item]
+            while item[2] and len(group) < self.max_group_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                if not item[2]:
+                    # Run the transactional group first, then this job alone
+                    self._run_group(group)
+                    group = [item]
+                    break
+                group.append(item)
+            if group[0][2]:
+                self._run_group(group)
+            else:
+                self._run_alone(group[0])
+        self._maintain(self.maintenance.optimize)
+        with self._conn_lock:
+            self._conn.close()
+
+    def _next_job(self) -> Optional[QueuedJob]:
+        """Wait for the next job, running due maintenance whenever the queue stays empty"""
+        if MAINTENANCE_IDLE_SECONDS <= 0:
+            return self._queue.get()
+        while True:
+            try:
+                return self._queue.get(timeout=MAINTENANCE_IDLE_SECONDS)
+            except queue.Empty:
+                self._maintain(self.maintenance.idle)
+
+    def _maintain(self, task: Callable[[sqlite3.Connection], Any]):
+        try:
+            with self._conn_lock:
+                task(self._conn)
+        except Exception as e:
+            logger.warning(f"Maintenance of {self.db_path} failed: {e}")
+
+    def _run_alone(self, item: QueuedJob):
+        """Run a job outside any transaction"""
+        job, future, _, tables = item
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            with self._conn_lock:
+                result = job(self._conn)
+        except BaseException as e:
+            self.jobs_failed += 1
+            self._invalidate_results([tables])
+            future.set_exception(e)
+            return
+        self.jobs_completed += 1
+        self._invalidate_results([tables])
+        future.set_result(result)
+
+    def _run_group(self, group: List[QueuedJob]):
+        """Run jobs in one transaction with a savepoint each, then commit once"""
+        with self._conn_lock:
+            self._run_group_locked(group)
+
+    def _run_group_locked(self, group: List[QueuedJob]):
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            for _, future, _, _ in group:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+            self.jobs_failed += len(group)
+            return
+
+        done: List[Tuple[Future, Any]] = []
+        written: List[Optional[FrozenSet[str]]] = []
+        for job, future, _, tables in group:
+            if not future.set_running_or_notify_cancel():
+                continue
+            self._conn.execute("SAVEPOINT write_job")
+            try:
+                result = job(self._conn)
+                self._conn.execute("RELEASE write_job")
+                done.append((future, result))
+                written.append(tables)
+            except BaseException as e:
+                self.jobs_failed += 1
+                future.set_exception(e)
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK TO write_job")
+                    self._conn.execute("RELEASE write_job")
+                else:
+                    # SQLite rolled back the whole transaction on its own
+                    # (e.g. disk full), so earlier jobs in the group are lost
+                    for lost, _ in done:
+                        lost.set_exception(e)
+                    self.jobs_failed += len(done)
+                    done = []
+                    written = []
+                    self._conn.execute("BEGIN IMMEDIATE")
+
+        try:
+            self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            for future, _ in done:
+                future.set_exception(e)
+            self.jobs_failed += len(done)
+            return
+
+        self.groups_committed += 1
+        self.jobs_completed += len(done)
+        # Before resolving the futures, so callers never see stale cached reads
+        self._invalidate_results(written)
+        for future, result in done:
+            future.set_result(result)
+        if len(done) > 1:
+            logger.debug(f"Group-committed {len(done)} writes to {self.db_path}")
+
+    def _invalidate_results(self, written: List[Optional[FrozenSet[str]]]):
+        """Drop cached results the committed jobs may have changed"""
+        if not result_cache.enabled or not written:
+            return
+        try:
+            if any(tables is None for tables in written):
+                result_cache.invalidate(self.db_path)
+                return
+            tables: Set[str] = set().union(*written)
+            if tables:
+                result_cache.invalidate_tables(self.db_path, self._expand_writes(tables))
+        except sqlite3.Error as e:
+            logger.warning(f"Could not work out tables changed in {self.db_path}, dropping all cached results: {e}")
+            result_cache.invalidate(self.db_path)
+
+    def _expand_writes(self, tables: Set[str]) -> Set[str]:
+        """Add the tables and views reached from tables through triggers, cascades and views"""
+        version = self._conn.execute("PRAGMA schema_version").fetchone()[0]
+        dependencies = schema_cache.lookup(self.db_path, version, "write_dependencies")
+        if dependencies is None:
+            dependencies = table_dependencies(self._conn)
+            schema_cache.store(self.db_path, version, "write_dependencies", dependencies)
+        return expand_writes(dependencies, tables)
+
+    def close(self):
+        """Stop the writer after the jobs already queued have run"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> dict:
+        """Return queue depth and job counters"""
+        return {
+            "db_path": self.db_path,
+            "queued_jobs": self._queue.qsize(),
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "groups_committed": self.groups_committed,
+            "maintenance": self.maintenance.stats(self._conn.total_changes),
+        }
+
+# One writer per database path, shared by the sync and async tools
+_writers: Dict[str, SqliteWriter] = {}
+_writers_lock = threading.Lock()
+
+def get_writer(db_path: str, profile: str = DEFAULT_PROFILE) -> SqliteWriter:
+    """Get or start the writer for a database path"""
+    key = os.path.abspath(os.path.expanduser(db_path))
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = SqliteWriter(key, profile)
+            _writers[key] = writer
+        return writer
@@ -22,16 +22,27 @@ from google.adk.tools.agent_tool import AgentTool
 
 from astra.travel_agent.prompt import TRAVEL_AGENT_INSTR
 from astra.weather_agent.agent import weather_agent
-from astra.shared_libraries.sqlite_tools import (
+# All SQLite tools are async so none of them blocks the event loop
+from astra.shared_libraries.async_sqlite_tools import (
     set_db_path,
     create_database,
     create_table,
     write_query,
     read_query,
+    read_query_formatted,
+    read_query_paged,
+    fetch_next_page,
+    bulk_insert,
+    execute_batch,
     list_tables,
-    describe_table
+    describe_table,
+    search_destinations,
+    nearby_destinations,
+    get_itinerary_summary,
+    changes_since,
+    attach_database,
+    detach_database
 )
-
 from astra.shared_libraries.search_web import search_web
 from .tools import get_weather_stateful, set_temperature_unit, get_travel_database_info
 
@@ -93,8 +104,19 @@ travel_concierge_agent = Agent(
         create_table,
         write_query,
         read_query,
+        read_query_formatted,
+        read_query_paged,
+        fetch_next_page,
+        bulk_insert,
+        execute_batch,
         list_tables,
         describe_table,
+        search_destinations,
+        nearby_destinations,
+        get_itinerary_summary,
+        changes_since,
+        attach_database,
+        detach_database,
         get_weather_stateful,
         set_temperature_unit,
         get_travel_database_info
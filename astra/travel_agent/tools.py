@@ -14,19 +14,20 @@
 
 import os
 import requests
-import json
 import time
-from pathlib import Path
 from google.adk.tools.tool_context import ToolContext
 
+from astra.shared_libraries.sqlite_catalog import database_catalog
+
 # In-memory cache for geocoding results to avoid repeated API calls
 geocoding_cache = {}
 
 def get_travel_database_info(tool_context: ToolContext) -> dict:
     """Get information about the Astra travel agency database.
     
-    This function reads the database catalog, finds the travel agency database,
-    sets up a connection to it, and returns details about the database schema.
+    This function looks up the travel agency database in the shared database
+    catalog, sets up a connection to it, and returns details about the
+    database schema, including live table row estimates.
     
     Args:
         tool_context (ToolContext): The tool context for storing connection information
@@ -35,24 +36,14 @@ def get_travel_database_info(tool_context: ToolContext) -> dict:
         dict: Information about the travel database including path and tables
     """
     try:
-        # Locate and load the database catalog
-        catalog_path = Path(__file__).parent.parent / "db_manager_agent" / "databases.json"
-        
-        if not catalog_path.exists():
+        # Look up the travel agency database in the shared catalog
+        if not database_catalog.path.exists():
             return {
                 "status": "error",
                 "error_message": "Database catalog not found"
             }
             
-        with open(catalog_path, 'r') as f:
-            catalog_data = json.load(f)
-            
-        # Find the travel agency database
-        travel_db = None
-        for db in catalog_data.get("database_catalog", {}).get("databases", []):
-            if db.get("name") == "Astra_travel_agency":
-                travel_db = db
-                break
+        travel_db = database_catalog.get("Astra_travel_agency")
                 
         if not travel_db:
             return {
@@ -71,6 +62,19 @@ def get_travel_database_info(tool_context: ToolContext) -> dict:
         # Set the database path in the tool context
         tool_context.state["sqlite_db_path"] = db_path
         
+        # Prefer the live table list and row estimates over the catalog's
+        tables = travel_db.get("tables", [])
+        row_estimates = ""
+        file_size = 0
+        try:
+            stats = database_catalog.stats(travel_db["name"])
+            if stats.get("exists"):
+                tables = stats["tables"]
+                row_estimates = ", ".join(f"{table}: {rows}" for table, rows in stats["row_estimates"].items())
+                file_size = stats["file_size_bytes"]
+        except Exception:
+            pass
+        
         # Return database information - ensure all values are simple types
         return {
             "status": "success",
@@ -78,7 +82,9 @@ def get_travel_database_info(tool_context: ToolContext) -> dict:
             "name": travel_db.get("name", ""),
             "description": travel_db.get("description", ""),
             "path": db_path,
-            "tables": ", ".join(travel_db.get("tables", [])),
+            "tables": ", ".join(tables),
+            "row_estimates": row_estimates,
+            "file_size_bytes": file_size,
             "type": travel_db.get("type", "")
         }
         
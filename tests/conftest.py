@@ -0,0 +1,37 @@
+"""Shared fixtures for the SQLite tool tests"""
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from astra.shared_libraries.sqlite_tools import get_db_instance
+from astra.shared_libraries.sqlite_cache import result_cache
+
+
+class StateContext:
+    """Stands in for ToolContext: the tools only read and write its state"""
+
+    def __init__(self, state: dict):
+        self.state = state
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    return str(tmp_path / "test.db")
+
+
+@pytest.fixture
+def tool_context(db_path) -> StateContext:
+    return StateContext({"sqlite_db_path": db_path})
+
+
+@pytest.fixture
+def db(db_path):
+    return get_db_instance(db_path)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """The result cache, switched on for the test"""
+    monkeypatch.setattr(result_cache, "enabled", True)
+    return result_cache
@@ -0,0 +1,56 @@
+"""Async variants of the SQLite tools"""
+
+import asyncio
+import inspect
+import time
+
+from astra.shared_libraries import async_sqlite_tools, sqlite_tools
+from astra.shared_libraries.async_sqlite_tools import in_thread
+
+
+def test_thread_variants_keep_the_tool_description():
+    variant = async_sqlite_tools.bulk_insert
+
+    assert inspect.iscoroutinefunction(variant)
+    assert variant.__name__ == "bulk_insert"
+    assert variant.__doc__ == sqlite_tools.bulk_insert.__doc__
+    assert list(inspect.signature(variant).parameters) == ["table", "columns", "rows", "tool_context"]
+
+
+def test_thread_variant_does_not_block_event_loop():
+    def slow_tool(tool_context) -> dict:
+        time.sleep(0.3)
+        return {"status": "success"}
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        result = await in_thread(slow_tool)(None)
+        ticker.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(run())
+    assert result == {"status": "success"}
+    assert ticks >= 10
+
+
+def test_async_tools_share_the_database(tool_context):
+    async def run():
+        await async_sqlite_tools.create_table("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)", tool_context)
+        inserted = await async_sqlite_tools.bulk_insert("t", ["v"], [["a"], ["b"], ["c"]], tool_context)
+        batch = await async_sqlite_tools.execute_batch(["UPDATE t SET v = 'z' WHERE id = 1"], tool_context)
+        page = await async_sqlite_tools.read_query_paged("SELECT v FROM t ORDER BY id", 2, tool_context)
+        rest = await async_sqlite_tools.fetch_next_page(page["cursor_token"], tool_context)
+        return inserted, batch, page, rest
+
+    inserted, batch, page, rest = asyncio.run(run())
+    assert inserted["status"] == batch["status"] == "success"
+    assert [row["v"] for row in page["data"] + rest["data"]] == ["z", "b", "c"]
+    assert not rest["has_more"]
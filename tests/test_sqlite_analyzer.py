@@ -0,0 +1,84 @@
+"""SQL statement classification and table tracking"""
+
+import sqlite3
+
+import pytest
+
+from astra.shared_libraries.sqlite_analyzer import (
+    analyze_sql, expand_writes, table_dependencies, table_references, trigger_effects
+)
+
+
+@pytest.mark.parametrize("sql, read_only, verb", [
+    ("SELECT * FROM t", True, "SELECT"),
+    ("  -- comment\n/* block */ select 1", True, "SELECT"),
+    ("WITH w AS (SELECT * FROM t) SELECT * FROM w", True, "SELECT"),
+    ("WITH w AS (SELECT 1) INSERT INTO t SELECT * FROM w", False, "INSERT"),
+    ("REPLACE INTO t VALUES (1)", False, "REPLACE"),
+    ("EXPLAIN QUERY PLAN SELECT * FROM t", True, "EXPLAIN"),
+    ("PRAGMA table_info(t)", True, "PRAGMA"),
+    ("PRAGMA foreign_keys = ON", False, "PRAGMA"),
+    ("PRAGMA optimize", False, "PRAGMA"),
+    ("SELECT 1; DELETE FROM t", False, "SELECT"),
+    ("SELECT 'DELETE FROM t'", True, "SELECT"),
+    ("VACUUM", False, "VACUUM"),
+    ("", False, None),
+])
+def test_classifies_statements(sql, read_only, verb):
+    analysis = analyze_sql(sql)
+
+    assert analysis.read_only is read_only
+    assert analysis.verb == verb
+
+
+@pytest.mark.parametrize("sql, reads", [
+    ("SELECT * FROM a, b AS bb, main.c", {"a", "b", "c"}),
+    ("SELECT count(*) FROM a JOIN b ON a.x = b.x, c", {"a", "b", "c"}),
+    ("SELECT * FROM a LEFT JOIN b USING (x), c WHERE c.y = 1", {"a", "b", "c"}),
+    ("SELECT * FROM a JOIN b ON a.x IN (SELECT y FROM d) JOIN c ON c.z = b.z", {"a", "b", "c", "d"}),
+    ("SELECT * FROM a INDEXED BY a_x, b NOT INDEXED", {"a", "b"}),
+    ("SELECT * FROM (SELECT * FROM t) AS sub, u ORDER BY 1", {"t", "u"}),
+    ("WITH w AS (SELECT * FROM t) SELECT * FROM w JOIN u ON 1", {"t", "u"}),
+    ("SELECT * FROM a WHERE x IS NOT DISTINCT FROM y", {"a"}),
+    ("SELECT * FROM json_each('[1]')", set()),
+    ('SELECT * FROM "Odd ""Name"""', {'odd "name"'}),
+])
+def test_finds_tables_read(sql, reads):
+    analysis = analyze_sql(sql)
+
+    assert analysis.reads == reads
+    assert analysis.reads_known
+
+
+def test_unparsed_table_list_marks_reads_unknown():
+    assert not analyze_sql("SELECT * FROM a b c").reads_known
+
+
+def test_writes_name_their_target_and_reads():
+    analysis = analyze_sql("INSERT OR IGNORE INTO t (x) SELECT x FROM s WHERE x IN (SELECT x FROM u)")
+
+    assert analysis.writes == {"t"}
+    assert analysis.reads == {"s", "u"}
+    assert analysis.targets_known
+
+
+def test_update_from_references_include_aliases():
+    references = table_references("UPDATE Bookings SET price = 0 FROM Itineraries AS i WHERE i.itinerary_id = 1")
+
+    assert references == {"bookings": "Bookings", "itineraries": "Itineraries", "i": "Itineraries"}
+
+
+def test_trigger_effects_and_dependencies():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript("""
+        CREATE TABLE parent (id INTEGER PRIMARY KEY);
+        CREATE TABLE child (id INTEGER PRIMARY KEY, parent_id INTEGER REFERENCES parent(id) ON DELETE CASCADE);
+        CREATE TABLE audit (what TEXT);
+        CREATE TRIGGER child_audit AFTER INSERT ON child BEGIN INSERT INTO audit VALUES ('child'); END;
+        CREATE VIEW child_counts AS SELECT parent_id, count(*) FROM child GROUP BY parent_id;
+    """)
+    target, writes = trigger_effects(
+        "CREATE TRIGGER child_audit AFTER INSERT ON child BEGIN INSERT INTO audit VALUES ('child'); END")
+
+    assert (target, writes) == ("child", frozenset({"audit"}))
+    assert expand_writes(table_dependencies(conn), ["parent"]) == {"parent", "child", "audit", "child_counts"}
@@ -0,0 +1,77 @@
+"""Attaching other databases for cross-database queries"""
+
+import sqlite3
+
+import pytest
+
+from astra.shared_libraries import sqlite_tools
+from astra.shared_libraries.sqlite_attach import MAX_ATTACHED_DATABASES, attach_database, detach_database
+
+
+@pytest.fixture
+def travel_path(tmp_path):
+    path = str(tmp_path / "travel.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE Itineraries (itinerary_id INTEGER PRIMARY KEY, user_id INTEGER);
+        CREATE TABLE Bookings (booking_id INTEGER PRIMARY KEY, itinerary_id INTEGER, kind TEXT);
+        INSERT INTO Itineraries VALUES (10, 1), (11, 2);
+        INSERT INTO Bookings VALUES (100, 10, 'hotel'), (101, 10, 'flight'), (102, 11, 'hotel');
+    """)
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def users(db):
+    db.execute_query("CREATE TABLE Users (user_id INTEGER PRIMARY KEY, name TEXT)")
+    db.execute_query("INSERT INTO Users VALUES (1, 'Ana'), (2, 'Bo')")
+    return db
+
+
+def test_attached_tables_join_with_the_current_database(users, travel_path, tool_context):
+    result = attach_database(travel_path, "travel", tool_context)
+    assert result["status"] == "success", result
+    assert result["tables"] == "Bookings, Itineraries"
+
+    rows = sqlite_tools.read_query("""
+        SELECT u.name, b.kind FROM main.Users u
+        JOIN travel.Itineraries i ON i.user_id = u.user_id
+        JOIN travel.Bookings b ON b.itinerary_id = i.itinerary_id
+        ORDER BY b.booking_id
+    """, tool_context)
+
+    assert rows["status"] == "success", rows
+    assert [(row["name"], row["kind"]) for row in rows["data"]] == [("Ana", "hotel"), ("Ana", "flight"), ("Bo", "hotel")]
+
+
+def test_attached_databases_are_read_only(users, travel_path, tool_context):
+    attach_database(travel_path, "travel", tool_context)
+    with users.pool.connection(sqlite_tools.session_attachments(tool_context)) as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM travel.Bookings")
+
+
+def test_detached_databases_are_no_longer_queryable(users, travel_path, tool_context):
+    attach_database(travel_path, "travel", tool_context)
+    assert detach_database("travel", tool_context)["status"] == "success"
+
+    result = sqlite_tools.read_query("SELECT * FROM travel.Bookings", tool_context)
+
+    assert result["status"] == "error"
+    assert detach_database("travel", tool_context)["status"] == "error"
+
+
+def test_attach_rejects_bad_aliases_and_missing_files(users, travel_path, tmp_path, tool_context):
+    assert attach_database(travel_path, "main", tool_context)["status"] == "error"
+    assert attach_database(travel_path, "no-dashes", tool_context)["status"] == "error"
+    assert attach_database(str(tmp_path / "missing.db"), "gone", tool_context)["status"] == "error"
+
+
+def test_attach_limits_the_number_of_databases(users, travel_path, tool_context):
+    for n in range(MAX_ATTACHED_DATABASES):
+        assert attach_database(travel_path, f"db{n}", tool_context)["status"] == "success"
+
+    assert attach_database(travel_path, "one_more", tool_context)["status"] == "error"
+    # Re-attaching under an existing alias does not count against the limit
+    assert attach_database(travel_path, "db0", tool_context)["status"] == "success"
@@ -0,0 +1,74 @@
+"""Transactional statement batches"""
+
+import pytest
+
+from astra.shared_libraries.sqlite_tools import execute_batch
+
+
+@pytest.fixture
+def table(db):
+    db.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT UNIQUE)")
+    return db
+
+
+def _values(db):
+    return [row["v"] for row in db.execute_query("SELECT v FROM t ORDER BY id")]
+
+
+def test_batch_applies_every_statement(table, tool_context):
+    result = execute_batch([
+        "INSERT INTO t (v) VALUES ('a')",
+        {"sql": "INSERT INTO t (v) VALUES (?)", "params": ["b"]},
+        {"sql": "UPDATE t SET v = :v WHERE id = 1", "params": {"v": "z"}},
+        "DELETE FROM t WHERE v = 'missing'",
+    ], tool_context)
+
+    assert result["status"] == "success", result
+    assert [s["affected_rows"] for s in result["statements"]] == [1, 1, 1, 0]
+    assert result["total_affected_rows"] == 3
+    assert _values(table) == ["z", "b"]
+
+
+def test_last_insert_rowid_only_for_inserts_that_added_rows(table, tool_context):
+    result = execute_batch([
+        "INSERT INTO t (v) VALUES ('a')",
+        "INSERT OR IGNORE INTO t (v) VALUES ('a')",
+        "UPDATE t SET v = 'b'",
+        "REPLACE INTO t (id, v) VALUES (5, 'c')",
+    ], tool_context)
+
+    statements = result["statements"]
+    assert statements[0]["last_insert_rowid"] == 1
+    assert "last_insert_rowid" not in statements[1]
+    assert "last_insert_rowid" not in statements[2]
+    assert statements[3]["last_insert_rowid"] == 5
+
+
+def test_failing_statement_rolls_back_the_batch(table, tool_context):
+    table.execute_query("INSERT INTO t (v) VALUES ('existing')")
+
+    result = execute_batch([
+        "INSERT INTO t (v) VALUES ('a')",
+        "INSERT INTO t (v) VALUES ('existing')",
+        "INSERT INTO t (v) VALUES ('c')",
+    ], tool_context)
+
+    assert result["status"] == "error"
+    assert result["failed_statement_index"] == 1
+    assert "rolled back" in result["error_message"]
+    assert _values(table) == ["existing"]
+
+
+@pytest.mark.parametrize("statements, message", [
+    ([], "At least one statement"),
+    (["SELECT * FROM t"], "SELECT statements are not allowed"),
+    (["BEGIN"], "BEGIN statements are not allowed"),
+    (["INSERT INTO t (v) VALUES ('a'); DELETE FROM t"], "exactly one statement"),
+    (["  -- nothing\n"], "empty statements"),
+])
+def test_invalid_batches_are_rejected_before_running(table, tool_context, statements, message):
+    result = execute_batch(statements, tool_context)
+
+    assert result["status"] == "error"
+    assert message in result["error_message"]
+    assert _values(table) == []
@@ -0,0 +1,62 @@
+"""Token-budgeted results and their column summaries"""
+
+from astra.shared_libraries import sqlite_tools
+from astra.shared_libraries.sqlite_budget import DISTINCT_SKETCH_SIZE, ColumnSummary, ResultBudgeter, estimate_tokens
+
+
+def test_budgeter_keeps_rows_that_fit_and_summarizes_all():
+    rows = [{"id": n, "city": "Lisbon" if n % 4 else "Porto"} for n in range(100)]
+    budget = estimate_tokens(rows[0]) * 10
+
+    budgeted = ResultBudgeter(budget).consume(rows)
+
+    assert budgeted.truncated
+    assert budgeted.total_rows == 100
+    assert 0 < len(budgeted.rows) <= 10
+    assert budgeted.rows == rows[:len(budgeted.rows)]
+    ids, cities = budgeted.summaries()
+    assert (ids["count"], ids["min"], ids["max"], ids["distinct"]) == (100, 0, 99, 100)
+    assert cities["top_values"] == [{"value": "Lisbon", "count": 75}, {"value": "Porto", "count": 25}]
+
+
+def test_budgeter_keeps_everything_under_budget():
+    budgeted = ResultBudgeter(1000).consume([{"id": 1}, {"id": 2}])
+
+    assert not budgeted.truncated
+    assert len(budgeted.rows) == 2
+
+
+def test_summary_orders_numbers_before_text_and_counts_nulls():
+    summary = ColumnSummary("mixed")
+    for value in [5, "a", None, 2, "b" * 200, b"\x00\x01"]:
+        summary.add(value)
+
+    result = summary.summary()
+    assert (result["count"], result["nulls"], result["min"]) == (6, 1, 2)
+    assert result["max"] == "b" * 100 + "..."
+
+
+def test_distinct_count_is_estimated_past_the_sketch_size():
+    summary = ColumnSummary("id")
+    total = DISTINCT_SKETCH_SIZE * 20
+    for value in range(total):
+        summary.add(value)
+
+    result = summary.summary()
+    assert result["distinct_is_estimate"]
+    assert abs(result["distinct"] - total) < total * 0.15
+    assert not result["top_counts_are_exact"]
+
+
+def test_read_query_returns_summaries_when_truncated(db, tool_context):
+    db.execute_query("CREATE TABLE Trips (id INTEGER PRIMARY KEY, city TEXT)")
+    db.execute_query("WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 500) "
+                     "INSERT INTO Trips (city) SELECT 'Lisbon' FROM n")
+    tool_context.state["sqlite_result_token_budget"] = 200
+
+    result = sqlite_tools.read_query_formatted("SELECT * FROM Trips", "rows", tool_context)
+
+    assert result["truncated"]
+    assert result["total_rows"] == 500
+    assert result["rows_shown"] == len(result["data"]) < 500
+    assert [summary["column"] for summary in result["column_summaries"]] == ["id", "city"]
@@ -0,0 +1,48 @@
+"""Bulk inserts in one transaction"""
+
+import pytest
+
+from astra.shared_libraries import sqlite_tools
+
+
+@pytest.fixture
+def trips(db):
+    db.execute_query("CREATE TABLE Trips (id INTEGER PRIMARY KEY, city TEXT NOT NULL, nights INTEGER)")
+    return db
+
+
+def count(db):
+    return db.execute_query("SELECT COUNT(*) AS n FROM Trips")[0]["n"]
+
+
+def test_rows_are_inserted_in_chunks(trips):
+    rows = [[n, f"city {n}", n % 7] for n in range(25)]
+
+    result = trips.bulk_insert("Trips", ["id", "city", "nights"], rows, chunk_size=10)
+
+    assert (result["inserted_rows"], result["chunks"]) == (25, 3)
+    assert count(trips) == 25
+
+
+def test_rows_may_be_objects(trips, tool_context):
+    result = sqlite_tools.bulk_insert("Trips", ["city", "nights"], [{"city": "Lisbon", "nights": 3}, ["Porto", 2]], tool_context)
+
+    assert result["status"] == "success", result
+    assert [row["city"] for row in trips.execute_query("SELECT city FROM Trips ORDER BY id")] == ["Lisbon", "Porto"]
+
+
+def test_a_failing_row_rolls_back_every_chunk(trips):
+    rows = [[f"city {n}"] for n in range(25)] + [[None]]
+
+    with pytest.raises(Exception):
+        trips.bulk_insert("Trips", ["city"], rows, chunk_size=10)
+
+    assert count(trips) == 0
+
+
+def test_bad_input_is_rejected_before_writing(trips, tool_context):
+    assert sqlite_tools.bulk_insert("Trips", [], [["x"]], tool_context)["status"] == "error"
+    assert sqlite_tools.bulk_insert("Trips", ["city", "nights"], [["x"]], tool_context)["status"] == "error"
+    assert "Unknown columns" in sqlite_tools.bulk_insert("Trips", ["town"], [["x"]], tool_context)["error_message"]
+    assert "does not exist" in sqlite_tools.bulk_insert("Tours", ["city"], [["x"]], tool_context)["error_message"]
+    assert count(trips) == 0
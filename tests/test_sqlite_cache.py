@@ -0,0 +1,104 @@
+"""Result cache invalidation after writes"""
+
+import sqlite3
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def tables(db):
+    db.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY, v INTEGER)")
+    db.execute_query("CREATE TABLE u (id INTEGER PRIMARY KEY, v INTEGER)")
+    db.execute_query("INSERT INTO t (v) VALUES (1)")
+    db.execute_query("INSERT INTO u (v) VALUES (1)")
+
+
+def _count(db, table: str) -> int:
+    return db.execute_query(f"SELECT count(*) AS n FROM {table}", use_cache=True)[0]["n"]
+
+
+def test_repeated_read_is_served_from_cache(db, tables, cache):
+    assert _count(db, "t") == 1
+    hits = cache.hits
+    assert _count(db, "t") == 1
+    assert cache.hits == hits + 1
+
+
+def test_write_drops_only_results_reading_its_table(db, tables, cache):
+    _count(db, "t"), _count(db, "u")
+
+    db.execute_query("INSERT INTO t (v) VALUES (2)")
+
+    hits = cache.hits
+    assert _count(db, "t") == 2
+    assert cache.hits == hits
+    assert _count(db, "u") == 1
+    assert cache.hits == hits + 1
+
+
+def test_write_drops_results_of_tables_after_join_constraints(db, tables, cache):
+    db.execute_query("CREATE TABLE c (id INTEGER PRIMARY KEY)")
+    db.execute_query("INSERT INTO c DEFAULT VALUES")
+    query = "SELECT count(*) AS n FROM t JOIN u ON t.id = u.id, c"
+    assert db.execute_query(query, use_cache=True) == [{"n": 1}]
+
+    db.execute_query("INSERT INTO c DEFAULT VALUES")
+
+    assert db.execute_query(query, use_cache=True) == [{"n": 2}]
+
+
+def test_write_drops_results_with_unknown_tables(db, tables, cache):
+    key = cache.make_key(db.db_path, "SELECT count(*) AS n FROM t")
+    generation = cache.check_external(db.db_path, db.writer.data_version())
+    cache.put(key, [{"n": 1}], generation, None)
+    assert cache.get(key) == [{"n": 1}]
+
+    db.execute_query("INSERT INTO u (v) VALUES (2)")
+
+    assert cache.get(key) is None
+
+
+def test_write_drops_results_of_tables_changed_by_triggers(db, tables, cache):
+    db.execute_query("CREATE TABLE audit (table_name TEXT)")
+    db.execute_query("CREATE TRIGGER t_audit AFTER INSERT ON t BEGIN INSERT INTO audit VALUES ('t'); END")
+    assert _count(db, "audit") == 0
+
+    db.execute_query("INSERT INTO t (v) VALUES (2)")
+
+    assert _count(db, "audit") == 1
+
+
+def test_write_from_another_connection_drops_results(db, db_path, tables, cache):
+    assert _count(db, "t") == 1
+
+    outside = sqlite3.connect(db_path)
+    try:
+        outside.execute("INSERT INTO t (v) VALUES (2)")
+        outside.commit()
+    finally:
+        outside.close()
+
+    assert _count(db, "t") == 2
+
+
+def test_reads_bypass_cache_while_writer_is_busy(db, tables, cache):
+    started, release = threading.Event(), threading.Event()
+
+    def slow(conn: sqlite3.Connection):
+        conn.execute("INSERT INTO t (v) VALUES (2)")
+        started.set()
+        release.wait(5)
+
+    future = db.writer.submit(slow, tables=["t"])
+    started.wait(5)
+    try:
+        hits = cache.hits
+        assert _count(db, "t") == 1
+        assert _count(db, "t") == 1
+        assert cache.hits == hits
+    finally:
+        release.set()
+    future.result(5)
+
+    assert _count(db, "t") == 2
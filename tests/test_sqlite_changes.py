@@ -0,0 +1,73 @@
+"""Change feed capture and retention"""
+
+import pytest
+
+from astra.shared_libraries import sqlite_changes
+from astra.shared_libraries.sqlite_changes import changes_since, enable_tracking, read_changes
+
+
+@pytest.fixture
+def tracked(db):
+    db.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    return db
+
+
+def _insert(db, count: int):
+    for i in range(count):
+        db.execute_query("INSERT INTO t (v) VALUES (:v)", {"v": f"r{i}"})
+
+
+def test_changes_are_logged_in_order(tracked):
+    db = tracked
+    enable_tracking(db, ["t"])
+    db.execute_query("INSERT INTO t (id, v) VALUES (1, 'a')")
+    db.execute_query("UPDATE t SET id = 2 WHERE id = 1")
+    db.execute_query("DELETE FROM t WHERE id = 2")
+
+    result = read_changes(db, 0, 100)
+
+    assert [(c["rowid"], c["operation"]) for c in result["changes"]] == [
+        (1, "INSERT"), (1, "DELETE"), (2, "UPDATE"), (2, "DELETE")
+    ]
+    assert result["next_seq"] == result["latest_seq"] == 4
+    assert not result["has_more"] and not result["missed_changes"]
+
+
+def test_retention_keeps_newest_changes(tracked, monkeypatch):
+    db = tracked
+    monkeypatch.setattr(sqlite_changes, "CHANGE_LOG_PRUNE_EVERY", 10)
+    enable_tracking(db, ["t"], max_rows=5)
+    _insert(db, 25)
+
+    # Pruned at seq 10 and 20, keeping the 5 entries before each
+    stale = read_changes(db, 0, 100)
+    assert stale["missed_changes"]
+    assert [c["seq"] for c in stale["changes"]] == list(range(16, 26))
+
+    current = read_changes(db, 15, 100)
+    assert not current["missed_changes"]
+    assert current["next_seq"] == 25
+
+
+def test_paging_continues_from_session_position(tracked, tool_context):
+    db = tracked
+    enable_tracking(db, ["t"])
+    _insert(db, 5)
+
+    first = changes_since(0, 3, tool_context)
+    assert first["status"] == "success"
+    assert [c["seq"] for c in first["changes"]] == [1, 2, 3] and first["has_more"]
+
+    rest = changes_since(-1, 3, tool_context)
+    assert [c["seq"] for c in rest["changes"]] == [4, 5] and not rest["has_more"]
+
+    _insert(db, 1)
+    assert [c["seq"] for c in changes_since(-1, 3, tool_context)["changes"]] == [6]
+    assert changes_since(-1, 3, tool_context)["changes"] == []
+
+
+def test_reading_without_change_feed_is_an_error(tracked, tool_context):
+    result = changes_since(0, 10, tool_context)
+
+    assert result["status"] == "error"
+    assert "enable_change_feed" in result["error_message"]
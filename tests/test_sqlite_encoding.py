@@ -0,0 +1,49 @@
+"""Columnar result encoding"""
+
+import pytest
+
+from astra.shared_libraries import sqlite_tools
+from astra.shared_libraries.sqlite_encoding import choose_format, decode_columnar, encode_columnar
+
+ROWS = [{"id": n, "country": ["Portugal", "Switzerland"][n % 2], "note": None if n % 3 else f"n{n}"} for n in range(12)]
+
+
+def test_columnar_round_trips():
+    encoded = encode_columnar(ROWS)
+
+    assert encoded["columns"] == ["id", "country", "note"]
+    assert decode_columnar(encoded) == ROWS
+
+
+def test_repeated_text_is_dictionary_encoded():
+    encoded = encode_columnar(ROWS)
+
+    assert encoded["dictionaries"] == {"country": ["Portugal", "Switzerland"]}
+    assert [row[1] for row in encoded["rows"][:3]] == [0, 1, 0]
+
+
+def test_short_or_distinct_text_is_left_alone():
+    assert encode_columnar([{"code": "PT"}, {"code": "PT"}, {"code": "CH"}, {"code": "CH"}])["dictionaries"] == {}
+    assert encode_columnar([{"name": f"name {n}"} for n in range(10)])["dictionaries"] == {}
+
+
+def test_auto_format_switches_on_row_count(monkeypatch):
+    monkeypatch.setattr("astra.shared_libraries.sqlite_encoding.COMPACT_ROW_THRESHOLD", 10)
+
+    assert choose_format("auto", 10) == "rows"
+    assert choose_format("auto", 11) == "columnar"
+    assert choose_format(" Rows ", 100) == "rows"
+    with pytest.raises(ValueError):
+        choose_format("csv", 1)
+
+
+def test_read_query_formatted_returns_columnar_rows(db, tool_context):
+    db.execute_query("CREATE TABLE Trips (id INTEGER PRIMARY KEY, country TEXT)")
+    db.execute_query("INSERT INTO Trips (country) VALUES ('Portugal'), ('Portugal'), ('Portugal'), ('Switzerland')")
+
+    result = sqlite_tools.read_query_formatted("SELECT * FROM Trips ORDER BY id", "columnar", tool_context)
+
+    assert result["format"] == "columnar"
+    assert result["row_count"] == 4
+    assert decode_columnar(result) == sqlite_tools.read_query("SELECT * FROM Trips ORDER BY id", tool_context)["data"]
+    assert sqlite_tools.read_query_formatted("SELECT 1", "csv", tool_context)["status"] == "error"
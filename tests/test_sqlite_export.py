@@ -0,0 +1,77 @@
+"""Streaming query export to CSV and JSONL"""
+
+import csv
+import gzip
+import json
+import time
+
+import pytest
+
+from astra.shared_libraries import sqlite_export
+from astra.shared_libraries.sqlite_export import export_query
+from astra.shared_libraries.sqlite_limits import QueryLimits
+
+
+@pytest.fixture
+def rows(db):
+    db.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT, data BLOB)")
+    db.bulk_insert("t", ["name", "data"], [[f"row {i}", bytes([i % 256])] for i in range(2500)])
+    return db
+
+
+def test_csv_export(rows, tool_context, tmp_path):
+    path = tmp_path / "out" / "t.csv"
+
+    result = export_query("SELECT id, name, data FROM t ORDER BY id", str(path), "csv", False, tool_context)
+
+    assert result["status"] == "success", result
+    assert result["rows"] == 2500 and result["columns"] == ["id", "name", "data"]
+    with open(path, newline="") as handle:
+        lines = list(csv.reader(handle))
+    assert lines[0] == ["id", "name", "data"]
+    assert lines[1] == ["1", "row 0", "00"]
+    assert len(lines) == 2501
+
+
+def test_compressed_jsonl_export(rows, tool_context, tmp_path):
+    result = export_query("SELECT id, name FROM t WHERE id <= 3", str(tmp_path / "t.jsonl"), "jsonl", True,
+                          tool_context)
+
+    assert result["status"] == "success", result
+    assert result["path"].endswith(".jsonl.gz")
+    with gzip.open(result["path"], "rt") as handle:
+        records = [json.loads(line) for line in handle]
+    assert records == [{"id": i, "name": f"row {i - 1}"} for i in range(1, 4)]
+
+
+def test_only_reads_are_exported(rows, tool_context, tmp_path):
+    result = export_query("DELETE FROM t", str(tmp_path / "t.csv"), "csv", False, tool_context)
+
+    assert result["status"] == "error"
+    assert rows.execute_query("SELECT count(*) AS n FROM t")[0]["n"] == 2500
+
+
+def test_limits_stop_export_and_leave_no_file(rows, tool_context, tmp_path, monkeypatch):
+    monkeypatch.setattr(rows, "query_limits", QueryLimits(max_steps=50000))
+    out = tmp_path / "out"
+
+    result = export_query("SELECT * FROM t AS a, t AS b", str(out / "t.csv"), "csv", False, tool_context)
+
+    assert result["error_type"] == "timeout"
+    assert list(out.iterdir()) == []
+
+
+def test_file_writes_do_not_count_against_time_limit(rows, tool_context, tmp_path, monkeypatch):
+    monkeypatch.setattr(rows, "query_limits", QueryLimits(timeout=0.2))
+    write_value = sqlite_export._plain
+
+    def slow_write(value):
+        time.sleep(0.0001)
+        return write_value(value)
+    monkeypatch.setattr(sqlite_export, "_plain", slow_write)
+
+    started = time.monotonic()
+    result = export_query("SELECT * FROM t", str(tmp_path / "t.csv"), "csv", False, tool_context)
+
+    assert result["status"] == "success", result
+    assert time.monotonic() - started > 0.2
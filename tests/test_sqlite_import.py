@@ -0,0 +1,99 @@
+"""Streaming CSV and JSONL import"""
+
+import json
+
+import pytest
+
+from astra.shared_libraries.sqlite_import import ImportRowError, import_file, import_rows, make_coercer
+
+
+@pytest.fixture
+def travel_tables(db):
+    db.execute_query("CREATE TABLE Itineraries (itinerary_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                     "user_id INTEGER NOT NULL, title VARCHAR(150), start_date DATE NOT NULL, end_date DATE NOT NULL, "
+                     "created_at DATETIME DEFAULT CURRENT_TIMESTAMP)")
+    db.execute_query("CREATE TABLE Bookings (booking_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                     "itinerary_id INTEGER NOT NULL, booking_type VARCHAR(50) NOT NULL, start_date DATETIME, "
+                     "price DECIMAL(10,2), currency CHAR(3), refundable BOOLEAN)")
+    return db
+
+
+def test_csv_keeps_dates_in_date_columns(travel_tables, tool_context, tmp_path):
+    path = tmp_path / "itineraries.csv"
+    path.write_text("user_id,title,start_date,end_date,created_at\n"
+                    "1,Lisbon,2025-01-01,2025-01-05,2024-12-01 09:30:00\n"
+                    "2,Oslo,2025-02-10,2025-02-12,\n")
+
+    result = import_file(str(path), "Itineraries", "csv", tool_context)
+
+    assert result["status"] == "success", result
+    assert result["inserted_rows"] == 2
+    rows = travel_tables.execute_query(
+        "SELECT user_id, start_date, typeof(start_date) AS kind, created_at FROM Itineraries ORDER BY user_id")
+    assert rows == [
+        {"user_id": 1, "start_date": "2025-01-01", "kind": "text", "created_at": "2024-12-01 09:30:00"},
+        {"user_id": 2, "start_date": "2025-02-10", "kind": "text", "created_at": None},
+    ]
+
+
+def test_jsonl_converts_numbers_and_keeps_text(travel_tables, tool_context, tmp_path):
+    path = tmp_path / "bookings.jsonl"
+    records = [
+        {"itinerary_id": "1", "booking_type": "flight", "start_date": "2025-01-01T08:00:00",
+         "price": "199.99", "currency": "USD", "refundable": "yes"},
+        {"itinerary_id": 1, "booking_type": "hotel", "price": 120, "refundable": False},
+    ]
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+
+    result = import_file(str(path), "Bookings", "jsonl", tool_context)
+
+    assert result["status"] == "success", result
+    rows = travel_tables.execute_query(
+        "SELECT itinerary_id, start_date, price, typeof(price) AS price_kind, refundable FROM Bookings ORDER BY booking_id")
+    assert rows == [
+        {"itinerary_id": 1, "start_date": "2025-01-01T08:00:00", "price": 199.99, "price_kind": "real",
+         "refundable": 1},
+        {"itinerary_id": 1, "start_date": None, "price": 120, "price_kind": "integer", "refundable": 0},
+    ]
+
+
+@pytest.mark.parametrize("declared_type, raw, expected", [
+    ("INTEGER", "42", 42),
+    ("INTEGER", "1.5", 1.5),
+    ("INTEGER", "yes", "yes"),
+    ("NUMERIC", "3.0", 3),
+    ("DECIMAL(10,2)", "2025-01-01", "2025-01-01"),
+    ("REAL", "7", 7.0),
+    ("REAL", "n/a", "n/a"),
+    ("TEXT", 12, "12"),
+    ("BOOLEAN", "No", 0),
+    ("", "0012", "0012"),
+])
+def test_coercion_follows_sqlite_affinity(declared_type, raw, expected):
+    value = make_coercer(declared_type)(raw)
+
+    assert value == expected and type(value) is type(expected)
+
+
+def test_bad_row_stops_after_committed_chunks(travel_tables, tmp_path):
+    path = tmp_path / "itineraries.csv"
+    path.write_text("user_id,start_date,end_date\n"
+                    + "".join(f"{i},2025-01-01,2025-01-02\n" for i in range(4))
+                    + "9,2025-01-01\n")
+
+    with pytest.raises(ImportRowError) as raised:
+        import_rows(travel_tables, str(path), "Itineraries", "csv", chunk_size=2)
+
+    assert raised.value.line == 6
+    assert raised.value.committed_rows == 4
+    assert travel_tables.execute_query("SELECT count(*) AS n FROM Itineraries")[0]["n"] == 4
+
+
+def test_unknown_column_is_rejected(travel_tables, tool_context, tmp_path):
+    path = tmp_path / "itineraries.csv"
+    path.write_text("user_id,nickname\n1,x\n")
+
+    result = import_file(str(path), "Itineraries", "csv", tool_context)
+
+    assert result["status"] == "error"
+    assert "nickname" in result["error_message"]
@@ -0,0 +1,93 @@
+"""Query time and step limits, and cancellation"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from astra.shared_libraries import sqlite_tools, async_sqlite_tools
+from astra.shared_libraries.async_sqlite_tools import get_async_db_instance
+from astra.shared_libraries.sqlite_limits import QueryLimits, QueryTimeout
+
+# Far more work than any limit below allows
+CROSS_JOIN = "SELECT count(*) AS n FROM a AS a1, a AS a2, a AS a3"
+
+
+@pytest.fixture
+def rows(db):
+    db.execute_query("CREATE TABLE a (x INTEGER)")
+    db.execute_query("CREATE TABLE b (x INTEGER)")
+    db.bulk_insert("a", ["x"], [[i] for i in range(2000)])
+
+
+def test_step_limit_stops_read(db, rows):
+    with pytest.raises(QueryTimeout) as raised:
+        db.execute_query(CROSS_JOIN, limits=QueryLimits(max_steps=50000))
+
+    assert raised.value.reason == "steps"
+    assert raised.value.vm_steps >= 50000
+    # The interrupted connection is not handed out again in a broken state
+    assert db.execute_query("SELECT count(*) AS n FROM a")[0]["n"] == 2000
+
+
+def test_time_limit_returns_timeout_response(db, rows, tool_context, monkeypatch):
+    monkeypatch.setattr(db, "query_limits", QueryLimits(timeout=0.2))
+
+    started = time.monotonic()
+    result = sqlite_tools.read_query_formatted(CROSS_JOIN, "auto", tool_context)
+
+    assert result["status"] == "error"
+    assert result["error_type"] == "timeout" and result["reason"] == "time"
+    assert time.monotonic() - started < 2
+
+
+def test_paged_read_returns_timeout_response(db, rows, tool_context, monkeypatch):
+    monkeypatch.setattr(db, "query_limits", QueryLimits(max_steps=50000))
+
+    result = sqlite_tools.read_query_paged(CROSS_JOIN, 10, tool_context)
+
+    assert result["error_type"] == "timeout"
+
+
+def test_interrupted_write_leaves_other_writes_committed(db, rows, tool_context, monkeypatch):
+    monkeypatch.setattr(db, "query_limits", QueryLimits(max_steps=200000))
+    statuses = []
+
+    def small_writes():
+        for i in range(50):
+            statuses.append(sqlite_tools.write_query(f"INSERT INTO b VALUES ({i})", tool_context)["status"])
+
+    writer = threading.Thread(target=small_writes)
+    writer.start()
+    result = sqlite_tools.write_query("INSERT INTO b SELECT a1.x FROM a AS a1, a AS a2", tool_context)
+    writer.join()
+
+    assert result["error_type"] == "timeout"
+    assert statuses == ["success"] * 50
+    assert db.execute_query("SELECT count(*) AS n FROM b")[0]["n"] == 50
+
+
+def test_cancelled_async_read_is_interrupted(db_path, rows):
+    async_db = get_async_db_instance(db_path)
+
+    async def run():
+        # The time limit only keeps a broken cancellation from hanging the test
+        query = async_db.execute_query(CROSS_JOIN, limits=QueryLimits(timeout=30))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(query, 0.2)
+        started = time.monotonic()
+        rows = await async_db.execute_query("SELECT count(*) AS n FROM a")
+        return rows, time.monotonic() - started
+
+    rows, elapsed = asyncio.run(run())
+    assert rows == [{"n": 2000}]
+    assert elapsed < 2
+
+
+def test_async_tool_returns_timeout_response(db_path, rows, tool_context, monkeypatch):
+    monkeypatch.setattr(get_async_db_instance(db_path), "query_limits", QueryLimits(max_steps=50000))
+
+    result = asyncio.run(async_sqlite_tools.read_query_formatted(CROSS_JOIN, "auto", tool_context))
+
+    assert result["error_type"] == "timeout"
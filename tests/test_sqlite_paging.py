@@ -0,0 +1,62 @@
+"""Paged reads must not hold locks that stall the writer between pages"""
+
+import time
+
+import pytest
+
+from astra.shared_libraries import sqlite_tools
+
+
+def _load_rows(tool_context, count: int):
+    sqlite_tools.create_table("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)", tool_context)
+    result = sqlite_tools.bulk_insert("t", ["v"], [[f"r{i}"] for i in range(count)], tool_context)
+    assert result["status"] == "success"
+
+
+def _read_all(first: dict, tool_context) -> list:
+    ids = [row["id"] for row in first["data"]]
+    page = first
+    while page["has_more"]:
+        page = sqlite_tools.fetch_next_page(page["cursor_token"], tool_context)
+        assert page["status"] == "success", page
+        ids += [row["id"] for row in page["data"]]
+    return ids
+
+
+# A rollback-journal database re-runs the query for each page and sees the new
+# row; a WAL cursor keeps reading the snapshot it started on
+@pytest.mark.parametrize("profile, expected_rows", [("default", 501), ("read-heavy", 500)])
+def test_write_between_pages_does_not_wait(profile, expected_rows, tool_context, monkeypatch):
+    monkeypatch.setenv("ASTRA_SQLITE_PROFILE", profile)
+    _load_rows(tool_context, 500)
+
+    first = sqlite_tools.read_query_paged("SELECT * FROM t ORDER BY id", 10, tool_context)
+    assert first["status"] == "success" and first["has_more"]
+    assert first["columns"] == ["id", "v"]
+
+    started = time.monotonic()
+    written = sqlite_tools.write_query("INSERT INTO t (v) VALUES ('new')", tool_context)
+    assert written["status"] == "success", written
+    assert time.monotonic() - started < 1
+
+    assert _read_all(first, tool_context) == list(range(1, expected_rows + 1))
+
+
+def test_rollback_journal_pages_non_select(tool_context):
+    _load_rows(tool_context, 3)
+
+    first = sqlite_tools.read_query_paged("PRAGMA table_info(t)", 1, tool_context)
+    names = [first["data"][0]["name"]]
+    page = first
+    while page["has_more"]:
+        page = sqlite_tools.fetch_next_page(page["cursor_token"], tool_context)
+        names += [row["name"] for row in page["data"]]
+    assert names == ["id", "v"]
+
+
+def test_rollback_journal_pages_cte_in_order(tool_context):
+    _load_rows(tool_context, 450)
+
+    first = sqlite_tools.read_query_paged(
+        "WITH a AS (SELECT id FROM t) SELECT * FROM a ORDER BY id DESC;", 200, tool_context)
+    assert _read_all(first, tool_context) == list(range(450, 0, -1))
@@ -0,0 +1,82 @@
+"""Connection pooling per database path"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from astra.shared_libraries.sqlite_pool import SqliteConnectionPool
+
+
+@pytest.fixture
+def pool(db_path):
+    pool = SqliteConnectionPool(db_path, max_size=2, timeout=0.2)
+    yield pool
+    pool.close()
+
+
+def test_connections_are_reused(pool):
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+
+    assert pool.stats()["open_connections"] == 1
+
+
+def test_pool_is_bounded(pool):
+    first, second = pool.acquire(), pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+    pool.release(first)
+    assert pool.acquire() is first
+    pool.release(first)
+    pool.release(second)
+    assert pool.stats()["busy_connections"] == 0
+
+
+def test_waiting_callers_get_released_connections(pool):
+    held = [pool.acquire(), pool.acquire()]
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    pool.release(held[0])
+    waiter.join()
+
+    assert got == [held[0]]
+
+
+def test_released_connections_are_rolled_back(pool):
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE Trips (id INTEGER PRIMARY KEY)")
+        conn.commit()
+        conn.execute("INSERT INTO Trips VALUES (1)")
+        assert conn.in_transaction
+
+    with pool.connection() as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM Trips").fetchone()[0] == 0
+
+
+def test_read_only_pools_cannot_write(pool, db_path):
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE Trips (id INTEGER PRIMARY KEY)")
+        conn.commit()
+    readers = SqliteConnectionPool(db_path, read_only=True)
+
+    with readers.connection() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO Trips VALUES (1)")
+    readers.close()
+
+
+def test_closed_pool_refuses_connections(pool):
+    with pool.connection():
+        pass
+    pool.close()
+
+    assert pool.stats()["open_connections"] == 0
+    with pytest.raises(RuntimeError):
+        pool.acquire()
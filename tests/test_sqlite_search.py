@@ -0,0 +1,75 @@
+"""Full-text destination search and its sync triggers"""
+
+import pytest
+
+from astra.shared_libraries.sqlite_search import (
+    build_match_query, rebuild_destination_search, search_destinations,
+)
+
+
+@pytest.fixture
+def destinations(db):
+    db.execute_query("""
+        CREATE TABLE Destinations (
+            destination_id INTEGER PRIMARY KEY, name TEXT, country TEXT, region TEXT, city TEXT,
+            description TEXT, tags TEXT, best_season TEXT
+        )
+    """)
+    db.execute_query("""
+        INSERT INTO Destinations (destination_id, name, country, region, city, description, tags, best_season) VALUES
+            (1, 'Porto de Galinhas', 'Brazil', 'Pernambuco', 'Ipojuca', 'Natural pools and reef snorkeling', 'beach,snorkeling', 'summer'),
+            (2, 'Zermatt', 'Switzerland', 'Valais', 'Zermatt', 'Skiing below the Matterhorn', 'mountains,ski', 'winter'),
+            (3, 'Lisbon', 'Portugal', 'Lisboa', 'Lisbon', 'Tiled streets, trams and a beach nearby', 'city,food', 'spring')
+    """)
+    return db
+
+
+def names(result):
+    assert result["status"] == "success", result
+    return [row["name"] for row in result["data"]]
+
+
+def test_match_query_quotes_words_and_drops_stopwords():
+    assert build_match_query('beach destinations with "good" food OR -ski') == '"beach" OR "food" OR "ski"'
+    assert build_match_query("the") == '"the"'
+
+
+def test_tag_matches_rank_above_description_matches(destinations, tool_context):
+    assert names(search_destinations("beach", 10, tool_context)) == ["Porto de Galinhas", "Lisbon"]
+
+
+def test_search_uses_stemming_and_snippets(destinations, tool_context):
+    result = search_destinations("snorkel", 10, tool_context)
+
+    assert names(result) == ["Porto de Galinhas"]
+    assert "[snorkeling]" in result["data"][0]["snippet"]
+
+
+def test_index_follows_inserts_updates_and_deletes(destinations, tool_context):
+    assert names(search_destinations("ski", 10, tool_context)) == ["Zermatt"]
+
+    destinations.execute_query("INSERT INTO Destinations (destination_id, name, tags) VALUES (4, 'Chamonix', 'ski')")
+    destinations.execute_query("UPDATE Destinations SET tags = 'hiking', description = 'Glacier walks' WHERE destination_id = 2")
+    assert names(search_destinations("ski", 10, tool_context)) == ["Chamonix"]
+
+    destinations.execute_query("DELETE FROM Destinations WHERE destination_id = 4")
+    assert names(search_destinations("ski", 10, tool_context)) == []
+
+
+def test_rebuild_reindexes_every_destination(destinations, tool_context):
+    result = rebuild_destination_search(tool_context)
+
+    assert result["status"] == "success"
+    assert result["indexed_rows"] == 3
+    assert names(search_destinations("matterhorn", 10, tool_context)) == ["Zermatt"]
+
+
+def test_search_rejects_text_without_words(destinations, tool_context):
+    assert search_destinations("?!", 10, tool_context)["status"] == "error"
+
+
+def test_search_needs_a_destinations_table(db, tool_context):
+    result = search_destinations("beach", 10, tool_context)
+
+    assert result["status"] == "error"
+    assert "Destinations" in result["error_message"]
@@ -0,0 +1,70 @@
+"""Nearest-destination queries over the R*Tree index"""
+
+import pytest
+
+from astra.shared_libraries.sqlite_spatial import bounding_boxes, haversine_km, nearby_destinations
+
+
+@pytest.fixture
+def destinations(db):
+    db.execute_query("""
+        CREATE TABLE Destinations (
+            destination_id INTEGER PRIMARY KEY, name TEXT, country TEXT, region TEXT, city TEXT,
+            latitude REAL, longitude REAL, tags TEXT
+        )
+    """)
+    db.execute_query("""
+        INSERT INTO Destinations (destination_id, name, latitude, longitude) VALUES
+            (1, 'Lisbon', 38.7223, -9.1393),
+            (2, 'Sintra', 38.8029, -9.3817),
+            (3, 'Porto', 41.1579, -8.6291),
+            (4, 'Suva', -18.1248, 178.4501),
+            (5, 'Apia', -13.8333, -171.7667),
+            (6, 'Nowhere', NULL, NULL)
+    """)
+    return db
+
+
+def names(result):
+    assert result["status"] == "success", result
+    return [row["name"] for row in result["data"]]
+
+
+def test_haversine_distance():
+    assert haversine_km(38.7223, -9.1393, 41.1579, -8.6291) == pytest.approx(274, abs=1)
+    assert haversine_km(0, 0, 0, 180) == pytest.approx(20015, abs=1)
+
+
+def test_bounding_boxes_split_at_the_antimeridian_and_widen_at_poles():
+    assert len(bounding_boxes(0, 0, 100)) == 1
+    west, east = bounding_boxes(-16, 179, 500)
+    assert west[3] == 180.0 and east[2] == -180.0
+    assert bounding_boxes(89.5, 10, 100) == [(pytest.approx(88.6, abs=0.1), 90.0, -180.0, 180.0)]
+
+
+def test_nearby_destinations_are_nearest_first(destinations, tool_context):
+    result = nearby_destinations(38.7223, -9.1393, 300, 10, tool_context)
+
+    assert names(result) == ["Lisbon", "Sintra", "Porto"]
+    assert result["data"][0]["distance_km"] == 0
+    assert names(nearby_destinations(38.7223, -9.1393, 50, 10, tool_context)) == ["Lisbon", "Sintra"]
+    assert names(nearby_destinations(38.7223, -9.1393, 300, 1, tool_context)) == ["Lisbon"]
+
+
+def test_nearby_destinations_across_the_antimeridian(destinations, tool_context):
+    assert names(nearby_destinations(-16, 179.9, 1500, 10, tool_context)) == ["Suva", "Apia"]
+
+
+def test_index_follows_inserts_updates_and_deletes(destinations, tool_context):
+    assert names(nearby_destinations(38.7223, -9.1393, 50, 10, tool_context)) == ["Lisbon", "Sintra"]
+
+    destinations.execute_query("INSERT INTO Destinations (destination_id, name, latitude, longitude) VALUES (7, 'Cascais', 38.6979, -9.4215)")
+    destinations.execute_query("UPDATE Destinations SET latitude = 41.15, longitude = -8.61 WHERE destination_id = 2")
+    destinations.execute_query("DELETE FROM Destinations WHERE destination_id = 1")
+
+    assert names(nearby_destinations(38.7223, -9.1393, 50, 10, tool_context)) == ["Cascais"]
+
+
+def test_nearby_destinations_rejects_bad_coordinates(destinations, tool_context):
+    assert nearby_destinations(91, 0, 10, 10, tool_context)["status"] == "error"
+    assert nearby_destinations(0, 0, 0, 10, tool_context)["status"] == "error"
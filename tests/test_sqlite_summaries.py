@@ -0,0 +1,89 @@
+"""Itinerary booking summaries kept by triggers"""
+
+import random
+
+import pytest
+
+from astra.shared_libraries.sqlite_summaries import (
+    BOOKING_SUMMARY_TABLE, itinerary_summary, rebuild_summaries, verify_summaries
+)
+
+CURRENCIES = ["USD", "EUR", None]
+BOOKING_TYPES = ["flight", "hotel", "car"]
+STATUSES = ["confirmed", "pending", "cancelled", None]
+
+
+@pytest.fixture
+def travel_db(db):
+    db.execute_query("CREATE TABLE Itineraries (itinerary_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                     "user_id INTEGER NOT NULL, title VARCHAR(150), start_date DATE NOT NULL, end_date DATE NOT NULL)")
+    db.execute_query("CREATE TABLE Bookings (booking_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                     "itinerary_id INTEGER NOT NULL, booking_type VARCHAR(50) NOT NULL, price DECIMAL(10,2), "
+                     "currency CHAR(3), status VARCHAR(50))")
+    db.bulk_insert("Itineraries", ["user_id", "title", "start_date", "end_date"],
+                   [[1, f"Trip {i}", "2025-01-01", "2025-01-10"] for i in range(1, 4)])
+    return db
+
+
+def _random_booking(rng: random.Random) -> dict:
+    return {
+        "itinerary_id": rng.randint(1, 3),
+        "booking_type": rng.choice(BOOKING_TYPES),
+        "price": rng.choice([None, round(rng.uniform(0, 500), 2), 0.1]),
+        "currency": rng.choice(CURRENCIES),
+        "status": rng.choice(STATUSES),
+    }
+
+
+def test_summaries_match_bookings_after_random_changes(travel_db):
+    db = travel_db
+    rng = random.Random(24)
+    rebuild_summaries(db)
+
+    for _ in range(300):
+        ids = [row["booking_id"] for row in db.execute_query("SELECT booking_id FROM Bookings")]
+        action = rng.random()
+        if action < 0.5 or not ids:
+            db.execute_query(
+                "INSERT INTO Bookings (itinerary_id, booking_type, price, currency, status) "
+                "VALUES (:itinerary_id, :booking_type, :price, :currency, :status)", _random_booking(rng))
+        elif action < 0.8:
+            column, value = rng.choice(list(_random_booking(rng).items()))
+            db.execute_query(f"UPDATE Bookings SET {column} = :value WHERE booking_id = :id",
+                             {"value": value, "id": rng.choice(ids)})
+        else:
+            db.execute_query("DELETE FROM Bookings WHERE booking_id = :id", {"id": rng.choice(ids)})
+
+    assert verify_summaries(db) == 0
+
+
+def test_summary_reports_itinerary_spend(travel_db):
+    db = travel_db
+    db.bulk_insert("Bookings", ["itinerary_id", "booking_type", "price", "currency", "status"], [
+        [1, "flight", 199.99, "USD", "confirmed"],
+        [1, "hotel", 0.1, "USD", "pending"],
+        [1, "hotel", 0.2, "USD", "pending"],
+        [1, "car", 50, "EUR", None],
+        [2, "flight", 10, "USD", "confirmed"],
+    ])
+
+    summary = itinerary_summary(db, 1)
+
+    assert summary["booking_count"] == 4
+    assert summary["spend_by_currency"] == {"USD": 200.29, "EUR": 50.0}
+    assert summary["by_booking_type"]["hotel"] == {"bookings": 2, "spend": {"USD": 0.3}}
+    assert summary["by_status"]["unspecified"]["bookings"] == 1
+    assert itinerary_summary(db, 99) is None
+
+
+def test_rebuild_repairs_summaries_changed_outside_triggers(travel_db):
+    db = travel_db
+    db.execute_query("INSERT INTO Bookings (itinerary_id, booking_type, price, currency, status) "
+                     "VALUES (1, 'flight', 100, 'USD', 'confirmed')")
+    assert verify_summaries(db) == 0
+
+    db.execute_query(f"UPDATE {BOOKING_SUMMARY_TABLE} SET total_cents = 1")
+    assert verify_summaries(db) > 0
+
+    rebuild_summaries(db)
+    assert verify_summaries(db) == 0
@@ -0,0 +1,42 @@
+"""Table listings leave out internal and shadow tables"""
+
+import asyncio
+
+import pytest
+
+from astra.shared_libraries import async_sqlite_tools, sqlite_tools
+from astra.shared_libraries.sqlite_catalog import database_stats
+from astra.shared_libraries.sqlite_changes import enable_tracking
+
+VISIBLE = ["Destinations", "destinations_fts", "destinations_rtree"]
+
+
+@pytest.fixture
+def indexed(db):
+    db.execute_query("CREATE TABLE Destinations (destination_id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT)")
+    db.execute_query("CREATE VIRTUAL TABLE destinations_fts USING fts5(name)")
+    db.execute_query("CREATE VIRTUAL TABLE destinations_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)")
+    db.execute_query("INSERT INTO Destinations (name) VALUES ('Lisbon')")
+    enable_tracking(db, ["Destinations"])
+    return db
+
+
+def test_all_tables_remain_available_internally(indexed):
+    tables = indexed.get_table_names()
+
+    assert {"change_log", "sqlite_sequence", "destinations_fts_data", "destinations_rtree_node"} <= set(tables)
+
+
+def test_list_tables_shows_only_data_tables(indexed, tool_context):
+    assert sqlite_tools.list_tables(tool_context)["tables"] == VISIBLE
+    assert asyncio.run(async_sqlite_tools.list_tables(tool_context))["tables"] == VISIBLE
+
+
+def test_catalog_stats_show_only_data_tables(indexed, db_path):
+    assert database_stats(db_path)["tables"] == VISIBLE
+
+
+def test_tables_named_like_shadow_tables_are_listed(db, tool_context):
+    db.execute_query("CREATE TABLE trip_data (id INTEGER PRIMARY KEY)")
+
+    assert sqlite_tools.list_tables(tool_context)["tables"] == ["trip_data"]
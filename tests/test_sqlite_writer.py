@@ -0,0 +1,95 @@
+"""Group commit in the single-writer queue"""
+
+import sqlite3
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def writer(db):
+    db.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT UNIQUE)")
+    return db.writer
+
+
+def _insert(value: str):
+    def job(conn: sqlite3.Connection):
+        conn.execute("INSERT INTO t (v) VALUES (?)", (value,))
+        return value
+    return job
+
+
+def _submit_group(writer, jobs):
+    """Queue jobs behind a blocked job so the writer commits them as one group"""
+    started, release = threading.Event(), threading.Event()
+
+    def blocker(conn: sqlite3.Connection):
+        started.set()
+        release.wait(5)
+
+    groups = writer.groups_committed
+    first = writer.submit(blocker)
+    started.wait(5)
+    futures = [writer.submit(job, tables=["t"]) for job in jobs]
+    release.set()
+    first.result(5)
+    for future in futures:
+        future.exception(5)
+    # Groups committed for the jobs, not counting the blocker's
+    return futures, writer.groups_committed - groups - 1
+
+
+def _values(db):
+    return [row["v"] for row in db.execute_query("SELECT v FROM t ORDER BY id")]
+
+
+def test_failing_job_rolls_back_only_itself(db, writer):
+    def fails(conn: sqlite3.Connection):
+        conn.execute("INSERT INTO t (v) VALUES ('b')")
+        raise ValueError("job failed")
+
+    futures, groups = _submit_group(writer, [_insert("a"), fails, _insert("c")])
+
+    assert groups == 1
+    assert futures[0].result() == "a"
+    with pytest.raises(ValueError):
+        futures[1].result()
+    assert futures[2].result() == "c"
+    assert _values(db) == ["a", "c"]
+
+
+def test_constraint_error_rolls_back_only_its_job(db, writer):
+    writer.execute(_insert("a"))
+
+    futures, _ = _submit_group(writer, [_insert("b"), _insert("a"), _insert("c")])
+
+    assert futures[0].result() == "b"
+    with pytest.raises(sqlite3.IntegrityError):
+        futures[1].result()
+    assert _values(db) == ["a", "b", "c"]
+
+
+def test_lost_transaction_fails_earlier_jobs(db, writer):
+    writer.execute(_insert("a"))
+
+    def rolls_back(conn: sqlite3.Connection):
+        # OR ROLLBACK ends the whole transaction, not just this job's savepoint
+        conn.execute("INSERT OR ROLLBACK INTO t (v) VALUES ('a')")
+
+    futures, _ = _submit_group(writer, [_insert("b"), rolls_back, _insert("c")])
+
+    with pytest.raises(sqlite3.IntegrityError):
+        futures[0].result()
+    with pytest.raises(sqlite3.IntegrityError):
+        futures[1].result()
+    assert futures[2].result() == "c"
+    assert _values(db) == ["a", "c"]
+
+
+def test_writer_keeps_working_after_failures(db, writer):
+    with pytest.raises(sqlite3.OperationalError):
+        writer.execute(lambda conn: conn.execute("INSERT INTO missing VALUES (1)"))
+
+    assert writer.execute(_insert("x")) == "x"
+    assert _values(db) == ["x"]
+    assert writer.stats()["jobs_failed"] >= 1